@@ -0,0 +1,41 @@
+"""add archive segments manifest table
+
+Revision ID: add_archive_segments_table
+Revises: add_events_archivable_index
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_archive_segments_table'
+down_revision: Union[str, None] = 'add_events_archivable_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'archive_segments',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('entity_type', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.String(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('checksum', sa.String(), nullable=False),
+        sa.Column('row_counts', sa.JSON(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_archive_segments_entity', 'archive_segments', ['entity_type', 'entity_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archive_segments_entity', table_name='archive_segments')
+    op.drop_table('archive_segments')
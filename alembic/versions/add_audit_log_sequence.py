@@ -0,0 +1,49 @@
+"""add journal sequence to audit_logs and sync cursor to sync_states
+
+Revision ID: add_audit_log_sequence
+Revises: add_event_share_expiring_index
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_audit_log_sequence'
+down_revision: Union[str, None] = 'add_event_share_expiring_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE audit_logs_sequence_seq")
+    # Existing rows are numbered in timestamp order before the default takes over
+    op.add_column('audit_logs', sa.Column('sequence', sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE audit_logs SET sequence = numbered.seq FROM ("
+        "SELECT id, timestamp, nextval('audit_logs_sequence_seq') AS seq "
+        "FROM (SELECT id, timestamp FROM audit_logs ORDER BY timestamp, id) ordered"
+        ") numbered WHERE audit_logs.id = numbered.id AND audit_logs.timestamp = numbered.timestamp"
+    )
+    op.alter_column(
+        'audit_logs',
+        'sequence',
+        nullable=False,
+        server_default=sa.text("nextval('audit_logs_sequence_seq')")
+    )
+    op.create_index('ix_audit_logs_sequence', 'audit_logs', ['sequence'], unique=False)
+    op.add_column(
+        'sync_states',
+        sa.Column('last_sync_sequence', sa.BigInteger(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sync_states', 'last_sync_sequence')
+    op.drop_index('ix_audit_logs_sequence', table_name='audit_logs')
+    op.drop_column('audit_logs', 'sequence')
+    op.execute("DROP SEQUENCE audit_logs_sequence_seq")
@@ -0,0 +1,42 @@
+"""add materialised per-user event access table
+
+Revision ID: add_event_access_table
+Revises: add_event_share_recipient_index
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_access_table'
+down_revision: Union[str, None] = 'add_event_share_recipient_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_access',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('user.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('event_id', sa.String(), sa.ForeignKey('events.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('permission', sa.String(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('user_id', 'event_id', name='uix_event_access'),
+    )
+    op.create_index('ix_event_access_user_start', 'event_access', ['user_id', 'start_time'], unique=False)
+    op.create_index('ix_event_access_event', 'event_access', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_access_event', table_name='event_access')
+    op.drop_index('ix_event_access_user_start', table_name='event_access')
+    op.drop_table('event_access')
@@ -0,0 +1,65 @@
+"""add event facts and analytics rollup tables
+
+Revision ID: add_event_analytics_rollups
+Revises: partition_history_tables_by_month
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_analytics_rollups'
+down_revision: Union[str, None] = 'partition_history_tables_by_month'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_facts',
+        *_base_columns(),
+        sa.Column('event_id', sa.String(), nullable=False, unique=True),
+        sa.Column('created_by', sa.String(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('duration_seconds', sa.Integer(), nullable=False),
+        sa.Column('participant_count', sa.Integer(), nullable=False),
+        sa.Column('max_participants', sa.Integer(), nullable=True),
+        sa.Column('is_cancelled', sa.Boolean(), nullable=False),
+    )
+
+    for table in ('event_rollups_hourly', 'event_rollups_daily'):
+        op.create_table(
+            table,
+            *_base_columns(),
+            sa.Column('bucket', sa.DateTime(), nullable=False),
+            sa.Column('created_by', sa.String(), nullable=False),
+            sa.Column('event_count', sa.Integer(), nullable=False),
+            sa.Column('cancelled_count', sa.Integer(), nullable=False),
+            sa.Column('participant_count', sa.Integer(), nullable=False),
+            sa.Column('duration_seconds', sa.BigInteger(), nullable=False),
+            sa.Column('capacity', sa.Integer(), nullable=False),
+            sa.Column('capped_participants', sa.Integer(), nullable=False),
+            sa.UniqueConstraint('bucket', 'created_by', name=f'uix_{table}'),
+        )
+        op.create_index(f'ix_{table}_creator', table, ['created_by', 'bucket'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('event_rollups_daily', 'event_rollups_hourly'):
+        op.drop_index(f'ix_{table}_creator', table_name=table)
+        op.drop_table(table)
+    op.drop_table('event_facts')
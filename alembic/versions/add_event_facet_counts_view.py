@@ -0,0 +1,45 @@
+"""add materialised view of public event facet counts
+
+Revision ID: add_event_facet_counts_view
+Revises: add_events_search
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_facet_counts_view'
+down_revision: Union[str, None] = 'add_events_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Frozen copy of app.core.search.CREATE_FACET_VIEW with FACET_DATE_BUCKET
+    # ('week') inlined; a change to either needs a new migration
+    op.execute("""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS event_facet_counts AS
+        SELECT
+            GROUPING(status, location, date_trunc('week', start_time)) AS facet_set,
+            CAST(status AS text) AS status,
+            location,
+            date_trunc('week', start_time) AS bucket,
+            count(*) AS count
+        FROM events
+        WHERE is_active AND NOT is_private
+        GROUP BY GROUPING SETS ((status), (location), (date_trunc('week', start_time)))
+    """)
+    # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS uix_event_facet_counts '
+        'ON event_facet_counts (facet_set, status, location, bucket)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS event_facet_counts')
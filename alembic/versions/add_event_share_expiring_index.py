@@ -0,0 +1,33 @@
+"""add partial index on event_share.expires_at for the expiry sweeper
+
+Revision ID: add_event_share_expiring_index
+Revises: add_event_access_table
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_share_expiring_index'
+down_revision: Union[str, None] = 'add_event_access_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_event_share_expiring',
+        'event_share',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text('expires_at IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_share_expiring', table_name='event_share')
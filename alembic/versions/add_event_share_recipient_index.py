@@ -0,0 +1,27 @@
+"""add (shared_with_id, event_id) index on event_share
+
+Revision ID: add_event_share_recipient_index
+Revises: add_event_facet_counts_view
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_share_recipient_index'
+down_revision: Union[str, None] = 'add_event_facet_counts_view'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_event_share_recipient', 'event_share', ['shared_with_id', 'event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_share_recipient', table_name='event_share')
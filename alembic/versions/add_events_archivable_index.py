@@ -0,0 +1,33 @@
+"""add partial index for archiving completed events
+
+Revision ID: add_events_archivable_index
+Revises: add_reminder_ledger_table
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_events_archivable_index'
+down_revision: Union[str, None] = 'add_reminder_ledger_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_events_archivable',
+        'events',
+        ['end_time', 'id'],
+        unique=False,
+        postgresql_where=sa.text("is_active AND status = 'completed'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_archivable', table_name='events')
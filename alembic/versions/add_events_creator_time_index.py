@@ -0,0 +1,27 @@
+"""add creator and time range index on events for free/busy lookups
+
+Revision ID: add_events_creator_time_index
+Revises: add_event_analytics_rollups
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_events_creator_time_index'
+down_revision: Union[str, None] = 'add_event_analytics_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_creator_time', 'events', ['created_by', 'start_time', 'end_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_creator_time', table_name='events')
@@ -0,0 +1,62 @@
+"""add full-text search vector and trigram title index to events
+
+Revision ID: add_events_search
+Revises: add_events_creator_time_index
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_events_search'
+down_revision: Union[str, None] = 'add_events_creator_time_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_CONFIG = 'english'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('events', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION events_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.location, '')), 'B') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER events_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, location ON events
+        FOR EACH ROW EXECUTE FUNCTION events_search_vector_update()
+    """)
+    # Backfill through the trigger
+    op.execute('UPDATE events SET title = title')
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_events_title_trgm',
+        'events',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_title_trgm', table_name='events')
+    op.drop_index('ix_events_search_vector', table_name='events')
+    op.execute('DROP TRIGGER IF EXISTS events_search_vector_trigger ON events')
+    op.execute('DROP FUNCTION IF EXISTS events_search_vector_update()')
+    op.drop_column('events', 'search_vector')
@@ -0,0 +1,52 @@
+"""add notification feed and watermark tables
+
+Revision ID: add_notification_feed_tables
+Revises: 22c8deca233b
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_notification_feed_tables'
+down_revision: Union[str, None] = '22c8deca233b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_feed',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('actor_id', sa.String(), sa.ForeignKey('user.id'), nullable=True),
+        sa.Column('notification_type', sa.String(), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=True),
+    )
+    op.create_index('ix_notification_feed_created', 'notification_feed', ['created_at', 'id'], unique=False)
+
+    op.create_table(
+        'notification_watermarks',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('feed_read_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index(op.f('ix_notification_watermarks_user_id'), 'notification_watermarks', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notification_watermarks_user_id'), table_name='notification_watermarks')
+    op.drop_table('notification_watermarks')
+    op.drop_index('ix_notification_feed_created', table_name='notification_feed')
+    op.drop_table('notification_feed')
@@ -0,0 +1,38 @@
+"""add reminder ledger table
+
+Revision ID: add_reminder_ledger_table
+Revises: add_notification_feed_tables
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_reminder_ledger_table'
+down_revision: Union[str, None] = 'add_notification_feed_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reminder_ledger',
+        sa.Column('id', sa.String(), primary_key=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('event_id', sa.String(), sa.ForeignKey('events.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('user.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('reminder_kind', sa.String(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('event_id', 'user_id', 'reminder_kind', name='uix_reminder_ledger'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reminder_ledger')
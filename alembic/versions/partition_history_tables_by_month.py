@@ -0,0 +1,120 @@
+"""partition audit_logs, versions and notifications by month
+
+Revision ID: partition_history_tables_by_month
+Revises: add_archive_segments_table
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import List, Sequence, Tuple, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'partition_history_tables_by_month'
+down_revision: Union[str, None] = 'add_archive_segments_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> partition key
+PARTITIONED_TABLES = {
+    'audit_logs': 'timestamp',
+    'versions': 'created_at',
+    'notifications': 'created_at',
+}
+PREMAKE_MONTHS = 3
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    years, index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _indexes_and_foreign_keys(bind, table: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    indexes = bind.execute(
+        sa.text(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexname != :pkey"
+        ),
+        {'table': table, 'pkey': f'{table}_pkey'}
+    ).scalars().all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {'table': table}
+    ).all()
+    return list(indexes), [tuple(fk) for fk in foreign_keys]
+
+
+def _restore(table: str, indexes: List[str], foreign_keys: List[Tuple[str, str]]) -> None:
+    for indexdef in indexes:
+        op.execute(indexdef)
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    current = _month_start(datetime.utcnow())
+
+    for table, key in PARTITIONED_TABLES.items():
+        # Tables not created yet are built partitioned by create_all
+        if not inspector.has_table(table):
+            continue
+        indexes, foreign_keys = _indexes_and_foreign_keys(bind, table)
+        if key != 'created_at':
+            op.execute(f'UPDATE {table} SET "{key}" = created_at WHERE "{key}" IS NULL')
+        oldest = bind.execute(sa.text(f'SELECT min("{key}") FROM {table}')).scalar()
+        first = _month_start(oldest) if oldest else current
+
+        op.execute(
+            f'CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE ("{key}")'
+        )
+        month = first
+        while month <= _add_months(current, PREMAKE_MONTHS):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table}_partitioned "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table}_partitioned DEFAULT')
+
+        op.execute(f'INSERT INTO {table}_partitioned SELECT * FROM {table}')
+        op.execute(f'DROP TABLE {table}')
+        op.execute(f'ALTER TABLE {table}_partitioned RENAME TO {table}')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "{key}" SET NOT NULL')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ("{key}", id)')
+        _restore(table, indexes, foreign_keys)
+
+    if inspector.has_table('versions'):
+        op.create_index('ix_versions_entity', 'versions', ['entity_type', 'entity_id', 'version_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if inspector.has_table('versions'):
+        op.drop_index('ix_versions_entity', table_name='versions')
+
+    for table in PARTITIONED_TABLES:
+        if not inspector.has_table(table):
+            continue
+        indexes, foreign_keys = _indexes_and_foreign_keys(bind, table)
+        op.execute(f'CREATE TABLE {table}_plain (LIKE {table} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {table}_plain SELECT * FROM {table}')
+        op.execute(f'DROP TABLE {table}')
+        op.execute(f'ALTER TABLE {table}_plain RENAME TO {table}')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+        _restore(table, indexes, foreign_keys)
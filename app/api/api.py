@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 
 from app.api import auth, users, events
+from app.api.endpoints import notifications, availability
 
 api_router = APIRouter()
  
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(events.router, prefix="/events", tags=["events"]) 
\ No newline at end of file
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
+api_router.include_router(availability.router, prefix="/availability", tags=["availability"])
\ No newline at end of file
@@ -0,0 +1,80 @@
+from typing import List
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.api.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.availability import FreeBusyResponse, CommonSlotResponse, SlotSearch, SlotSuggestions
+from app.services.availability import AvailabilityService
+
+router = APIRouter()
+
+def _blocks(pairs):
+    return [{"start": start, "end": end} for start, end in pairs]
+
+@router.get("/free-busy", response_model=FreeBusyResponse)
+async def get_free_busy(
+    start: datetime,
+    end: datetime,
+    user_ids: List[str] = Query(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get merged busy blocks and free gaps for each user within a window."""
+    availability_service = AvailabilityService(db)
+    try:
+        free_busy = await availability_service.get_free_busy(user_ids, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {
+        "start": start,
+        "end": end,
+        "users": {
+            user_id: {"busy": _blocks(blocks["busy"]), "free": _blocks(blocks["free"])}
+            for user_id, blocks in free_busy.items()
+        }
+    }
+
+@router.get("/common-slot", response_model=CommonSlotResponse)
+async def find_common_slot(
+    start: datetime,
+    end: datetime,
+    duration_minutes: int = Query(..., ge=1),
+    user_ids: List[str] = Query(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find the first slot of the given length in which all users are free."""
+    availability_service = AvailabilityService(db)
+    try:
+        slot = await availability_service.find_common_slot(
+            user_ids, timedelta(minutes=duration_minutes), start, end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"slot": _blocks([slot])[0] if slot else None}
+
+@router.post("/slots", response_model=SlotSuggestions)
+async def suggest_slots(
+    search: SlotSearch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Suggest the earliest slots within working hours when all attendees are free."""
+    availability_service = AvailabilityService(db)
+    try:
+        slots = await availability_service.suggest_slots(
+            search.attendee_ids,
+            timedelta(minutes=search.duration_minutes),
+            search.start,
+            search.end,
+            working_hours=(search.working_hours_start, search.working_hours_end),
+            weekdays=search.weekdays,
+            step=timedelta(minutes=search.step_minutes),
+            limit=search.limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"slots": _blocks(slots)}
@@ -1,33 +1,50 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db.session import get_db
-from app.core.security import get_current_user
+from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.notification import Notification, NotificationStatus
-from app.schemas.notification import NotificationInDB
+from app.schemas.notification import TimelinePage
+from app.core.cache import UnreadCounter
+from app.services.notification_feed import NotificationFeedService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[NotificationInDB])
+@router.get("/", response_model=TimelinePage)
 async def list_notifications(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all notifications for current user."""
-    result = await db.execute(
-        select(Notification)
-        .where(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    """List the current user's private notifications merged with unread broadcasts."""
+    feed_service = NotificationFeedService(db)
+    try:
+        items, next_cursor = await feed_service.get_timeline(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            default_watermark=current_user.created_at
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/unread-count")
+async def get_unread_count(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the number of unread notifications for the current user."""
+    feed_service = NotificationFeedService(db)
+    count = await feed_service.get_unread_count(
+        current_user.id,
+        default_watermark=current_user.created_at
     )
-    notifications = result.scalars().all()
-    return notifications
+    return {"count": count}
 
 @router.put("/{notification_id}/read")
 async def mark_notification_read(
@@ -36,17 +53,10 @@ async def mark_notification_read(
     db: AsyncSession = Depends(get_db)
 ):
     """Mark a notification as read."""
-    result = await db.execute(
-        select(Notification).where(
-            Notification.id == notification_id,
-            Notification.user_id == current_user.id
-        )
-    )
-    notification = result.scalar_one_or_none()
-    if not notification:
+    feed_service = NotificationFeedService(db)
+    if not await feed_service.mark_read(notification_id, current_user.id):
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    notification.status = NotificationStatus.READ
     await db.commit()
     return {"status": "success"}
 
@@ -56,19 +66,11 @@ async def mark_all_notifications_read(
     db: AsyncSession = Depends(get_db)
 ):
     """Mark all notifications as read."""
-    result = await db.execute(
-        select(Notification).where(
-            Notification.user_id == current_user.id,
-            Notification.status == NotificationStatus.UNREAD
-        )
-    )
-    notifications = result.scalars().all()
-    
-    for notification in notifications:
-        notification.status = NotificationStatus.READ
+    feed_service = NotificationFeedService(db)
+    count = await feed_service.mark_all_read(current_user.id)
     
     await db.commit()
-    return {"status": "success", "count": len(notifications)}
+    return {"status": "success", "count": count}
 
 @router.delete("/{notification_id}")
 async def delete_notification(
@@ -87,6 +89,9 @@ async def delete_notification(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
+    was_unread = notification.status == NotificationStatus.UNREAD
     await db.delete(notification)
     await db.commit()
+    if was_unread:
+        await UnreadCounter.incr(current_user.id, -1)
     return {"status": "success"} 
\ No newline at end of file
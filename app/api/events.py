@@ -1,13 +1,17 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.api.dependencies import get_current_user, check_permissions
 from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventShareUsers
 from app.schemas.changelog import ChangelogResponse, DiffResponse, VersionHistoryEntry
+from app.schemas.search import EventSearchHit, EventFacetPage
 from app.models.user import User, UserRole
 from app.services.event import EventService
 from app.services.changelog import ChangelogService
+from app.services.search import EventSearchService
+from app.services.facets import EventFacetService
+from app.models.event import EventStatus
 from datetime import datetime
 
 router = APIRouter()
@@ -64,6 +68,102 @@ async def list_events(
     
     return [EventResponse.from_orm(event) for event in events]
 
+@router.get("/search", response_model=List[EventSearchHit])
+async def search_events(
+    *,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    response: Response,
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    event_status: Optional[EventStatus] = Query(None, alias="status"),
+    is_private: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+) -> List[EventSearchHit]:
+    """Search visible events by text, fuzzy title and filters.
+
+    The cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    """
+    search_service = EventSearchService(db)
+    try:
+        hits, next_cursor = await search_service.search(
+            user_id=current_user.id,
+            query=q,
+            title=title,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            status=event_status,
+            is_private=is_private,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [
+        EventSearchHit.model_validate(event).model_copy(update={"rank": rank})
+        for event, rank in hits
+    ]
+
+@router.get("/facets", response_model=EventFacetPage)
+async def search_events_with_facets(
+    *,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    q: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    event_status: Optional[EventStatus] = Query(None, alias="status"),
+    is_private: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+) -> EventFacetPage:
+    """Search visible events and count them by status, location and week."""
+    facet_service = EventFacetService(db)
+    try:
+        page = await facet_service.search_with_facets(
+            user_id=current_user.id,
+            query=q,
+            title=title,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            status=event_status,
+            is_private=is_private,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    page["items"] = [
+        EventSearchHit.model_validate(event).model_copy(update={"rank": rank})
+        for event, rank in page["items"]
+    ]
+    return page
+
+@router.get("/calendar", response_model=List[EventSearchHit])
+async def get_calendar(
+    *,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    start: datetime,
+    end: datetime
+) -> List[EventSearchHit]:
+    """List events the user owns or was shared that start within a range."""
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start")
+    event_service = EventService(db)
+    events = await event_service.get_calendar(current_user.id, start, end)
+    return [EventSearchHit.model_validate(event) for event in events]
+
 @router.get("/{id}", response_model=EventResponse)
 async def get_event(
     *,
@@ -119,6 +219,7 @@ async def create_events_batch(
     *,
     db: AsyncSession = Depends(get_db),
     events_in: List[EventCreate],
+    skip_failures: bool = Query(False, description="Skip conflicting events instead of rejecting the batch"),
     current_user: User = Depends(get_current_user)
 ) -> List[EventResponse]:
     """Create multiple events in a single request."""
@@ -126,7 +227,8 @@ async def create_events_batch(
     
     created_events = await event_service.batch_create_events(
         [event.dict() for event in events_in],
-        current_user.id
+        current_user.id,
+        skip_failures=skip_failures
     )
     
     return [EventResponse.from_orm(event) for event in created_events]
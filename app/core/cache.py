@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 import json
 import redis
 from app.core.config import settings
@@ -66,4 +66,97 @@ class TokenBlocklistManager:
     @classmethod
     async def is_blocked(cls, jti: str) -> bool:
         """Check if a token's jti is in the blocklist."""
-        return redis_client.exists(f"blocklist:{jti}") 
\ No newline at end of file
+        return redis_client.exists(f"blocklist:{jti}")
+
+class UnreadCounter:
+    """Per-user count of unread private notifications kept in Redis.
+
+    The counter is a cache: it expires after ``ttl`` seconds and callers fall
+    back to counting in the database when it is missing or Redis is down.
+    """
+    ttl = 3600  # 1 hour in seconds
+    _incr_if_exists = (
+        "if redis.call('exists', KEYS[1]) == 1 then "
+        "return redis.call('incrby', KEYS[1], ARGV[1]) end "
+        "return nil"
+    )
+
+    @staticmethod
+    def get_key(user_id: str) -> str:
+        return f"notifications:unread:{user_id}"
+
+    @classmethod
+    async def get(cls, user_id: str) -> Optional[int]:
+        """Get the cached unread count, or None on a miss."""
+        try:
+            value = redis_client.get(cls.get_key(user_id))
+        except redis.RedisError:
+            return None
+        return int(value) if value is not None else None
+
+    @classmethod
+    async def set(cls, user_id: str, count: int) -> None:
+        """Store an authoritative unread count."""
+        try:
+            redis_client.setex(cls.get_key(user_id), cls.ttl, max(count, 0))
+        except redis.RedisError:
+            pass
+
+    @classmethod
+    async def incr(cls, user_id: str, amount: int = 1) -> None:
+        """Adjust a cached count; a missing key stays missing until recomputed."""
+        cls.apply(user_id, amount)
+
+    @classmethod
+    async def reset(cls, user_id: str) -> None:
+        """Set the count to zero after the user has read everything."""
+        cls.apply(user_id, None)
+
+    @classmethod
+    def apply(cls, user_id: str, amount: Optional[int]) -> None:
+        """Apply a committed change: add ``amount``, or reset to zero when it is None.
+
+        Synchronous so it can run from a session ``after_commit`` hook.
+        """
+        key = cls.get_key(user_id)
+        try:
+            if amount is None:
+                redis_client.setex(key, cls.ttl, 0)
+                return
+            value = redis_client.eval(cls._incr_if_exists, 1, key, amount)
+            if value is not None and int(value) < 0:
+                redis_client.delete(key)
+        except redis.RedisError:
+            pass
+
+class FacetCache:
+    """Redis copy of the public facet counts and the flag that they are stale.
+
+    Event writes mark the view stale; the refresh task only refreshes the
+    materialised view when something changed since the last run.
+    """
+    key = "facets:public"
+    stale_key = "facets:stale"
+
+    def __init__(self, client: redis.Redis = redis_client):
+        self.client = client
+
+    def get(self) -> Optional[Dict[str, Dict[str, int]]]:
+        cached = self.client.get(self.key)
+        return json.loads(cached) if cached else None
+
+    def set(self, facets: Dict[str, Dict[str, int]]) -> None:
+        self.client.set(self.key, json.dumps(facets), ex=settings.FACET_CACHE_TTL)
+
+    def mark_stale(self) -> None:
+        self.client.set(self.stale_key, 1)
+
+    def take_stale(self) -> bool:
+        """Clear the stale flag, returning whether it was set."""
+        return bool(self.client.getdel(self.stale_key))
+
+    def invalidate(self) -> None:
+        self.client.delete(self.key)
+
+# Create a singleton instance
+facet_cache = FacetCache()
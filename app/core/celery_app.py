@@ -1,5 +1,6 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 from app.core.config import settings
 
 # Create Celery app
@@ -10,7 +11,10 @@ celery_app = Celery(
     include=[
         "app.tasks.email",
         "app.tasks.reminders",
-        "app.tasks.analytics"
+        "app.tasks.analytics",
+        "app.tasks.archive",
+        "app.tasks.maintenance",
+        "app.tasks.export"
     ]
 )
 
@@ -28,24 +32,58 @@ celery_app.conf.update(
 
 # Periodic task scheduling
 celery_app.conf.beat_schedule = {
+    "dispatch-due-reminders": {
+        "task": "dispatch_due_reminders",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
     "check-upcoming-events": {
-        "task": "app.tasks.reminders.check_upcoming_events",
+        "task": "check_upcoming_events",
         "schedule": crontab(minute="*/30"),  # Every 30 minutes
     },
     "check-recurring-events": {
-        "task": "app.tasks.reminders.check_recurring_events",
+        "task": "check_recurring_events",
         "schedule": crontab(hour="*/1"),  # Every hour
     },
     "cleanup-old-events": {
-        "task": "app.tasks.reminders.cleanup_old_events",
+        "task": "cleanup_old_events",
         "schedule": crontab(hour="0", minute="0"),  # Daily at midnight
     },
-    "track-event-metrics": {
-        "task": "app.tasks.analytics.track_event_metrics",
-        "schedule": crontab(minute="*/15"),  # Every 15 minutes
+    "archive-cold-history": {
+        "task": "archive_cold_history",
+        "schedule": crontab(hour="1", minute="0"),  # Daily at 1am, after cleanup
+    },
+    "maintain-partitions": {
+        "task": "maintain_partitions",
+        "schedule": crontab(hour="2", minute="0"),  # Daily at 2am
+    },
+    "export-analytics-parquet": {
+        "task": "export_analytics_parquet",
+        "schedule": crontab(hour="3", minute="0"),  # Daily at 3am
+    },
+    "sweep-expired-shares": {
+        "task": "sweep_expired_shares",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
+    "rebuild-event-access": {
+        "task": "rebuild_event_access",
+        "schedule": crontab(hour="4", minute="0"),  # Daily at 4am
+    },
+    "refresh-event-facets": {
+        "task": "refresh_event_facets",
+        "schedule": crontab(minute="*/5"),  # Every 5 minutes
+    },
+    "consume-analytics-changes": {
+        "task": "consume_analytics_changes",
+        "schedule": crontab(minute="*"),  # Every minute
     },
     "generate-weekly-reports": {
-        "task": "app.tasks.analytics.generate_weekly_report",
+        "task": "generate_weekly_report",
         "schedule": crontab(hour="0", minute="0", day_of_week="monday"),  # Every Monday at midnight
     }
-} 
\ No newline at end of file
+}
+
+@worker_process_init.connect
+def precompile_email_templates(**kwargs) -> None:
+    """Compile email templates once when each worker process boots."""
+    from app.core.email_templates import template_renderer
+    template_renderer.precompile()
@@ -58,6 +58,66 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_FROM_NAME: str = "Event Management System"
+    MAIL_BATCH_SIZE: int = 50  # recipients sent over one SMTP connection
+    MAIL_BATCH_CONCURRENCY: int = 4  # simultaneous SMTP connections
+    EMAIL_TEMPLATE_CACHE_DIR: Optional[str] = None  # defaults to a temp directory
+    EMAIL_FRAGMENT_CACHE_SIZE: int = 256
+
+    # Reminders
+    REMINDER_DISPATCH_BATCH: int = 500  # due reminders popped per round
+    REMINDER_RECIPIENT_CHUNK: int = 200  # recipients per delivery job
+    REMINDER_LEASE_SECONDS: int = 600  # popped reminders return to the due set unless acked in time
+    REMINDER_CLAIM_CHUNK: int = 5000  # ledger rows per claiming INSERT, under the bind parameter limit
+
+    # Event cleanup
+    EVENT_ARCHIVE_AFTER_DAYS: int = 30
+    EVENT_CLEANUP_BATCH_SIZE: int = 1000
+
+    # Cold storage
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_RETENTION_DAYS: int = 180  # history of events ended before this moves to cold storage
+    ARCHIVE_BATCH_SIZE: int = 100  # events archived per transaction
+
+    # Analytics
+    ANALYTICS_BATCH_SIZE: int = 500  # changed events folded per transaction
+
+    # Free/busy
+    AVAILABILITY_MAX_USERS: int = 500  # calendars merged per request
+    AVAILABILITY_MAX_WINDOW_DAYS: int = 90
+
+    # Materialised per-user event access (calendar reads)
+    EVENT_ACCESS_TABLE_ENABLED: bool = False
+    EVENT_ACCESS_REBUILD_BATCH: int = 500  # users repaired per transaction
+
+    # Client sync
+    SYNC_JOURNAL_LAG_SECONDS: int = 5  # upper bound on INSERT-to-COMMIT time of journal rows
+
+    # Share expiry
+    SHARE_EXPIRY_BATCH_SIZE: int = 500  # expired shares revoked per transaction
+
+    # Search facets
+    FACET_CACHE_TTL: int = 300  # seconds the public facet counts stay cached
+
+    # Columnar exports
+    EXPORT_DIR: str = "exports"
+    EXPORT_BATCH_SIZE: int = 50000  # rows per server-side fetch and Parquet row group
+    EXPORT_LAG_SECONDS: int = 60  # rows newer than this wait for the next run
+
+    # Monthly partitions (audit_logs, versions, notifications)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    AUDIT_LOG_RETENTION_MONTHS: int = 24  # 0 keeps every partition
+    NOTIFICATION_RETENTION_MONTHS: int = 12
+    VERSION_RETENTION_MONTHS: int = 0
+
+    # Notification digests
+    NOTIFICATION_DIGEST_WINDOW: int = 60  # seconds
+    NOTIFICATION_DIGEST_MAX_BATCH: int = 50
+    NOTIFICATION_DIGEST_MAX_ATTEMPTS: int = 3  # deliveries tried before a digest is dropped
+
+    # Write coalescing (read receipts, sync acknowledgements)
+    WRITE_COALESCING_ENABLED: bool = False
+    WRITE_COALESCE_DELAY_MS: int = 5  # longest a queued write waits for company
+    WRITE_COALESCE_MAX_BATCH: int = 500  # rows per flushed statement
 
     # Redis settings
     REDIS_HOST: str = "localhost"
@@ -1,5 +1,6 @@
-from typing import Any, Dict, List, Optional, Type, TypeVar
-from sqlalchemy import select, update, delete
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+from sqlalchemy import select, update, delete, insert, values, column, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 from sqlalchemy.orm import selectinload, joinedload
@@ -11,30 +12,32 @@ from app.core.exceptions import (
     ConflictException,
     ValidationException
 )
+from app.core.load_profiles import load_options
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+BULK_CHUNK_SIZE = 1000  # rows per INSERT or COPY round trip
+
 class DatabaseUtils:
     @staticmethod
     async def get_by_id(
         session: AsyncSession,
         model: Type[T],
         id: str,
-        load_relationships: bool = False
+        load_relationships: bool = False,
+        profile: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
     ) -> Optional[T]:
-        """Get a record by ID with optional relationship loading."""
+        """Get a record by ID, loaded through an optional named load profile."""
         try:
-            query = select(model).where(model.id == id)
-            
-            if load_relationships:
-                # Load all relationships using selectinload
-                for relationship in model.__mapper__.relationships:
-                    query = query.options(selectinload(relationship.key))
+            query = select(model).where(model.id == id).options(
+                *DatabaseUtils._query_options(model, load_relationships, profile, columns)
+            )
             
             result = await session.execute(query)
-            instance = result.scalar_one_or_none()
+            instance = result.unique().scalar_one_or_none()
             
             if not instance:
                 raise NotFoundException(
@@ -57,19 +60,18 @@ class DatabaseUtils:
         model: Type[T],
         skip: int = 0,
         limit: int = 100,
-        load_relationships: bool = False
+        load_relationships: bool = False,
+        profile: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
     ) -> List[T]:
-        """Get all records with pagination and optional relationship loading."""
+        """Get all records with pagination, loaded through an optional named load profile."""
         try:
-            query = select(model).offset(skip).limit(limit)
-            
-            if load_relationships:
-                # Load all relationships using selectinload
-                for relationship in model.__mapper__.relationships:
-                    query = query.options(selectinload(relationship.key))
+            query = select(model).offset(skip).limit(limit).options(
+                *DatabaseUtils._query_options(model, load_relationships, profile, columns)
+            )
             
             result = await session.execute(query)
-            return result.scalars().all()
+            return result.unique().scalars().all()
             
         except SQLAlchemyError as e:
             logger.error(f"Database error while fetching all {model.__name__}: {str(e)}")
@@ -78,6 +80,25 @@ class DatabaseUtils:
                 details={"error": str(e)}
             )
 
+    @staticmethod
+    def _query_options(
+        model: Type[T],
+        load_relationships: bool,
+        profile: Optional[str],
+        columns: Optional[Sequence[str]]
+    ) -> List[Any]:
+        """Loader options for a read.
+
+        A named ``profile`` wins. Without one, ``load_relationships`` keeps
+        its old meaning of selectin-loading every relationship, with all
+        columns loaded.
+        """
+        if profile is None:
+            if load_relationships:
+                return [selectinload(relationship.class_attribute) for relationship in model.__mapper__.relationships]
+            return []
+        return load_options(model, profile, columns)
+
     @staticmethod
     async def create(
         session: AsyncSession,
@@ -201,16 +222,48 @@ class DatabaseUtils:
     async def bulk_create(
         session: AsyncSession,
         model: Type[T],
-        data_list: List[Dict[str, Any]]
-    ) -> List[T]:
-        """Bulk create records."""
+        data_list: List[Dict[str, Any]],
+        return_objects: bool = True,
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        use_copy: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Union[List[T], int]:
+        """Bulk create records.
+
+        Rows go in as multi-row INSERTs of ``chunk_size`` rows. With
+        ``return_objects`` each chunk comes back through ``RETURNING`` as
+        instances; otherwise nothing is hydrated and the number of rows
+        written is returned. ``conflict_columns`` makes the insert an upsert
+        that overwrites ``update_columns`` (or skips the row when none are
+        given). ``use_copy`` streams plain inserts with COPY instead.
+        """
+        if use_copy and (return_objects or conflict_columns):
+            raise ValidationException(
+                message="COPY ingestion cannot return objects or upsert",
+                details={"model": model.__name__}
+            )
         try:
-            instances = [model(**data) for data in data_list]
-            session.add_all(instances)
+            instances: List[T] = []
+            written = 0
+            for start in range(0, len(data_list), chunk_size):
+                chunk = data_list[start:start + chunk_size]
+                if use_copy:
+                    written += await DatabaseUtils._copy_rows(session, model, chunk)
+                    continue
+                stmt = DatabaseUtils._insert_statement(model, conflict_columns, update_columns)
+                if return_objects:
+                    result = await session.scalars(
+                        stmt.returning(model).execution_options(populate_existing=True),
+                        chunk
+                    )
+                    instances.extend(result.unique().all())
+                else:
+                    # Primary keys alone still count skipped conflicts correctly
+                    result = await session.execute(stmt.returning(*model.__mapper__.primary_key), chunk)
+                    written += len(result.all())
             await session.commit()
-            for instance in instances:
-                await session.refresh(instance)
-            return instances
+            return instances if return_objects else written
             
         except IntegrityError as e:
             await session.rollback()
@@ -227,29 +280,102 @@ class DatabaseUtils:
                 details={"error": str(e)}
             )
 
+    @staticmethod
+    def _insert_statement(
+        model: Type[T],
+        conflict_columns: Optional[Sequence[str]],
+        update_columns: Optional[Sequence[str]]
+    ):
+        if not conflict_columns:
+            return insert(model)
+        stmt = pg_insert(model)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        return stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+
+    @staticmethod
+    async def _copy_rows(
+        session: AsyncSession,
+        model: Type[T],
+        rows: List[Dict[str, Any]]
+    ) -> int:
+        """Stream rows into the model's table with asyncpg's binary COPY.
+
+        COPY bypasses SQLAlchemy, so Python-side column defaults and bind
+        processing (enums, JSON) are applied here.
+        """
+        table = model.__table__
+        connection = await session.connection()
+        dialect = connection.dialect
+        defaults = {
+            column.name: column.default
+            for column in table.columns
+            if column.default is not None and (column.default.is_scalar or column.default.is_callable)
+        }
+        columns = list(dict.fromkeys([*(key for row in rows for key in row), *defaults]))
+        processors = {name: table.c[name].type.dialect_impl(dialect).bind_processor(dialect) for name in columns}
+
+        def value(row: Dict[str, Any], name: str) -> Any:
+            if name in row:
+                raw = row[name]
+            elif name in defaults:
+                default = defaults[name]
+                raw = default.arg(None) if default.is_callable else default.arg
+            else:
+                raw = None
+            processor = processors[name]
+            return processor(raw) if processor and raw is not None else raw
+
+        records = [tuple(value(row, name) for name in columns) for row in rows]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=columns,
+            schema_name=table.schema
+        )
+        return len(records)
+
     @staticmethod
     async def bulk_update(
         session: AsyncSession,
         model: Type[T],
         data_list: List[Dict[str, Any]],
-        id_field: str = "id"
-    ) -> List[T]:
-        """Bulk update records."""
+        id_field: str = "id",
+        return_objects: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Union[List[T], List[Any]]:
+        """Bulk update records.
+
+        Each item holds ``id_field`` and only the fields to change. Items
+        that change the same fields are applied together as one
+        ``UPDATE ... FROM (VALUES ...)`` per chunk. Returns the updated rows,
+        or just their ids without ``return_objects``; ids that match nothing
+        are left out.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for data in data_list:
+            fields = tuple(sorted(key for key in data if key != id_field))
+            if fields:
+                groups.setdefault(fields, []).append(data)
         try:
-            for data in data_list:
-                id_value = data.pop(id_field)
-                query = (
-                    update(model)
-                    .where(getattr(model, id_field) == id_value)
-                    .values(**data)
-                )
-                await session.execute(query)
+            updated: List[Any] = []
+            for fields, rows in groups.items():
+                for start in range(0, len(rows), chunk_size):
+                    stmt = DatabaseUtils._update_statement(model, id_field, fields, rows[start:start + chunk_size])
+                    if return_objects:
+                        result = await session.scalars(
+                            stmt.returning(model).execution_options(populate_existing=True)
+                        )
+                        updated.extend(result.unique().all())
+                    else:
+                        result = await session.execute(stmt.returning(getattr(model, id_field)))
+                        updated.extend(result.scalars().all())
             await session.commit()
-            return await DatabaseUtils.get_all(
-                session,
-                model,
-                load_relationships=True
-            )
+            return updated
             
         except IntegrityError as e:
             await session.rollback()
@@ -264,4 +390,27 @@ class DatabaseUtils:
             raise DatabaseException(
                 message=f"Error bulk updating {model.__name__}",
                 details={"error": str(e)}
-            ) 
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _update_statement(
+        model: Type[T],
+        id_field: str,
+        fields: Tuple[str, ...],
+        rows: List[Dict[str, Any]]
+    ):
+        table = model.__table__
+        names = (id_field, *fields)
+        # UPDATE ... FROM picks an arbitrary match per target row; keep the last item per id
+        latest = {row[id_field]: row for row in rows}
+        updates = values(
+            *[column(name, table.c[name].type) for name in names],
+            name="updates"
+        ).data([tuple(row[name] for name in names) for row in latest.values()])
+        # VALUES columns arrive untyped; cast them back to the target column types
+        return (
+            update(model)
+            .where(getattr(model, id_field) == cast(updates.c[id_field], table.c[id_field].type))
+            .values({name: cast(updates.c[name], table.c[name].type) for name in fields})
+            .execution_options(synchronize_session=False)
+        )
@@ -1,9 +1,17 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from email.message import EmailMessage
+from email.utils import formataddr
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from app.core.config import settings
-from jinja2 import Environment, FileSystemLoader
+from app.core.email_templates import EmailTemplateRenderer, FragmentContext, template_renderer
+from jinja2 import Template
+import aiosmtplib
+import asyncio
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Email configuration
 email_conf = ConnectionConfig(
     MAIL_USERNAME=settings.MAIL_USERNAME,
@@ -21,10 +29,8 @@ email_conf = ConnectionConfig(
 # Initialize FastMail
 fastmail = FastMail(email_conf)
 
-# Initialize Jinja2 environment
-template_env = Environment(
-    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates/email'))
-)
+# Compiled templates are shared with the batch mailer
+template_env = template_renderer.environment
 
 async def send_email(
     email_to: str,
@@ -46,4 +52,134 @@ async def send_email(
     )
 
     # Send email
-    await fastmail.send_message(message) 
\ No newline at end of file
+    await fastmail.send_message(message)
+
+class BatchMailer:
+    """Sends one template to many recipients over reused SMTP connections.
+
+    The precompiled template is fetched once per batch; shared fragments are
+    rendered once per ``cache_key`` and only the personalised parts are
+    rendered per recipient. Recipients are split into chunks of
+    ``chunk_size``; each chunk is sent over a single SMTP session and at most
+    ``concurrency`` sessions are open at a time.
+    """
+
+    def __init__(
+        self,
+        hostname: str = settings.MAIL_SERVER,
+        port: int = settings.MAIL_PORT,
+        username: Optional[str] = settings.MAIL_USERNAME,
+        password: Optional[str] = settings.MAIL_PASSWORD,
+        sender: str = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM)),
+        start_tls: Optional[bool] = True,
+        chunk_size: int = settings.MAIL_BATCH_SIZE,
+        concurrency: int = settings.MAIL_BATCH_CONCURRENCY,
+        renderer: EmailTemplateRenderer = template_renderer
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.start_tls = start_tls
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.renderer = renderer
+
+    async def send_batch(
+        self,
+        subject: str,
+        template_name: str,
+        shared_data: Dict[str, Any],
+        recipients: Dict[str, Dict[str, Any]],
+        cache_key: Optional[str] = None
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """Send the template to every recipient.
+
+        ``recipients`` maps each email address to its personal template
+        variables. ``cache_key`` identifies the shared data (e.g. event id and
+        version) for fragment caching. Returns a status entry per recipient:
+        ``{"status": "sent" | "failed", "error": <message or None>}``.
+        """
+        template = self.renderer.get_template(template_name)
+        fragments = self.renderer.fragments(shared_data, cache_key)
+        emails = list(recipients)
+        chunks = [emails[i:i + self.chunk_size] for i in range(0, len(emails), self.chunk_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_chunk(chunk: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+            async with semaphore:
+                return await self._send_chunk(subject, template, fragments, shared_data, recipients, chunk)
+
+        results: Dict[str, Dict[str, Optional[str]]] = {}
+        for chunk_results in await asyncio.gather(*(send_chunk(chunk) for chunk in chunks)):
+            results.update(chunk_results)
+
+        failed = sum(1 for result in results.values() if result["status"] == "failed")
+        logger.info(f"Batch '{subject}' sent to {len(results) - failed} recipients, {failed} failed")
+        return results
+
+    async def _send_chunk(
+        self,
+        subject: str,
+        template: Template,
+        fragments: FragmentContext,
+        shared_data: Dict[str, Any],
+        recipients: Dict[str, Dict[str, Any]],
+        chunk: List[str]
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        results: Dict[str, Dict[str, Optional[str]]] = {}
+        try:
+            smtp = await self._connect()
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.error(f"Error connecting to SMTP server: {str(e)}")
+            return {email: {"status": "failed", "error": str(e)} for email in chunk}
+
+        try:
+            for email in chunk:
+                try:
+                    message = self._build_message(
+                        subject,
+                        email,
+                        self.renderer.render(template, fragments, shared_data, recipients[email])
+                    )
+                except Exception as e:
+                    # A bad recipient context fails that recipient, not the chunk
+                    logger.error(f"Error rendering email to {email}: {str(e)}")
+                    results[email] = {"status": "failed", "error": str(e)}
+                    continue
+                try:
+                    try:
+                        await smtp.send_message(message)
+                    except aiosmtplib.SMTPServerDisconnected:
+                        # The server dropped the session; reconnect once and retry
+                        smtp = await self._connect()
+                        await smtp.send_message(message)
+                    results[email] = {"status": "sent", "error": None}
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    logger.error(f"Error sending email to {email}: {str(e)}")
+                    results[email] = {"status": "failed", "error": str(e)}
+        finally:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                pass
+        return results
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(hostname=self.hostname, port=self.port, start_tls=self.start_tls)
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        return smtp
+
+    def _build_message(self, subject: str, email_to: str, html_content: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email_to
+        message["Subject"] = subject
+        message.set_content(html_content, subtype="html")
+        return message
+
+# Create a singleton instance
+batch_mailer = BatchMailer()
@@ -0,0 +1,150 @@
+from typing import Any, Dict, Optional, Tuple, Union
+from collections import OrderedDict
+from datetime import datetime
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from markupsafe import Markup
+from app.core.config import settings
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates/email')
+FRAGMENT_DIR = "fragments"
+
+def format_datetime(value: Union[datetime, str, None], fmt: str) -> str:
+    """``datetime`` template filter; template data carries ISO strings from ``to_dict``."""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.strftime(fmt)
+
+class FragmentCache:
+    """In-memory LRU cache of rendered, recipient-independent fragments."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, str], Markup]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Markup]:
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Tuple[str, str], value: Markup) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class FragmentContext:
+    """Lazy ``fragments`` mapping exposed to templates.
+
+    ``{{ fragments.event_details }}`` renders ``fragments/event_details.html``
+    with the batch's shared data the first time it is used for a cache key and
+    serves the cached HTML for every later recipient.
+    """
+
+    def __init__(self, renderer: "EmailTemplateRenderer", shared_data: Dict[str, Any], cache_key: Optional[str]):
+        self._renderer = renderer
+        self._shared_data = shared_data
+        self._cache_key = cache_key
+        self._local: Dict[str, Markup] = {}
+
+    def __getitem__(self, name: str) -> Markup:
+        if name not in self._local:
+            self._local[name] = self._renderer.render_fragment(name, self._shared_data, self._cache_key)
+        return self._local[name]
+
+class EmailTemplateRenderer:
+    """Email template subsystem.
+
+    Compiled templates are kept by the Jinja environment and their bytecode is
+    cached on disk so that new worker processes skip parsing. Fragments under
+    ``fragments/`` only depend on shared data (the event) and are rendered once
+    per cache key, typically ``<event id>:<event version>``.
+    """
+
+    def __init__(
+        self,
+        loader: BaseLoader,
+        bytecode_cache_dir: Optional[str] = None,
+        fragment_cache_size: int = settings.EMAIL_FRAGMENT_CACHE_SIZE
+    ):
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        self.environment = Environment(
+            loader=loader,
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            cache_size=-1  # Never evict compiled templates
+        )
+        self.environment.filters["datetime"] = format_datetime
+        self.fragment_cache = FragmentCache(fragment_cache_size)
+
+    def precompile(self) -> int:
+        """Compile every template up front; returns the number compiled."""
+        count = 0
+        for name in self.environment.list_templates():
+            try:
+                self.environment.get_template(name)
+                count += 1
+            except Exception as e:
+                logger.error(f"Error compiling email template {name}: {str(e)}")
+        logger.info(f"Precompiled {count} email templates")
+        return count
+
+    def get_template(self, template_name: str) -> Template:
+        return self.environment.get_template(template_name)
+
+    def fragments(self, shared_data: Dict[str, Any], cache_key: Optional[str] = None) -> FragmentContext:
+        """Create the ``fragments`` mapping for one batch."""
+        return FragmentContext(self, shared_data, cache_key)
+
+    def render_fragment(self, name: str, shared_data: Dict[str, Any], cache_key: Optional[str] = None) -> Markup:
+        """Render a shared fragment, using the LRU cache when a cache key is given."""
+        key = (name, cache_key) if cache_key else None
+        if key:
+            cached = self.fragment_cache.get(key)
+            if cached is not None:
+                return cached
+        html = Markup(self.get_template(f"{FRAGMENT_DIR}/{name}.html").render(**shared_data))
+        if key:
+            self.fragment_cache.set(key, html)
+        return html
+
+    def render(
+        self,
+        template: Template,
+        fragments: FragmentContext,
+        shared_data: Dict[str, Any],
+        recipient_data: Dict[str, Any]
+    ) -> str:
+        """Render the personalised parts of a template for one recipient."""
+        # Recipient values override shared ones of the same name
+        return template.render({**shared_data, **recipient_data}, fragments=fragments)
+
+# Create a singleton instance
+template_renderer = EmailTemplateRenderer(
+    FileSystemLoader(TEMPLATE_DIR),
+    bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR or os.path.join(
+        tempfile.gettempdir(),
+        "event_management_templates"
+    )
+)
@@ -101,6 +101,11 @@ class EventError(BaseAppException):
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(status_code=400, message=message, details=details)
 
+class SyncError(BaseAppException):
+    """Exception raised for client sync errors."""
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(status_code=409, message=message, details=details)
+
 def handle_exception(exc: Exception) -> BaseAppException:
     """Handle exceptions and convert them to appropriate application exceptions."""
     if isinstance(exc, BaseAppException):
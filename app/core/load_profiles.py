@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+from sqlalchemy import JSON
+from sqlalchemy.orm import defer, undefer, load_only, selectinload, joinedload, raiseload
+from app.core.exceptions import ValidationException
+from app.models.event import Event
+from app.models.user import User
+
+# Named loader option sets per model, e.g. _PROFILES[Event]["summary"]
+_PROFILES: Dict[type, Dict[str, List[Any]]] = {}
+
+def register_load_profile(model: type, name: str, *options: Any) -> None:
+    """Declare the exact loader options a named profile applies to ``model``."""
+    _PROFILES.setdefault(model, {})[name] = list(options)
+
+def wide_columns(model: type) -> List[Any]:
+    """JSON column attributes, which are left unloaded unless asked for."""
+    return [
+        getattr(model, prop.key)
+        for prop in model.__mapper__.column_attrs
+        if isinstance(prop.columns[0].type, JSON)
+    ]
+
+def load_options(model: Type, profile: str, columns: Optional[Sequence[str]] = None) -> List[Any]:
+    """Loader options for ``profile`` plus wide-column deferral.
+
+    ``columns`` names JSON columns the caller needs; every other JSON column
+    is deferred whatever the profile says.
+    """
+    profiles = _PROFILES.get(model, {})
+    if profile not in profiles:
+        raise ValidationException(
+            message=f"Unknown load profile '{profile}' for {model.__name__}",
+            details={"model": model.__name__, "profile": profile, "available": sorted(profiles)}
+        )
+    requested = set(columns or ())
+    options = list(profiles[profile])
+    for attribute in wide_columns(model):
+        options.append(undefer(attribute) if attribute.key in requested else defer(attribute))
+    return options
+
+# Creator columns embedded in event profiles; the rest of the user stays unloaded
+_creator = joinedload(Event.creator).options(load_only(User.id, User.username, User.full_name), raiseload("*"))
+
+register_load_profile(
+    Event,
+    "summary",
+    load_only(
+        Event.id, Event.title, Event.start_time, Event.end_time, Event.location,
+        Event.status, Event.is_private, Event.created_by
+    ),
+    raiseload("*")
+)
+register_load_profile(
+    Event,
+    "detail",
+    _creator,
+    selectinload(Event.shares).options(raiseload("*")),
+    raiseload("*")
+)
+register_load_profile(
+    Event,
+    "with_participants",
+    _creator,
+    selectinload(Event.participants).options(load_only(User.id, User.username, User.full_name), raiseload("*")),
+    raiseload("*")
+)
+
+register_load_profile(
+    User,
+    "summary",
+    load_only(User.id, User.email, User.username, User.full_name, User.role, User.is_active),
+    raiseload("*")
+)
+register_load_profile(
+    User,
+    "detail",
+    joinedload(User.sync_states).options(raiseload("*")),
+    selectinload(User.received_shares).options(raiseload("*")),
+    raiseload("*")
+)
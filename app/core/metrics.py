@@ -50,6 +50,37 @@ active_events = Gauge(
     "Number of active events"
 )
 
+# Notification metrics
+notifications_coalesced_in_total = Counter(
+    "notifications_coalesced_in_total",
+    "Total number of notifications submitted to the digest stage",
+    ["type"]
+)
+
+notifications_coalesced_out_total = Counter(
+    "notifications_coalesced_out_total",
+    "Total number of digest notifications delivered",
+    ["type"]
+)
+
+notification_coalescing_ratio = Gauge(
+    "notification_coalescing_ratio",
+    "Submitted notifications per delivered digest since startup"
+)
+
+# Write coalescing metrics
+coalesced_writes_total = Counter(
+    "coalesced_writes_total",
+    "Total number of rows submitted to the write coalescer",
+    ["kind"]
+)
+
+coalesced_flushes_total = Counter(
+    "coalesced_flushes_total",
+    "Total number of coalesced statements committed",
+    ["kind"]
+)
+
 def setup_metrics(app):
     """Setup Prometheus metrics for the application."""
     instrumentator = Instrumentator(
@@ -0,0 +1,150 @@
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+from app.core.config import settings
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month, mapped to their partition key
+PARTITIONED_TABLES: Dict[str, str] = {
+    "audit_logs": "timestamp",
+    "versions": "created_at",
+    "notifications": "created_at",
+}
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+def partition_by(table: str) -> str:
+    """``postgresql_partition_by`` clause for a partitioned table."""
+    return f'RANGE ("{PARTITIONED_TABLES[table]}")'
+
+def retention_months(table: str) -> int:
+    """Months of data kept for a table; 0 keeps every partition."""
+    return {
+        "audit_logs": settings.AUDIT_LOG_RETENTION_MONTHS,
+        "versions": settings.VERSION_RETENTION_MONTHS,
+        "notifications": settings.NOTIFICATION_RETENTION_MONTHS,
+    }[table]
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def add_months(month: datetime, months: int) -> datetime:
+    years, index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def create_partition_ddl(table: str, month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+def create_default_partition_ddl(table: str) -> str:
+    # Catches rows outside the premade range so inserts never fail
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+def list_partitions(connection: Connection, table: str) -> Dict[datetime, str]:
+    """Monthly partitions currently attached to ``table``, keyed by month."""
+    result = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table}
+    )
+    partitions = {}
+    for (name,) in result:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+def default_holds_month(connection: Connection, table: str, month: datetime) -> bool:
+    """Whether the DEFAULT partition caught rows that belong to ``month``."""
+    column = PARTITIONED_TABLES[table]
+    return connection.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM {table}_default WHERE "{column}" >= :start AND "{column}" < :end)'),
+        {"start": month, "end": add_months(month, 1)}
+    ).scalar()
+
+def create_partition_from_default(connection: Connection, table: str, month: datetime) -> None:
+    """Create a month's partition when the DEFAULT partition already holds rows for it.
+
+    Postgres refuses to create such a partition, so the DEFAULT partition
+    is detached, the partition created, the month's rows moved into it and
+    the DEFAULT partition attached again, all in the caller's transaction.
+    """
+    column = PARTITIONED_TABLES[table]
+    in_month = f'"{column}" >= :start AND "{column}" < :end'
+    bounds = {"start": month, "end": add_months(month, 1)}
+    connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {table}_default"))
+    connection.execute(text(create_partition_ddl(table, month)))
+    connection.execute(text(f"INSERT INTO {table} SELECT * FROM {table}_default WHERE {in_month}"), bounds)
+    connection.execute(text(f"DELETE FROM {table}_default WHERE {in_month}"), bounds)
+    connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT"))
+
+def ensure_partitions(
+    connection: Connection,
+    now: Optional[datetime] = None,
+    months_ahead: int = settings.PARTITION_PREMAKE_MONTHS,
+    months_back: int = 0,
+    tables: Optional[Iterable[str]] = None
+) -> List[str]:
+    """Create any missing monthly partitions; returns the names created.
+
+    Rows that already landed in the DEFAULT partition for a missing month
+    are moved into the new partition.
+    """
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for table in tables or PARTITIONED_TABLES:
+        existing = list_partitions(connection, table)
+        for offset in range(-months_back, months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            if default_holds_month(connection, table, month):
+                create_partition_from_default(connection, table, month)
+            else:
+                connection.execute(text(create_partition_ddl(table, month)))
+            created.append(partition_name(table, month))
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+def drop_expired_partitions(
+    connection: Connection,
+    now: Optional[datetime] = None,
+    tables: Optional[Iterable[str]] = None
+) -> List[str]:
+    """Detach and drop partitions that lie entirely before the retention window."""
+    current = month_start(now or datetime.utcnow())
+    dropped = []
+    for table in tables or PARTITIONED_TABLES:
+        months = retention_months(table)
+        if not months:
+            continue
+        cutoff = add_months(current, -months)
+        for month, name in sorted(list_partitions(connection, table).items()):
+            if add_months(month, 1) <= cutoff:
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                connection.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped expired partitions: {', '.join(dropped)}")
+    return dropped
+
+def create_initial_partitions(target, connection: Connection, **kw) -> None:
+    """``after_create`` hook so tables built by ``create_all`` accept inserts."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(create_default_partition_ddl(target.name)))
+    ensure_partitions(connection, months_back=1, tables=[target.name])
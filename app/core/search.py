@@ -0,0 +1,80 @@
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import text
+
+# Text search configuration used for the events search vector
+SEARCH_CONFIG = "english"
+
+CREATE_TRIGRAM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+# Title ranks above location, location above description
+CREATE_SEARCH_VECTOR_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION events_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.location, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER events_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, location ON events
+FOR EACH ROW EXECUTE FUNCTION events_search_vector_update()
+"""
+
+def create_trigram_extension(target, connection: Connection, **kw) -> None:
+    """``before_create`` hook so the trigram index can be built by ``create_all``."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(CREATE_TRIGRAM_EXTENSION))
+
+def create_search_trigger(target, connection: Connection, **kw) -> None:
+    """``after_create`` hook keeping ``events.search_vector`` current."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(CREATE_SEARCH_VECTOR_FUNCTION))
+    connection.execute(text(CREATE_SEARCH_VECTOR_TRIGGER))
+
+# Date facet granularity (a date_trunc field)
+FACET_DATE_BUCKET = "week"
+
+# Facet counts over public events; per-user private counts are added live.
+# The add_event_facet_counts_view migration holds a frozen copy of this view
+# with FACET_DATE_BUCKET inlined; change the two together.
+# GROUPING(status, location, bucket) tells the grouping sets apart:
+# 3 = by status, 5 = by location, 6 = by date bucket.
+CREATE_FACET_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS event_facet_counts AS
+SELECT
+    GROUPING(status, location, date_trunc('{FACET_DATE_BUCKET}', start_time)) AS facet_set,
+    CAST(status AS text) AS status,
+    location,
+    date_trunc('{FACET_DATE_BUCKET}', start_time) AS bucket,
+    count(*) AS count
+FROM events
+WHERE is_active AND NOT is_private
+GROUP BY GROUPING SETS ((status), (location), (date_trunc('{FACET_DATE_BUCKET}', start_time)))
+"""
+
+CREATE_FACET_VIEW_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS uix_event_facet_counts "
+    "ON event_facet_counts (facet_set, status, location, bucket)"
+)
+
+DROP_FACET_VIEW = "DROP MATERIALIZED VIEW IF EXISTS event_facet_counts"
+
+def create_facet_view(target, connection: Connection, **kw) -> None:
+    """``after_create`` hook building the facet count view over ``events``."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(CREATE_FACET_VIEW))
+    connection.execute(text(CREATE_FACET_VIEW_INDEX))
+
+def drop_facet_view(target, connection: Connection, **kw) -> None:
+    """``before_drop`` hook; the view would otherwise block dropping ``events``."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(DROP_FACET_VIEW))
@@ -7,7 +7,8 @@ from app.core.security.core_security import (
     verify_token,
     get_current_user,
     check_permissions,
-    validate_password_strength
+    validate_password_strength,
+    generate_sync_token
 )
 
 from datetime import datetime, timedelta
@@ -220,3 +220,7 @@ def validate_password_strength(password: str) -> bool:
     if not any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password):
         return False
     return True
+
+def generate_sync_token() -> str:
+    """Generate an opaque token identifying one sync round."""
+    return secrets.token_urlsafe(32)
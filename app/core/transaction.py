@@ -1,17 +1,24 @@
 from typing import Any, Callable, Dict, List, Optional
+import inspect
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+import json
 import logging
 from datetime import datetime
+from app.models.audit_log import AuditLog
 
 logger = logging.getLogger(__name__)
 
 class Transaction:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, parent: Optional["Transaction"] = None):
         self.session = session
+        self.parent = parent
         self.operations: List[Dict[str, Any]] = []
         self.rollback_operations: List[Callable] = []
+        self.after_commit_callbacks: List[Callable] = []
+        self.sequences: List[int] = []
         self.start_time = datetime.utcnow()
     async def add_operation(
         self,
@@ -19,41 +26,109 @@ class Transaction:
         entity_type: str,
         entity_id: str,
         data: Dict[str, Any],
-        rollback_func: Optional[Callable] = None
+        rollback_func: Optional[Callable] = None,
+        user_id: Optional[str] = None
     ):
         operation = {
             "type": operation_type,
             "entity_type": entity_type,
             "entity_id": entity_id,
             "data": data,
+            "user_id": user_id,
             "timestamp": datetime.utcnow()
         }
         self.operations.append(operation)
         if rollback_func:
             self.rollback_operations.append(rollback_func)
+    def after_commit(self, callback: Callable):
+        """Run ``callback`` once the outermost transaction has committed.
+
+        Side effects outside the database (Redis queues, reminders) go here so
+        they never describe writes that are later rolled back.
+        """
+        self.after_commit_callbacks.append(callback)
     async def commit(self):
-        try:
-            await self.session.commit()
-            logger.info(f"Transaction committed successfully with {len(self.operations)} operations")
-            return True
-        except Exception as e:
-            logger.error(f"Error committing transaction: {str(e)}")
-            await self.rollback()
-            return False
+        await self.flush_operations()
+        await self.session.commit()
+        logger.info(f"Transaction committed successfully with {len(self.operations)} operations")
+        for callback in self.after_commit_callbacks:
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error in after-commit callback: {str(e)}")
     async def rollback(self):
+        await self.undo()
+        await self.session.rollback()
+    async def undo(self):
         for rollback_func in reversed(self.rollback_operations):
             try:
                 await rollback_func()
             except Exception as e:
                 logger.error(f"Error during rollback: {str(e)}")
-        await self.session.rollback()
+    def merge_into_parent(self):
+        """Hand a released savepoint's operations to the enclosing transaction."""
+        self.parent.operations.extend(self.operations)
+        self.parent.rollback_operations.extend(self.rollback_operations)
+        self.parent.after_commit_callbacks.extend(self.after_commit_callbacks)
+    async def flush_operations(self):
+        """Write the operation log to ``audit_logs`` in one multi-row INSERT.
+
+        The journal sequence numbers are drawn by the same statement and kept
+        in ``sequences``. Operations without an acting user (batch summaries)
+        are only logged.
+        """
+        rows = [
+            {
+                "user_id": operation["user_id"],
+                "action": operation["type"],
+                "entity_type": operation["entity_type"],
+                "entity_id": operation["entity_id"],
+                "timestamp": operation["timestamp"],
+                # Operation data holds datetimes and enums; store their JSON-safe forms
+                "details": json.loads(json.dumps(operation["data"], default=str))
+            }
+            for operation in self.operations
+            if operation["user_id"]
+        ]
+        if rows:
+            result = await self.session.execute(insert(AuditLog).values(rows).returning(AuditLog.sequence))
+            self.sequences = list(result.scalars().all())
 
 @asynccontextmanager
 async def transaction_scope(session: AsyncSession):
+    """Run a unit of work; only the outermost scope on a session commits.
+
+    A scope opened inside another one runs in a savepoint: its failure rolls
+    back just its own writes, and on success its operations join the
+    enclosing scope's log, which is journaled when the outermost scope
+    commits. Commit errors, including journal failures, propagate.
+    """
+    parent = session.info.get("transaction")
+    if parent is not None:
+        transaction = Transaction(session, parent=parent)
+        savepoint = await session.begin_nested()
+        session.info["transaction"] = transaction
+        try:
+            yield transaction
+        except Exception as e:
+            await transaction.undo()
+            await savepoint.rollback()
+            raise e
+        finally:
+            session.info["transaction"] = parent
+        await savepoint.commit()
+        transaction.merge_into_parent()
+        return
+
     transaction = Transaction(session)
+    session.info["transaction"] = transaction
     try:
         yield transaction
         await transaction.commit()
     except Exception as e:
         await transaction.rollback()
-        raise e 
\ No newline at end of file
+        raise e
+    finally:
+        session.info.pop("transaction", None)
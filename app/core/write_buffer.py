@@ -0,0 +1,161 @@
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+from contextlib import AbstractAsyncContextManager
+from sqlalchemy.sql import Executable
+import asyncio
+import logging
+import time
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.core.metrics import coalesced_writes_total, coalesced_flushes_total
+
+logger = logging.getLogger(__name__)
+
+StatementBuilder = Callable[[List[Dict[str, Any]]], Executable]
+FlushHook = Callable[[List[Any]], None]
+Pending = Tuple[Dict[str, Any], asyncio.Future]
+
+class WriteCoalescer:
+    """Queues low-criticality writes in process and commits them in groups.
+
+    Each kind of write registers a builder that turns a list of queued rows
+    into one multi-row statement. A kind is flushed ``delay_ms`` after its
+    first queued row or as soon as it holds ``max_batch`` rows, in a
+    transaction of its own, so many small writes share one commit.
+
+    ``submit`` returns a future that resolves to the flushed row count once
+    the group is committed (or raises if it failed); callers that need
+    durability await it, others drop it. A kind may also register an
+    ``on_flushed`` hook that receives the statement's returned rows after
+    the commit, e.g. to adjust caches by what actually changed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractAsyncContextManager] = get_db_context,
+        delay_ms: int = settings.WRITE_COALESCE_DELAY_MS,
+        max_batch: int = settings.WRITE_COALESCE_MAX_BATCH
+    ):
+        self.session_factory = session_factory
+        self.delay = delay_ms / 1000
+        self.max_batch = max_batch
+        self._builders: Dict[str, StatementBuilder] = {}
+        self._hooks: Dict[str, FlushHook] = {}
+        self._pending: Dict[str, List[Pending]] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.flushed = 0
+
+    def register(self, kind: str, build: StatementBuilder, on_flushed: Optional[FlushHook] = None) -> None:
+        """Register the statement builder, and optionally a post-commit hook, for a kind of write."""
+        self._builders[kind] = build
+        if on_flushed:
+            self._hooks[kind] = on_flushed
+
+    def submit(self, kind: str, row: Dict[str, Any]) -> asyncio.Future:
+        """Queue one row; the returned future resolves when it is committed."""
+        if kind not in self._builders:
+            raise ValueError(f"Unknown write kind: {kind}")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Fire-and-forget callers never look at the outcome; failures are logged in _flush
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        queue = self._pending.setdefault(kind, [])
+        if not queue:
+            self._deadlines[kind] = time.monotonic() + self.delay
+        queue.append((row, future))
+        self.submitted += 1
+        coalesced_writes_total.labels(kind=kind).inc()
+
+        if len(queue) >= self.max_batch:
+            task = loop.create_task(self._flush(kind, self._take(kind)))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        if self._pending:
+            self._ensure_runner()
+        return future
+
+    async def flush(self) -> int:
+        """Commit every queued kind immediately; returns the number of statements run."""
+        batches = [(kind, self._take(kind)) for kind in list(self._pending)]
+        for kind, batch in batches:
+            await self._flush(kind, batch)
+        return len(batches)
+
+    async def flush_due(self) -> int:
+        """Commit the kinds whose delay has expired; returns the number of statements run."""
+        now = time.monotonic()
+        due = [kind for kind, deadline in self._deadlines.items() if deadline <= now]
+        batches = [(kind, self._take(kind)) for kind in due]
+        for kind, batch in batches:
+            await self._flush(kind, batch)
+        return len(batches)
+
+    async def close(self) -> None:
+        """Stop the background flusher and commit whatever is still queued."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        await self.flush()
+
+    @property
+    def ratio(self) -> float:
+        """Submitted rows per committed statement."""
+        return self.submitted / self.flushed if self.flushed else 0.0
+
+    def _take(self, kind: str) -> List[Pending]:
+        self._deadlines.pop(kind, None)
+        return self._pending.pop(kind, [])
+
+    async def _flush(self, kind: str, batch: List[Pending]) -> None:
+        if not batch:
+            return
+        rows = [row for row, _ in batch]
+        hook = self._hooks.get(kind)
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(self._builders[kind](rows))
+                returned = result.all() if hook else None
+        except Exception as e:
+            logger.error(f"Error flushing {len(rows)} coalesced {kind} writes: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.flushed += 1
+        coalesced_flushes_total.labels(kind=kind).inc()
+        if hook:
+            try:
+                hook(returned)
+            except Exception as e:
+                logger.error(f"Error in flush hook for coalesced {kind} writes: {str(e)}")
+        for _, future in batch:
+            if not future.done():
+                future.set_result(len(rows))
+
+    def _ensure_runner(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_wait())
+            await self.flush_due()
+            if not self._pending:
+                return
+
+    def _next_wait(self) -> float:
+        if not self._deadlines:
+            return self.delay
+        return max(min(self._deadlines.values()) - time.monotonic(), 0.0)
+
+# Create a singleton instance
+write_coalescer = WriteCoalescer()
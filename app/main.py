@@ -16,6 +16,8 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.database import engine, get_db, init_db
 from app.services.background_service import BackgroundService
+from app.services.notification_digest import notification_coalescer
+from app.core.write_buffer import write_coalescer
 from app.api.api import api_router
 from sqlalchemy import text
 from app.core.rate_limit import RateLimitMiddleware
@@ -199,7 +201,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down application...")
-    # Cleanup tasks here
+    # Deliver any notification digests still buffered in this process
+    await notification_coalescer.close()
+    # Commit read receipts and sync acknowledgements still queued
+    await write_coalescer.close()
 
 @app.get("/")
 async def root():
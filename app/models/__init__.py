@@ -7,10 +7,14 @@ Each model inherits from the Base class which provides common fields and functio
 from .user import User
 from .event import Event, EventParticipant
 from .version import Version
-from .notification import Notification
+from .notification import Notification, NotificationFeedItem, NotificationWatermark
 from .event_share import EventShare
 from .changelog import Changelog
 from .sync_state import SyncState
+from .reminder import ReminderLedger
+from .archive import ArchiveSegment
+from .analytics import EventFact, EventRollupHourly, EventRollupDaily
+from .event_access import EventAccess
 
 __all__ = [
     "User",
@@ -18,7 +22,15 @@ __all__ = [
     "EventParticipant",
     "Version",
     "Notification",
+    "NotificationFeedItem",
+    "NotificationWatermark",
     "EventShare",
     "Changelog",
-    "SyncState"
+    "SyncState",
+    "ReminderLedger",
+    "ArchiveSegment",
+    "EventFact",
+    "EventRollupHourly",
+    "EventRollupDaily",
+    "EventAccess"
 ]
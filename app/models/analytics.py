@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy import Column, String, DateTime, Integer, Boolean, BigInteger, UniqueConstraint, Index
+from app.core.models import BaseModel
+
+class EventFact(BaseModel):
+    """Last state of an event that was folded into the rollups.
+
+    Kept so a change can be applied as ``new - old`` without rescanning.
+    Not a foreign key: the fact outlives a deleted event until its
+    contribution has been subtracted.
+    """
+    __tablename__ = "event_facts"
+
+    # Base fields: id, created_at, updated_at, is_active
+    event_id = Column(String, nullable=False, unique=True)
+    created_by = Column(String, nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    duration_seconds = Column(Integer, nullable=False, default=0)
+    participant_count = Column(Integer, nullable=False, default=0)
+    max_participants = Column(Integer, nullable=True)
+    is_cancelled = Column(Boolean, nullable=False, default=False)
+
+class EventRollup(BaseModel):
+    """Pre-aggregated event measures per time bucket and creator."""
+    __abstract__ = True
+
+    # Base fields: id, created_at, updated_at, is_active
+    bucket = Column(DateTime, nullable=False)
+    created_by = Column(String, nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    participant_count = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(BigInteger, nullable=False, default=0)
+    capacity = Column(Integer, nullable=False, default=0)  # sum of max_participants
+    capped_participants = Column(Integer, nullable=False, default=0)  # participants of events with a capacity
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bucket": self.bucket.isoformat(),
+            "created_by": self.created_by,
+            "event_count": self.event_count,
+            "cancelled_count": self.cancelled_count,
+            "participant_count": self.participant_count,
+            "duration_seconds": self.duration_seconds,
+            "fill_rate": self.capped_participants / self.capacity if self.capacity else None
+        }
+
+class EventRollupHourly(EventRollup):
+    __tablename__ = "event_rollups_hourly"
+    __table_args__ = (
+        UniqueConstraint('bucket', 'created_by', name='uix_event_rollups_hourly'),
+        Index('ix_event_rollups_hourly_creator', 'created_by', 'bucket'),
+    )
+
+class EventRollupDaily(EventRollup):
+    __tablename__ = "event_rollups_daily"
+    __table_args__ = (
+        UniqueConstraint('bucket', 'created_by', name='uix_event_rollups_daily'),
+        Index('ix_event_rollups_daily_creator', 'created_by', 'bucket'),
+    )
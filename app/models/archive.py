@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy import Column, String, DateTime, JSON, Index
+from app.core.models import BaseModel
+
+class ArchiveSegment(BaseModel):
+    """Manifest entry for a compressed JSONL segment holding cold history rows."""
+    __tablename__ = "archive_segments"
+
+    # Base fields: id, created_at, updated_at, is_active
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    path = Column(String, nullable=False)  # relative to ARCHIVE_DIR
+    checksum = Column(String, nullable=False)  # sha256 of the segment file
+    row_counts = Column(JSON, nullable=False)  # rows per source table
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_archive_segments_entity', 'entity_type', 'entity_id'),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "path": self.path,
+            "checksum": self.checksum,
+            "row_counts": self.row_counts,
+            "archived_at": self.archived_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, BigInteger, Sequence, event, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.models import BaseModel
+from app.core.partitioning import create_initial_partitions, partition_by
 from enum import Enum
 
 class AuditAction(str, Enum):
@@ -15,17 +16,35 @@ class AuditAction(str, Enum):
     LEAVE = "leave"
     STATUS_CHANGE = "status_change"
 
+# Insert order of journal rows. nextval() runs at INSERT, not at commit, so a
+# lower number can become visible after a higher one; readers stay
+# SYNC_JOURNAL_LAG_SECONDS behind created_at to let such rows land.
+AUDIT_LOG_SEQUENCE = Sequence("audit_logs_sequence_seq")
+
 class AuditLog(BaseModel):
     __tablename__ = "audit_logs"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = {
+        'extend_existing': True,
+        'postgresql_partition_by': partition_by("audit_logs")
+    }
 
     # Base fields: id, created_at, updated_at, is_active
+    # Database clock at INSERT, when the sequence number is drawn
+    created_at = Column(DateTime, default=func.timezone("utc", func.clock_timestamp()), nullable=False)
     user_id = Column(String, ForeignKey("user.id"), nullable=False)
     action = Column(String, nullable=False)
     entity_type = Column(String, nullable=False)
     entity_id = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # Partition key, so it is part of the primary key
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True, index=True)
     details = Column(JSON, nullable=True)
+    sequence = Column(
+        BigInteger,
+        AUDIT_LOG_SEQUENCE,
+        server_default=AUDIT_LOG_SEQUENCE.next_value(),
+        nullable=False,
+        index=True
+    )
 
     user = relationship("User", back_populates="audit_logs")
 
@@ -39,6 +58,9 @@ class AuditLog(BaseModel):
             "entity_id": self.entity_id,
             "timestamp": self.timestamp.isoformat(),
             "details": self.details,
+            "sequence": self.sequence,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        } 
+
+event.listen(AuditLog.__table__, "after_create", create_initial_partitions)
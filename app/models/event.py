@@ -2,9 +2,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional, List, TYPE_CHECKING, Dict, Any
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Boolean, Enum as SQLEnum, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Boolean, Enum as SQLEnum, Index, text, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from app.core.models import BaseModel, UserRole
+from app.core.search import create_search_trigger, create_trigram_extension, create_facet_view, drop_facet_view
 from app.models.event_version import EventVersion
 
 if TYPE_CHECKING:
@@ -56,6 +58,7 @@ class Event(BaseModel):
     recurrence_exceptions = Column(JSON, nullable=True)
     current_version = Column(Integer, default=1)
     created_by = Column(String, ForeignKey("user.id"), nullable=False)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))  # maintained by trigger
     creator = relationship("User", back_populates="created_events", foreign_keys=[created_by])
     participants = relationship(
         "User",
@@ -74,6 +77,20 @@ class Event(BaseModel):
         Index('ix_events_date_range', 'start_time', 'end_time'),
         Index('ix_events_status_date', 'status', 'start_time'),
         Index('ix_events_creator_status', 'created_by', 'status'),
+        Index('ix_events_creator_time', 'created_by', 'start_time', 'end_time'),
+        Index(
+            'ix_events_archivable',
+            'end_time',
+            'id',
+            postgresql_where=text("is_active AND status = 'completed'")
+        ),
+        Index('ix_events_search_vector', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_events_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'}
+        ),
     )
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -177,3 +194,8 @@ class EventParticipant(BaseModel):
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
+
+event.listen(Event.__table__, "before_create", create_trigram_extension)
+event.listen(Event.__table__, "after_create", create_search_trigger)
+event.listen(Event.__table__, "after_create", create_facet_view)
+event.listen(Event.__table__, "before_drop", drop_facet_view)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Index
+from app.core.models import BaseModel
+
+# Permission recorded for an event's creator; shares use SharePermission values
+OWNER_PERMISSION = "owner"
+
+class EventAccess(BaseModel):
+    """Materialised row for each event a user owns or has been shared.
+
+    Denormalises ``start_time`` so a user's calendar for a date range is a
+    single range scan of ``ix_event_access_user_start``. Rows are written
+    alongside events and shares and can be rebuilt from them at any time.
+    """
+    __tablename__ = "event_access"
+    __table_args__ = (
+        UniqueConstraint('user_id', 'event_id', name='uix_event_access'),
+        Index('ix_event_access_user_start', 'user_id', 'start_time'),
+        Index('ix_event_access_event', 'event_id'),
+    )
+
+    # Base fields: id, created_at, updated_at, is_active
+    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(String, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    permission = Column(String, nullable=False)  # "owner" or a SharePermission value
+    start_time = Column(DateTime, nullable=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "event_id": self.event_id,
+            "permission": self.permission,
+            "start_time": self.start_time.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
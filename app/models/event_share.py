@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Dict, Any, Optional
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum as SQLEnum, Index, text
 from sqlalchemy.orm import relationship
 from app.core.models import Base, SharePermission
 from uuid import uuid4
@@ -29,14 +29,15 @@ class EventShare(Base):
     shared_by = relationship("User", foreign_keys=[shared_by_id], back_populates="shared_events")
     shared_with = relationship("User", foreign_keys=[shared_with_id], back_populates="received_shares")
 
+    __table_args__ = (
+        Index('ix_event_share_recipient', 'shared_with_id', 'event_id'),
+        Index('ix_event_share_expiring', 'expires_at', postgresql_where=text('expires_at IS NOT NULL')),
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.id:
             self.id = str(uuid4())
-        if not self.created_at:
-            self.created_at = datetime.utcnow()
-        if not self.updated_at:
-            self.updated_at = datetime.utcnow()
         self.expires_at = kwargs.get('expires_at')
 
     def to_dict(self) -> Dict[str, Any]:
@@ -48,8 +49,8 @@ class EventShare(Base):
             "shared_with_id": self.shared_with_id,
             "permission": self.permission.value if self.permission else None,
             "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": None,  # not tracked for shares
+            "updated_at": None
         }
     
     def has_permission(self, required_permission: SharePermission) -> bool:
@@ -3,10 +3,11 @@ from enum import Enum
 from typing import Optional, Dict, Any
 from uuid import UUID
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Boolean, Enum as SQLEnum, Index
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Boolean, Enum as SQLEnum, Index, event
 from sqlalchemy.orm import relationship
 
 from app.core.models import BaseModel
+from app.core.partitioning import create_initial_partitions, partition_by
 
 class NotificationType(str, Enum):
     """Types of notifications that can be sent."""
@@ -30,6 +31,9 @@ class Notification(BaseModel):
     # Base fields are inherited from BaseModel:
     # id, created_at, updated_at, is_active
 
+    # Partition key, so it is part of the primary key
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
+
     # Foreign keys
     user_id = Column(String, ForeignKey("user.id"), nullable=False, index=True)
     
@@ -46,6 +50,8 @@ class Notification(BaseModel):
     __table_args__ = (
         Index('ix_notifications_user_status', 'user_id', 'status'),
         Index('ix_notifications_user_read_at', 'user_id', 'read_at'),
+        Index('ix_notifications_user_created', 'user_id', 'created_at', 'id'),
+        {'postgresql_partition_by': partition_by("notifications")}
     )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -61,6 +67,59 @@ class Notification(BaseModel):
             "updated_at": self.updated_at.isoformat()
         }
 
+event.listen(Notification.__table__, "after_create", create_initial_partitions)
+
+class NotificationFeedItem(BaseModel):
+    """Broadcast notification shared by every user (fan-out on read)."""
+    __tablename__ = "notification_feed"
+
+    # Base fields are inherited from BaseModel:
+    # id, created_at, updated_at, is_active
+
+    # User whose action produced the broadcast; excluded from their own timeline
+    actor_id = Column(String, ForeignKey("user.id"), nullable=True)
+
+    notification_type = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+    data = Column(JSON)
+
+    __table_args__ = (
+        Index('ix_notification_feed_created', 'created_at', 'id'),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert feed item to dictionary representation."""
+        return {
+            "id": self.id,
+            "actor_id": self.actor_id,
+            "notification_type": self.notification_type,
+            "message": self.message,
+            "data": self.data,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
+class NotificationWatermark(BaseModel):
+    """Per-user read position in the broadcast feed."""
+    __tablename__ = "notification_watermarks"
+
+    # Base fields are inherited from BaseModel:
+    # id, created_at, updated_at, is_active
+
+    user_id = Column(String, ForeignKey("user.id"), nullable=False, unique=True, index=True)
+    # Feed items created at or before this instant count as read
+    feed_read_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert watermark to dictionary representation."""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "feed_read_at": self.feed_read_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
 class SharePermission(str, Enum):
     VIEW = "view"
     EDIT = "edit"
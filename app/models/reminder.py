@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Dict, Any
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
+from app.core.models import BaseModel
+
+class ReminderLedger(BaseModel):
+    """Claim of a reminder for one participant of an event; dropped again if delivery fails."""
+    __tablename__ = "reminder_ledger"
+    __table_args__ = (
+        UniqueConstraint('event_id', 'user_id', 'reminder_kind', name='uix_reminder_ledger'),
+    )
+
+    # Base fields: id, created_at, updated_at, is_active
+    event_id = Column(String, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    reminder_kind = Column(String, nullable=False)  # e.g. "starting_soon", "days_before_3"
+    sent_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "user_id": self.user_id,
+            "reminder_kind": self.reminder_kind,
+            "sent_at": self.sent_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, BigInteger
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.models import BaseModel
@@ -13,6 +13,7 @@ class SyncState(BaseModel):
     entity_type = Column(String, nullable=False, index=True)
     last_sync_version = Column(Integer, nullable=False, default=0)
     last_sync_timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_sync_sequence = Column(BigInteger, nullable=False, default=0)  # last audit_logs.sequence delivered
     sync_token = Column(String, nullable=True, index=True)
     sync_metadata = Column(JSON, nullable=True)
 
@@ -27,6 +28,7 @@ class SyncState(BaseModel):
             "entity_type": self.entity_type,
             "last_sync_version": self.last_sync_version,
             "last_sync_timestamp": self.last_sync_timestamp.isoformat(),
+            "last_sync_sequence": self.last_sync_sequence,
             "sync_token": self.sync_token,
             "metadata": self.sync_metadata,
             "is_active": self.is_active,
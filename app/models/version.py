@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Dict, Any, Optional
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Index, event
 from sqlalchemy.orm import relationship
 from app.core.models import BaseModel
+from app.core.partitioning import create_initial_partitions, partition_by
 from uuid import uuid4
 
 class Version(BaseModel):
@@ -12,6 +13,9 @@ class Version(BaseModel):
     # Base fields are inherited from BaseModel:
     # id, created_at, updated_at, is_active
 
+    # Partition key, so it is part of the primary key
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
+
     # Foreign keys
     created_by = Column(String, ForeignKey("user.id"), nullable=False)
     
@@ -26,6 +30,11 @@ class Version(BaseModel):
     # Relationships
     creator = relationship("User", back_populates="created_versions")
 
+    __table_args__ = (
+        Index('ix_versions_entity', 'entity_type', 'entity_id', 'version_number'),
+        {'postgresql_partition_by': partition_by("versions")}
+    )
+
     def get_diff(self) -> Dict[str, Any]:
         """Calculate differences between previous and current states."""
         if not self.previous_state or not self.current_state:
@@ -57,4 +66,6 @@ class Version(BaseModel):
             "created_by": self.created_by,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        } 
+
+event.listen(Version.__table__, "after_create", create_initial_partitions)
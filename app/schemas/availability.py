@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class TimeBlock(BaseModel):
+    """Schema for a half-open ``[start, end)`` block of time."""
+    start: datetime
+    end: datetime
+
+class UserFreeBusy(BaseModel):
+    """Schema for one user's merged busy blocks and free gaps."""
+    busy: List[TimeBlock]
+    free: List[TimeBlock]
+
+class FreeBusyResponse(BaseModel):
+    """Schema for free/busy of several users over a window."""
+    start: datetime
+    end: datetime
+    users: Dict[str, UserFreeBusy]
+
+class CommonSlotResponse(BaseModel):
+    """Schema for the first slot in which all requested users are free."""
+    slot: Optional[TimeBlock] = None
+
+class SlotSearch(BaseModel):
+    """Schema for a meeting-slot search over attendees' calendars."""
+    attendee_ids: List[str] = Field(..., min_length=1)
+    duration_minutes: int = Field(..., ge=1)
+    start: datetime
+    end: datetime
+    working_hours_start: int = Field(9, ge=0, le=23)
+    working_hours_end: int = Field(17, ge=1, le=24)
+    weekdays: List[int] = Field(default_factory=lambda: [0, 1, 2, 3, 4])  # Monday is 0
+    step_minutes: int = Field(30, ge=1)
+    limit: int = Field(5, ge=1, le=50)
+
+class SlotSuggestions(BaseModel):
+    """Schema for the earliest candidate slots found."""
+    slots: List[TimeBlock]
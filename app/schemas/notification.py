@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.notification import NotificationStatus
+
+class NotificationInDB(BaseModel):
+    """Schema for a private notification as stored in the database."""
+    id: str
+    user_id: str
+    message: str
+    data: Optional[Dict[str, Any]] = None
+    status: NotificationStatus
+    read_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TimelineEntry(BaseModel):
+    """Schema for an entry in the merged notification timeline."""
+    id: str
+    message: str
+    data: Optional[Dict[str, Any]] = None
+    status: NotificationStatus
+    notification_type: Optional[str] = None
+    source: str  # 'private' or 'broadcast'
+    created_at: datetime
+
+class TimelinePage(BaseModel):
+    """Schema for a keyset-paginated page of the notification timeline."""
+    items: List[TimelineEntry]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.event import EventStatus
+
+class EventSearchHit(BaseModel):
+    """Schema for an event in search results."""
+    id: str
+    title: str
+    description: Optional[str] = None
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str] = None
+    status: EventStatus
+    is_private: bool
+    created_by: str
+    rank: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class FacetValue(BaseModel):
+    """Schema for the number of results with one facet value."""
+    value: str
+    count: int
+
+class EventFacetPage(BaseModel):
+    """Schema for a search result page with facet counts for the same filters."""
+    items: List[EventSearchHit]
+    next_cursor: Optional[str] = None
+    facets: Dict[str, List[FacetValue]]
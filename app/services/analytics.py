@@ -0,0 +1,284 @@
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Type
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import redis
+from app.core.cache import redis_client
+from app.models.analytics import EventFact, EventRollup, EventRollupHourly, EventRollupDaily
+from app.models.event import Event, EventParticipant, EventStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+MEASURES = (
+    "event_count",
+    "cancelled_count",
+    "participant_count",
+    "duration_seconds",
+    "capacity",
+    "capped_participants",
+)
+
+ROLLUP_MODELS: Dict[str, Type[EventRollup]] = {
+    "hourly": EventRollupHourly,
+    "daily": EventRollupDaily,
+}
+
+RollupKey = Tuple[str, datetime, str]  # (granularity, bucket, created_by)
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    if granularity == "hourly":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def fact_measures(fact: Dict[str, Any]) -> Dict[str, int]:
+    """Measures one event contributes to its buckets."""
+    capped = fact["max_participants"] is not None
+    return {
+        "event_count": 1,
+        "cancelled_count": 1 if fact["is_cancelled"] else 0,
+        "participant_count": fact["participant_count"],
+        "duration_seconds": fact["duration_seconds"],
+        "capacity": fact["max_participants"] or 0,
+        "capped_participants": fact["participant_count"] if capped else 0,
+    }
+
+def rollup_deltas(
+    changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+) -> Dict[RollupKey, Dict[str, int]]:
+    """Fold ``(old fact, new fact)`` pairs into per-bucket measure deltas."""
+    deltas: Dict[RollupKey, Dict[str, int]] = {}
+    for old, new in changes:
+        for fact, sign in ((old, -1), (new, 1)):
+            if not fact:
+                continue
+            measures = fact_measures(fact)
+            for granularity in ROLLUP_MODELS:
+                key = (granularity, bucket_start(fact["start_time"], granularity), fact["created_by"])
+                delta = deltas.setdefault(key, dict.fromkeys(MEASURES, 0))
+                for name, value in measures.items():
+                    delta[name] += sign * value
+    return {key: delta for key, delta in deltas.items() if any(delta.values())}
+
+class AnalyticsChangeQueue:
+    """Set of event ids whose analytics need to be refolded.
+
+    Writers mark events as they change and the consumer task pops them in
+    batches, so repeated changes to one event between runs cost one refold.
+
+    Popped ids are moved to a processing set and only dropped by ``ack``
+    once their refold has committed. Ids left there by a consumer that died
+    are put back by ``recover``; refolding is idempotent, so an id that is
+    folded twice does no harm.
+    """
+    key = "analytics:dirty_events"
+    processing_key = "analytics:processing_events"
+
+    def __init__(self, client: redis.Redis = redis_client):
+        self.client = client
+
+    def mark(self, *event_ids: str) -> None:
+        if event_ids:
+            self.client.sadd(self.key, *event_ids)
+
+    def pop(self, limit: int) -> List[str]:
+        """Move up to ``limit`` ids to the processing set and return them."""
+        candidates = self.client.srandmember(self.key, limit) or []
+        if not candidates:
+            return []
+        pipe = self.client.pipeline()
+        for event_id in candidates:
+            pipe.smove(self.key, self.processing_key, event_id)
+        # SMOVE is atomic per id, so concurrent consumers never share one
+        return [event_id for event_id, moved in zip(candidates, pipe.execute()) if moved]
+
+    def ack(self, event_ids: List[str]) -> None:
+        """Forget ids whose refold has committed."""
+        if event_ids:
+            self.client.srem(self.processing_key, *event_ids)
+
+    def release(self, event_ids: List[str]) -> None:
+        """Return ids whose refold failed to the dirty set."""
+        if not event_ids:
+            return
+        pipe = self.client.pipeline()
+        pipe.srem(self.processing_key, *event_ids)
+        pipe.sadd(self.key, *event_ids)
+        pipe.execute()
+
+    def recover(self) -> int:
+        """Put ids stranded in the processing set back; returns how many there were."""
+        pipe = self.client.pipeline()
+        pipe.scard(self.processing_key)
+        pipe.sunionstore(self.key, [self.key, self.processing_key])
+        pipe.delete(self.processing_key)
+        return pipe.execute()[0]
+
+    def pending(self) -> int:
+        return self.client.scard(self.key)
+
+class AnalyticsService:
+    """Maintains event rollups incrementally and serves reports from them."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_changes(self, event_ids: List[str]) -> int:
+        """Refold changed events into the rollups; returns the buckets touched."""
+        if not event_ids:
+            return 0
+        # Serialise concurrent refolds of the same event for this transaction
+        await self.session.execute(
+            text(
+                "SELECT pg_advisory_xact_lock(hashtext(event_id)) "
+                "FROM unnest(CAST(:event_ids AS text[])) AS event_id ORDER BY event_id"
+            ),
+            {"event_ids": list(event_ids)}
+        )
+        result = await self.session.execute(select(EventFact).where(EventFact.event_id.in_(event_ids)))
+        old_facts = {fact.event_id: self._fact_values(fact) for fact in result.scalars().all()}
+        new_facts = await self._load_facts(event_ids)
+
+        deltas = rollup_deltas((old_facts.get(event_id), new_facts.get(event_id)) for event_id in event_ids)
+        await self._apply_deltas(deltas)
+        await self._store_facts(event_ids, new_facts)
+        return len(deltas)
+
+    async def get_rollups(
+        self,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        created_by: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Measures per bucket in ``[start, end)``, optionally for one creator."""
+        model = ROLLUP_MODELS[granularity]
+        stmt = (
+            select(model.bucket, *[func.sum(getattr(model, name)).label(name) for name in MEASURES])
+            .where(model.bucket >= start, model.bucket < end)
+            .group_by(model.bucket)
+            .order_by(model.bucket)
+        )
+        if created_by:
+            stmt = stmt.where(model.created_by == created_by)
+        result = await self.session.execute(stmt)
+        return [self._report_row(row._mapping) for row in result.all()]
+
+    async def get_summary(self, start: datetime, end: datetime, top_creators: int = 5) -> Dict[str, Any]:
+        """Totals, daily series and most active creators for a period."""
+        model = EventRollupDaily
+        result = await self.session.execute(
+            select(*[func.coalesce(func.sum(getattr(model, name)), 0).label(name) for name in MEASURES])
+            .where(model.bucket >= start, model.bucket < end)
+        )
+        totals = self._report_row(result.one()._mapping)
+
+        result = await self.session.execute(
+            select(model.created_by, func.sum(model.event_count).label("event_count"))
+            .where(model.bucket >= start, model.bucket < end)
+            .group_by(model.created_by)
+            .order_by(func.sum(model.event_count).desc())
+            .limit(top_creators)
+        )
+        return {
+            "period": f"{start.date()} to {end.date()}",
+            "totals": totals,
+            "days": await self.get_rollups("daily", start, end),
+            "top_creators": [
+                {"created_by": created_by, "event_count": event_count}
+                for created_by, event_count in result.all()
+            ]
+        }
+
+    async def _load_facts(self, event_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        participants = (
+            select(EventParticipant.event_id, func.count().label("participant_count"))
+            .where(EventParticipant.event_id.in_(event_ids))
+            .group_by(EventParticipant.event_id)
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(
+                Event.id,
+                Event.created_by,
+                Event.start_time,
+                Event.end_time,
+                Event.max_participants,
+                Event.status,
+                func.coalesce(participants.c.participant_count, 0)
+            )
+            .outerjoin(participants, participants.c.event_id == Event.id)
+            .where(Event.id.in_(event_ids), Event.is_active == True)
+        )
+        return {
+            event_id: {
+                "event_id": event_id,
+                "created_by": created_by,
+                "start_time": start_time,
+                "duration_seconds": int((end_time - start_time).total_seconds()),
+                "participant_count": participant_count,
+                "max_participants": max_participants,
+                "is_cancelled": status == EventStatus.CANCELLED,
+            }
+            for event_id, created_by, start_time, end_time, max_participants, status, participant_count in result.all()
+        }
+
+    async def _apply_deltas(self, deltas: Dict[RollupKey, Dict[str, int]]) -> None:
+        now = datetime.utcnow()
+        for granularity, model in ROLLUP_MODELS.items():
+            rows = [
+                {"bucket": bucket, "created_by": created_by, **delta}
+                for (key_granularity, bucket, created_by), delta in deltas.items()
+                if key_granularity == granularity
+            ]
+            if not rows:
+                continue
+            stmt = pg_insert(model).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint=f"uix_{model.__tablename__}",
+                set_={
+                    **{name: getattr(model, name) + stmt.excluded[name] for name in MEASURES},
+                    "updated_at": now
+                }
+            )
+            await self.session.execute(stmt)
+
+    async def _store_facts(self, event_ids: List[str], facts: Dict[str, Dict[str, Any]]) -> None:
+        gone = [event_id for event_id in event_ids if event_id not in facts]
+        if gone:
+            await self.session.execute(delete(EventFact).where(EventFact.event_id.in_(gone)))
+        if facts:
+            stmt = pg_insert(EventFact).values(list(facts.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EventFact.event_id],
+                set_={
+                    name: stmt.excluded[name]
+                    for name in ("created_by", "start_time", "duration_seconds",
+                                 "participant_count", "max_participants", "is_cancelled")
+                }
+            )
+            await self.session.execute(stmt)
+
+    @staticmethod
+    def _fact_values(fact: EventFact) -> Dict[str, Any]:
+        return {
+            "event_id": fact.event_id,
+            "created_by": fact.created_by,
+            "start_time": fact.start_time,
+            "duration_seconds": fact.duration_seconds,
+            "participant_count": fact.participant_count,
+            "max_participants": fact.max_participants,
+            "is_cancelled": fact.is_cancelled,
+        }
+
+    @staticmethod
+    def _report_row(row) -> Dict[str, Any]:
+        report = {name: int(row[name] or 0) for name in MEASURES}
+        if "bucket" in row:
+            report["bucket"] = row["bucket"].isoformat()
+        report["fill_rate"] = report["capped_participants"] / report["capacity"] if report["capacity"] else None
+        return report
+
+# Create a singleton instance
+analytics_changes = AnalyticsChangeQueue()
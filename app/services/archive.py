@@ -0,0 +1,197 @@
+from typing import List, Dict, Any, Optional, Tuple, Type
+from datetime import datetime
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, exists, or_, event, DateTime
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.models import BaseModel
+from app.models.archive import ArchiveSegment
+from app.models.audit_log import AuditLog
+from app.models.event import Event
+from app.models.event_version import EventVersion
+from app.models.version import Version
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding segment files written in the open transaction
+PENDING_SEGMENTS = "archive_segments_written"
+
+# History tables moved to cold storage, keyed by table name
+ARCHIVED_MODELS: Dict[str, Type[BaseModel]] = {
+    Version.__tablename__: Version,
+    EventVersion.__tablename__: EventVersion,
+    AuditLog.__tablename__: AuditLog,
+}
+
+def serialize_row(obj: BaseModel) -> Dict[str, Any]:
+    """Dump every column of a model instance to JSON-compatible values."""
+    row = {}
+    for column in obj.__table__.columns:
+        value = getattr(obj, column.key)
+        row[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+def deserialize_row(model: Type[BaseModel], row: Dict[str, Any]) -> BaseModel:
+    """Build a detached, read-only model instance from an archived row."""
+    values = {}
+    for column in model.__table__.columns:
+        value = row.get(column.key)
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    return model(**values)
+
+def write_segment(path: str, rows: List[Tuple[str, Dict[str, Any]]]) -> str:
+    """Write ``(table, row)`` pairs as a gzip JSONL segment; returns its sha256."""
+    data = gzip.compress("".join(
+        json.dumps({"table": table, "row": row}, default=str) + "\n"
+        for table, row in rows
+    ).encode("utf-8"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return hashlib.sha256(data).hexdigest()
+
+@lru_cache(maxsize=64)
+def read_segment(path: str, checksum: str) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+    """Read and verify a segment. Segments are immutable, so reads are cached."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != checksum:
+        raise ValueError(f"Archive segment {path} is corrupt")
+    lines = gzip.decompress(data).decode("utf-8").splitlines()
+    return tuple((item["table"], item["row"]) for item in map(json.loads, lines))
+
+class ArchiveService:
+    """Moves cold event history into compressed segments and reads it back.
+
+    History rows of events that were deactivated and ended before the
+    retention threshold are written to one gzip JSONL segment per event,
+    recorded in ``archive_segments`` and deleted from the hot tables. Readers
+    call ``load_rows`` to get archived rows as detached model instances.
+
+    A segment file is written before its manifest row is committed; if the
+    transaction rolls back instead, the file is removed again.
+    """
+
+    def __init__(self, session: AsyncSession, archive_dir: str = settings.ARCHIVE_DIR):
+        self.session = session
+        self.archive_dir = archive_dir
+
+    def _history_criteria(self, event_id) -> Dict[str, Any]:
+        return {
+            Version.__tablename__: (Version.entity_type == "event") & (Version.entity_id == event_id),
+            EventVersion.__tablename__: EventVersion.event_id == event_id,
+            AuditLog.__tablename__: (AuditLog.entity_type == "event") & (AuditLog.entity_id == event_id),
+        }
+
+    async def archive_event(self, event_id: str) -> Optional[ArchiveSegment]:
+        """Move the history of one event to a new segment; runs in the caller's transaction."""
+        rows: List[Tuple[str, Dict[str, Any]]] = []
+        ids: Dict[str, List[str]] = {}
+        for table, criteria in self._history_criteria(event_id).items():
+            model = ARCHIVED_MODELS[table]
+            result = await self.session.execute(select(model).where(criteria))
+            objects = result.scalars().all()
+            ids[table] = [obj.id for obj in objects]
+            rows.extend((table, serialize_row(obj)) for obj in objects)
+        if not rows:
+            return None
+
+        archived_at = datetime.utcnow()
+        relative_path = os.path.join(
+            "event",
+            event_id[:2],
+            f"{event_id}-{archived_at.strftime('%Y%m%d%H%M%S%f')}.jsonl.gz"
+        )
+        full_path = os.path.join(self.archive_dir, relative_path)
+        checksum = write_segment(full_path, rows)
+        self.session.info.setdefault(PENDING_SEGMENTS, []).append(full_path)
+
+        segment = ArchiveSegment(
+            entity_type="event",
+            entity_id=event_id,
+            path=relative_path,
+            checksum=checksum,
+            row_counts={table: len(table_ids) for table, table_ids in ids.items()},
+            archived_at=archived_at
+        )
+        self.session.add(segment)
+        for table, table_ids in ids.items():
+            if table_ids:
+                model = ARCHIVED_MODELS[table]
+                await self.session.execute(
+                    delete(model)
+                    .where(model.id.in_(table_ids))
+                    .execution_options(synchronize_session=False)
+                )
+        await self.session.flush()
+        return segment
+
+    async def archive_cold_events(self, cutoff: datetime, limit: int = settings.ARCHIVE_BATCH_SIZE) -> int:
+        """Archive the history of up to ``limit`` cold events; returns how many were archived.
+
+        Event rows are locked with ``SKIP LOCKED`` so parallel workers pick
+        disjoint events.
+        """
+        has_history = or_(*[
+            exists().where(criteria)
+            for criteria in self._history_criteria(Event.id).values()
+        ])
+        result = await self.session.execute(
+            select(Event.id)
+            .where(
+                Event.is_active == False,
+                Event.end_time < cutoff,
+                has_history
+            )
+            .order_by(Event.end_time, Event.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        archived = 0
+        for event_id in result.scalars().all():
+            if await self.archive_event(event_id):
+                archived += 1
+        return archived
+
+    async def load_rows(self, entity_type: str, entity_id: str, model: Type[BaseModel]) -> List[BaseModel]:
+        """Return archived rows of ``model`` for an entity as detached instances."""
+        result = await self.session.execute(
+            select(ArchiveSegment.path, ArchiveSegment.checksum)
+            .where(
+                ArchiveSegment.entity_type == entity_type,
+                ArchiveSegment.entity_id == entity_id
+            )
+            .order_by(ArchiveSegment.archived_at)
+        )
+        rows = []
+        for path, checksum in result.all():
+            for table, row in read_segment(os.path.join(self.archive_dir, path), checksum):
+                if table == model.__tablename__:
+                    rows.append(deserialize_row(model, row))
+        return rows
+
+@event.listens_for(Session, "after_commit")
+def keep_written_segments(session: Session) -> None:
+    session.info.pop(PENDING_SEGMENTS, None)
+
+@event.listens_for(Session, "after_rollback")
+def remove_orphaned_segments(session: Session) -> None:
+    for path in session.info.pop(PENDING_SEGMENTS, []):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing orphaned archive segment {path}: {str(e)}")
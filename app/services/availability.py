@@ -0,0 +1,300 @@
+from typing import List, Dict, Optional, Tuple, Iterable
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, union_all, or_
+import numpy as np
+from app.core.config import settings
+from app.models.event import Event, EventParticipant, EventStatus, RecurrencePattern
+import logging
+
+logger = logging.getLogger(__name__)
+
+Intervals = Tuple[np.ndarray, np.ndarray]  # (starts, ends) as datetime64[us]
+
+TIME_UNIT = "datetime64[us]"
+
+def to_intervals(pairs: Iterable[Tuple[datetime, datetime]]) -> Intervals:
+    pairs = list(pairs)
+    if not pairs:
+        return np.empty(0, dtype=TIME_UNIT), np.empty(0, dtype=TIME_UNIT)
+    starts, ends = zip(*pairs)
+    return np.array(starts, dtype=TIME_UNIT), np.array(ends, dtype=TIME_UNIT)
+
+def to_pairs(intervals: Intervals) -> List[Tuple[datetime, datetime]]:
+    starts, ends = intervals
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray) -> Intervals:
+    """Merge overlapping or touching intervals into disjoint busy blocks.
+
+    After sorting by start, the running maximum of the ends is the end of
+    the block seen so far; an interval starting after it opens a new block.
+    """
+    if starts.size == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    running_end = np.maximum.accumulate(ends)
+    opens = np.empty(starts.size, dtype=bool)
+    opens[0] = True
+    opens[1:] = starts[1:] > running_end[:-1]
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:] - 1, starts.size - 1)
+    return starts[first], running_end[last]
+
+def clip_intervals(starts: np.ndarray, ends: np.ndarray, window_start: datetime, window_end: datetime) -> Intervals:
+    lower, upper = np.datetime64(window_start, "us"), np.datetime64(window_end, "us")
+    starts, ends = np.maximum(starts, lower), np.minimum(ends, upper)
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+def free_gaps(busy: Intervals, window_start: datetime, window_end: datetime) -> Intervals:
+    """Gaps in ``[window_start, window_end)`` not covered by merged ``busy`` blocks."""
+    starts, ends = clip_intervals(*busy, window_start, window_end)
+    gap_starts = np.concatenate(([np.datetime64(window_start, "us")], ends))
+    gap_ends = np.concatenate((starts, [np.datetime64(window_end, "us")]))
+    keep = gap_ends > gap_starts
+    return gap_starts[keep], gap_ends[keep]
+
+def union_busy(intervals: Iterable[Intervals]) -> Intervals:
+    """Merged blocks during which at least one of the calendars is busy."""
+    intervals = list(intervals)
+    if not intervals:
+        return to_intervals([])
+    return merge_intervals(
+        np.concatenate([starts for starts, _ in intervals]),
+        np.concatenate([ends for _, ends in intervals])
+    )
+
+def first_common_slot(
+    intervals: Iterable[Intervals],
+    duration: timedelta,
+    window_start: datetime,
+    window_end: datetime
+) -> Optional[Tuple[datetime, datetime]]:
+    """Earliest slot of ``duration`` inside the window when every calendar is free."""
+    gap_starts, gap_ends = free_gaps(union_busy(intervals), window_start, window_end)
+    fits = np.flatnonzero(gap_ends - gap_starts >= np.timedelta64(duration))
+    if fits.size == 0:
+        return None
+    start = gap_starts[fits[0]].item()
+    return start, start + duration
+
+def sweep_free(intervals: Iterable[Intervals], window_start: datetime, window_end: datetime) -> Intervals:
+    """Sweep-line over every calendar's intervals for the stretches nobody is busy.
+
+    Each interval contributes +1 at its start and -1 at its end; ends sort
+    before starts at the same instant so back-to-back meetings leave no
+    phantom overlap. Free stretches are where the running count is zero.
+    """
+    intervals = list(intervals)
+    starts = np.concatenate([starts for starts, _ in intervals] or [to_intervals([])[0]])
+    ends = np.concatenate([ends for _, ends in intervals] or [to_intervals([])[1]])
+    starts, ends = clip_intervals(starts, ends, window_start, window_end)
+    times = np.concatenate((starts, ends))
+    deltas = np.concatenate((np.ones(starts.size, dtype=np.int64), -np.ones(ends.size, dtype=np.int64)))
+    order = np.lexsort((deltas, times))
+    times, active = times[order], np.cumsum(deltas[order])
+
+    # Boundaries of the constant-count segments, including the window edges
+    bounds = np.concatenate(([np.datetime64(window_start, "us")], times, [np.datetime64(window_end, "us")]))
+    counts = np.concatenate(([0], active))
+    keep = (counts == 0) & (bounds[1:] > bounds[:-1])
+    return merge_intervals(bounds[:-1][keep], bounds[1:][keep])
+
+def off_hours(
+    window_start: datetime,
+    window_end: datetime,
+    hours: Tuple[int, int],
+    weekdays: Iterable[int]
+) -> Intervals:
+    """Blocks of the window outside working ``hours`` on the allowed ``weekdays``."""
+    weekdays = set(weekdays)
+    day = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    working = []
+    while day < window_end:
+        if day.weekday() in weekdays:
+            working.append((day + timedelta(hours=hours[0]), day + timedelta(hours=hours[1])))
+        day += timedelta(days=1)
+    return free_gaps(to_intervals(working), window_start, window_end)
+
+def candidate_slots(
+    free: Intervals,
+    duration: timedelta,
+    step: timedelta,
+    limit: int
+) -> List[Tuple[datetime, datetime]]:
+    """Earliest ``limit`` slot starts on the ``step`` grid that fit inside a free stretch."""
+    slots = []
+    epoch, step64 = np.datetime64(0, "us"), np.timedelta64(step)
+    for gap_start, gap_end in zip(*free):
+        # Align the first candidate up to the grid
+        first = epoch + -((epoch - gap_start) // step64) * step64
+        last = gap_end - np.timedelta64(duration)
+        if first > last:
+            continue
+        count = min((last - first) // step64 + 1, limit - len(slots))
+        starts = first + np.arange(count) * step64
+        slots.extend((start, start + duration) for start in starts.tolist())
+        if len(slots) >= limit:
+            break
+    return slots
+
+def expand_series(event: Event, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+    """Occurrences of a recurring event overlapping the window, and no others."""
+    steps = {
+        RecurrencePattern.DAILY: timedelta(days=1),
+        RecurrencePattern.WEEKLY: timedelta(weeks=1),
+        RecurrencePattern.MONTHLY: timedelta(days=30),
+        RecurrencePattern.YEARLY: timedelta(days=365),
+    }
+    step = steps.get(event.recurrence_pattern)
+    if step is None:
+        return [(event.start_time, event.end_time)]
+    step *= event.recurrence_interval or 1
+    duration = event.end_time - event.start_time
+    series_end = min(event.recurrence_end_date or window_end, window_end)
+    exceptions = set(event.recurrence_exceptions or [])
+
+    # Jump straight to the first occurrence that can reach into the window
+    skipped = max(0, (window_start - duration - event.start_time) // step)
+    occurrence = event.start_time + skipped * step
+    occurrences = []
+    while occurrence <= series_end and occurrence < window_end:
+        if occurrence + duration > window_start and occurrence.strftime("%Y-%m-%d") not in exceptions:
+            occurrences.append((occurrence, occurrence + duration))
+        occurrence += step
+    return occurrences
+
+class AvailabilityService:
+    """Free/busy lookups over users' calendars.
+
+    A user is busy during the active, non-cancelled events they created or
+    participate in. Intervals for the whole group are loaded with one query
+    and merged with NumPy, so the cost grows with the number of events in
+    the window rather than with pairs of events.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def load_intervals(self, user_ids: List[str], start: datetime, end: datetime) -> Dict[str, Intervals]:
+        """Raw busy intervals per user overlapping ``[start, end)``."""
+        self._validate(user_ids, start, end)
+        overlaps = (
+            Event.start_time < end,
+            Event.end_time > start,
+            Event.is_active == True,
+            Event.status != EventStatus.CANCELLED
+        )
+        created = (
+            select(Event.created_by.label("user_id"), Event.start_time, Event.end_time)
+            .where(Event.created_by.in_(user_ids), *overlaps)
+        )
+        participating = (
+            select(EventParticipant.user_id, Event.start_time, Event.end_time)
+            .join(Event, Event.id == EventParticipant.event_id)
+            .where(EventParticipant.user_id.in_(user_ids), EventParticipant.is_active == True, *overlaps)
+        )
+        result = await self.session.execute(union_all(created, participating))
+
+        pairs: Dict[str, List[Tuple[datetime, datetime]]] = {user_id: [] for user_id in user_ids}
+        for user_id, event_start, event_end in result.all():
+            pairs[user_id].append((event_start, event_end))
+        return {user_id: to_intervals(user_pairs) for user_id, user_pairs in pairs.items()}
+
+    async def get_free_busy(
+        self,
+        user_ids: List[str],
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, Dict[str, List[Tuple[datetime, datetime]]]]:
+        """Merged busy blocks and free gaps per user within the window."""
+        intervals = await self.load_intervals(user_ids, start, end)
+        free_busy = {}
+        for user_id, (starts, ends) in intervals.items():
+            busy = clip_intervals(*merge_intervals(starts, ends), start, end)
+            free_busy[user_id] = {
+                "busy": to_pairs(busy),
+                "free": to_pairs(free_gaps(busy, start, end))
+            }
+        return free_busy
+
+    async def find_common_slot(
+        self,
+        user_ids: List[str],
+        duration: timedelta,
+        start: datetime,
+        end: datetime
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """First slot of ``duration`` in the window when all users are free."""
+        if duration <= timedelta(0):
+            raise ValueError("Duration must be positive")
+        intervals = await self.load_intervals(user_ids, start, end)
+        return first_common_slot(intervals.values(), duration, start, end)
+
+    async def suggest_slots(
+        self,
+        user_ids: List[str],
+        duration: timedelta,
+        start: datetime,
+        end: datetime,
+        working_hours: Tuple[int, int] = (9, 17),
+        weekdays: Iterable[int] = range(5),
+        step: timedelta = timedelta(minutes=30),
+        limit: int = 5
+    ) -> List[Tuple[datetime, datetime]]:
+        """Earliest slots of ``duration`` within working hours when all users are free."""
+        if duration <= timedelta(0) or step <= timedelta(0):
+            raise ValueError("Duration and step must be positive")
+        if not 0 <= working_hours[0] < working_hours[1] <= 24:
+            raise ValueError("Working hours must be an increasing range within the day")
+        intervals = await self.load_intervals(user_ids, start, end)
+        series = await self.load_series_intervals(user_ids, start, end)
+        free = sweep_free(
+            [*intervals.values(), *series.values(), off_hours(start, end, working_hours, weekdays)],
+            start,
+            end
+        )
+        return candidate_slots(free, duration, step, limit)
+
+    async def load_series_intervals(self, user_ids: List[str], start: datetime, end: datetime) -> Dict[str, Intervals]:
+        """Occurrences inside the window of recurring series the users are in.
+
+        Series are expanded for the window only; occurrences already stored
+        as rows are loaded by ``load_intervals`` too and merge away.
+        """
+        series = (
+            Event.recurrence_pattern != RecurrencePattern.NONE,
+            Event.start_time < end,
+            or_(Event.recurrence_end_date == None, Event.recurrence_end_date + (Event.end_time - Event.start_time) > start),
+            Event.is_active == True,
+            Event.status != EventStatus.CANCELLED
+        )
+        created = select(Event.created_by.label("user_id"), Event.id).where(Event.created_by.in_(user_ids), *series)
+        participating = (
+            select(EventParticipant.user_id, Event.id)
+            .join(Event, Event.id == EventParticipant.event_id)
+            .where(EventParticipant.user_id.in_(user_ids), EventParticipant.is_active == True, *series)
+        )
+        members = (await self.session.execute(union_all(created, participating))).all()
+        if not members:
+            return {}
+        result = await self.session.execute(select(Event).where(Event.id.in_({event_id for _, event_id in members})))
+        occurrences = {event.id: expand_series(event, start, end) for event in result.scalars().all()}
+
+        pairs: Dict[str, List[Tuple[datetime, datetime]]] = {}
+        for user_id, event_id in members:
+            pairs.setdefault(user_id, []).extend(occurrences.get(event_id, []))
+        return {user_id: to_intervals(user_pairs) for user_id, user_pairs in pairs.items()}
+
+    @staticmethod
+    def _validate(user_ids: List[str], start: datetime, end: datetime) -> None:
+        if not user_ids:
+            raise ValueError("At least one user is required")
+        if len(user_ids) > settings.AVAILABILITY_MAX_USERS:
+            raise ValueError(f"At most {settings.AVAILABILITY_MAX_USERS} users can be queried at once")
+        if end <= start:
+            raise ValueError("Window end must be after its start")
+        if end - start > timedelta(days=settings.AVAILABILITY_MAX_WINDOW_DAYS):
+            raise ValueError(f"Window cannot exceed {settings.AVAILABILITY_MAX_WINDOW_DAYS} days")
@@ -1,7 +1,10 @@
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.event import Event
+from app.models.user import User
 from app.models.version import Version
+from app.services.archive import ArchiveService
 import json
 from difflib import unified_diff
 import logging
@@ -9,11 +12,18 @@ from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
 
+# Versioned entity tables, used to bound version lookups by creation time
+ENTITY_MODELS = {
+    "event": Event,
+    "user": User,
+}
+
 class ChangelogService:
     """Service for managing and visualizing changelogs."""
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.archive_service = ArchiveService(session)
     
     async def get_entity_changelog(
         self,
@@ -22,16 +32,45 @@ class ChangelogService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
-        """Get changelog for a specific entity."""
+        """Get changelog for a specific entity, including archived versions."""
         stmt = select(Version).filter(Version.entity_type == entity_type, Version.entity_id == entity_id)
+        created_at = await self._entity_created_at(entity_type, entity_id)
+        if created_at and (not start_date or created_at > start_date):
+            stmt = stmt.filter(Version.created_at >= created_at)
         if start_date:
             stmt = stmt.filter(Version.created_at >= start_date)
         if end_date:
             stmt = stmt.filter(Version.created_at <= end_date)
         stmt = stmt.order_by(Version.version_number.asc())
         result = await self.session.execute(stmt)
-        versions = result.scalars().all()
+        versions = list(result.scalars().all())
+
+        archived = await self.archive_service.load_rows(entity_type, entity_id, Version)
+        if archived:
+            versions.extend(
+                version for version in archived
+                if (not start_date or version.created_at >= start_date)
+                and (not end_date or version.created_at <= end_date)
+            )
+            versions.sort(key=lambda version: version.version_number)
         return [version.to_dict() for version in versions]
+
+    async def _get_version(self, entity_type: str, entity_id: str, version_number: int) -> Optional[Version]:
+        """Fetch one version from the hot table, falling back to cold storage."""
+        stmt = select(Version).filter(
+            Version.entity_type == entity_type,
+            Version.entity_id == entity_id,
+            Version.version_number == version_number
+        )
+        created_at = await self._entity_created_at(entity_type, entity_id)
+        if created_at:
+            stmt = stmt.filter(Version.created_at >= created_at)
+        result = await self.session.execute(stmt)
+        version = result.scalars().first()
+        if version:
+            return version
+        archived = await self.archive_service.load_rows(entity_type, entity_id, Version)
+        return next((v for v in archived if v.version_number == version_number), None)
     
     async def get_changes_between_versions(
         self,
@@ -44,21 +83,8 @@ class ChangelogService:
         if from_version >= to_version:
             raise ValueError("from_version must be less than to_version")
 
-        stmt_from = select(Version).filter(
-            Version.entity_type == entity_type,
-            Version.entity_id == entity_id,
-            Version.version_number == from_version
-        )
-        result_from = await self.session.execute(stmt_from)
-        from_version_obj = result_from.scalars().first()
-
-        stmt_to = select(Version).filter(
-            Version.entity_type == entity_type,
-            Version.entity_id == entity_id,
-            Version.version_number == to_version
-        )
-        result_to = await self.session.execute(stmt_to)
-        to_version_obj = result_to.scalars().first()
+        from_version_obj = await self._get_version(entity_type, entity_id, from_version)
+        to_version_obj = await self._get_version(entity_type, entity_id, to_version)
 
         if not from_version_obj or not to_version_obj:
             raise ValueError("One or both versions not found")
@@ -72,6 +98,18 @@ class ChangelogService:
             )
         }
     
+    async def _entity_created_at(self, entity_type: str, entity_id: str) -> Optional[datetime]:
+        """Creation time of a versioned entity.
+
+        No version can predate its entity, so filtering on it lets PostgreSQL
+        skip every ``versions`` partition older than the entity.
+        """
+        model = ENTITY_MODELS.get(entity_type)
+        if model is None:
+            return None
+        result = await self.session.execute(select(model.created_at).where(model.id == entity_id))
+        return result.scalar_one_or_none()
+    
     def _calculate_changes(self, from_state: Dict[str, Any], to_state: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate changes between two states."""
         changes = {}
@@ -1,15 +1,24 @@
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, or_, select, exists, delete
 from app.models.event import Event, EventStatus, RecurrencePattern
 from app.models.event_share import EventShare, SharePermission
 from app.core.transaction import transaction_scope
 from app.core.conflict_resolution import ConflictResolver
 from app.services.changelog import ChangelogService
 from app.models.event_version import EventVersion
+from app.models.reminder import ReminderLedger
 from app.models.user import User
+from app.core.cache import facet_cache
+from app.core.config import settings
+from app.models.event_access import OWNER_PERMISSION
+from app.services.event_access import EventAccessService, live_share
+from app.services.analytics import analytics_changes
+from app.services.reminder_scheduler import reminder_scheduler
+from app.services.visibility import visible_events
 import logging
+import redis
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +29,7 @@ class EventService:
         self.session = session
         self.conflict_resolver = ConflictResolver(session)
         self.changelog_service = ChangelogService(session)
+        self.access_service = EventAccessService(session)
     
     async def create_event(
         self,
@@ -73,15 +83,27 @@ class EventService:
                     instance.id = None  # Let the database generate new IDs
                     self.session.add(instance)
             
+            if settings.EVENT_ACCESS_TABLE_ENABLED:
+                await self.session.flush()
+                await self.access_service.grant([
+                    {"user_id": created_by, "event_id": e.id, "permission": OWNER_PERMISSION, "start_time": e.start_time}
+                    for e in [event, *instances]
+                ])
+            
             # Add to transaction
             await transaction.add_operation(
                 "create_event",
                 "event",
                 event.id,
-                event.to_dict()
+                event.to_dict(),
+                user_id=created_by
             )
-            
-            return event, instances
+
+            # Redis side effects wait for the outermost commit
+            transaction.after_commit(lambda: self._schedule_reminders([event, *instances]))
+            transaction.after_commit(lambda: self._mark_analytics(event.id, *[instance.id for instance in instances]))
+        
+        return event, instances
     
     async def update_event(
         self,
@@ -102,6 +124,7 @@ class EventService:
             
             # Store previous state for versioning
             previous_state = event.to_dict()
+            previous_start = event.start_time
             
             # Update fields
             for key, value in updates.items():
@@ -113,6 +136,13 @@ class EventService:
             if conflicts:
                 raise ValueError(f"Update would create conflicts with {len(conflicts)} existing events")
             
+            if settings.EVENT_ACCESS_TABLE_ENABLED and "start_time" in updates:
+                await self.access_service.move(event_id, event.start_time)
+
+            if event.start_time != previous_start:
+                # Reminders sent for the old time must go out again for the new one
+                await self.session.execute(delete(ReminderLedger).where(ReminderLedger.event_id == event_id))
+            
             # Create version record
             await self.changelog_service.create_version(
                 "event",
@@ -128,10 +158,15 @@ class EventService:
                 "update_event",
                 "event",
                 event_id,
-                updates
+                updates,
+                user_id=user_id
             )
-            
-            return event
+
+            if "start_time" in updates:
+                transaction.after_commit(lambda: self._schedule_reminders([event]))
+            transaction.after_commit(lambda: self._mark_analytics(event_id))
+        
+        return event
     
     async def delete_event(self, event_id: str, user_id: str) -> bool:
         """Delete an event."""
@@ -150,12 +185,44 @@ class EventService:
                 "delete_event",
                 "event",
                 event_id,
-                event.to_dict()
+                event.to_dict(),
+                user_id=user_id
             )
             
             # Delete event
             await self.session.delete(event)
-            return True
+
+            transaction.after_commit(lambda: self._unschedule_reminders(event_id))
+            transaction.after_commit(lambda: self._mark_analytics(event_id))
+        
+        return True
+    
+    def _schedule_reminders(self, events: List[Event]) -> None:
+        """Record reminder due times; a Redis outage must not fail the write."""
+        for event in events:
+            if not event.id:
+                continue
+            try:
+                reminder_scheduler.schedule_event(event.id, event.start_time)
+            except redis.RedisError as e:
+                logger.error(f"Error scheduling reminders for event {event.id}: {str(e)}")
+    
+    def _unschedule_reminders(self, event_id: str) -> None:
+        try:
+            reminder_scheduler.unschedule_event(event_id)
+        except redis.RedisError as e:
+            logger.error(f"Error unscheduling reminders for event {event_id}: {str(e)}")
+
+    def _mark_analytics(self, *event_ids: Optional[str]) -> None:
+        """Queue changed events for the analytics rollups and facet counts."""
+        try:
+            analytics_changes.mark(*[event_id for event_id in event_ids if event_id])
+        except redis.RedisError as e:
+            logger.error(f"Error queueing analytics changes: {str(e)}")
+        try:
+            facet_cache.mark_stale()
+        except redis.RedisError as e:
+            logger.error(f"Error marking facet counts stale: {str(e)}")
     
     async def get_event(self, event_id: str, user_id: str) -> Event:
         """Get an event by ID."""
@@ -178,6 +245,12 @@ class EventService:
         include_private: bool = False
     ) -> List[Event]:
         """List events with various filters."""
+        if not include_private:
+            # Privacy is applied as a UNION ALL of index-friendly branches
+            stmt = visible_events(user_id, start_date=start_date, end_date=end_date, status=status)
+            result = await self.session.execute(stmt)
+            return result.scalars().all()
+
         stmt = select(Event)
         # Apply filters
         if start_date:
@@ -186,34 +259,48 @@ class EventService:
             stmt = stmt.filter(Event.end_time <= end_date)
         if status:
             stmt = stmt.filter(Event.status == status)
-        # Handle privacy
-        if not include_private:
-            stmt = stmt.filter(
-                or_(
-                    Event.is_private == False,
-                    Event.created_by == user_id,
-                    Event.id.in_(
-                        select(EventShare.event_id).filter(EventShare.shared_with == user_id)
-                    )
-                )
-            )
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(stmt.order_by(Event.start_time, Event.id))
         return result.scalars().all()
+
+    @staticmethod
+    def visibility_filter(user_id: str):
+        """Criterion for events a user may see: public, their own or shared with them.
+
+        For combining with other predicates (search, facets); plain listings
+        use ``visible_events``, which lets each branch use its own index.
+        """
+        return or_(
+            Event.is_private == False,
+            Event.created_by == user_id,
+            exists().where(EventShare.shared_with_id == user_id, EventShare.event_id == Event.id)
+        )
     
     async def batch_create_events(
         self,
         events_data: List[Dict[str, Any]],
-        created_by: str
+        created_by: str,
+        skip_failures: bool = False
     ) -> List[Event]:
-        """Create multiple events in a single transaction."""
+        """Create multiple events in a single transaction.
+
+        Each event is created in its own savepoint. With ``skip_failures`` an
+        event that conflicts is rolled back on its own and the rest of the
+        batch still commits; otherwise the first failure aborts the batch.
+        """
         created_events = []
         
         async with transaction_scope(self.session) as transaction:
             for event_data in events_data:
-                event, instances = await self.create_event(
-                    created_by=created_by,
-                    **event_data
-                )
+                try:
+                    event, instances = await self.create_event(
+                        created_by=created_by,
+                        **event_data
+                    )
+                except ValueError as e:
+                    if not skip_failures:
+                        raise
+                    logger.warning(f"Skipping event '{event_data.get('title')}' in batch: {str(e)}")
+                    continue
                 created_events.extend([event] + instances)
             
             # Add batch operation to transaction
@@ -270,7 +357,7 @@ class EventService:
         stmt = select(EventShare).filter(
             and_(
                 EventShare.event_id == event_id,
-                EventShare.shared_with == user_id
+                EventShare.shared_with_id == user_id
             )
         )
         result = await self.session.execute(stmt)
@@ -308,7 +395,7 @@ class EventService:
         stmt = select(EventShare).filter(
             and_(
                 EventShare.event_id == event_id,
-                EventShare.shared_with == target_user_id # Corrected to shared_with
+                EventShare.shared_with_id == target_user_id
             )
         )
         result = await self.session.execute(stmt)
@@ -317,8 +404,17 @@ class EventService:
         if not share:
             raise ValueError("Share not found for this user on this event")
 
-        share.permission = permission
-        await self.session.commit()
+        async with transaction_scope(self.session) as transaction:
+            share.permission = permission
+            if settings.EVENT_ACCESS_TABLE_ENABLED:
+                await self._grant_share_access([share])
+            await transaction.add_operation(
+                "update_event_share",
+                "event",
+                event_id,
+                {"shared_with_id": target_user_id, "permission": permission},
+                user_id=user_id
+            )
         await self.session.refresh(share)
         return share
 
@@ -336,7 +432,7 @@ class EventService:
         stmt = select(EventShare).filter(
             and_(
                 EventShare.event_id == event_id,
-                EventShare.shared_with == target_user_id # Corrected to shared_with
+                EventShare.shared_with_id == target_user_id
             )
         )
         result = await self.session.execute(stmt)
@@ -345,10 +441,108 @@ class EventService:
         if not share:
             raise ValueError("Share not found for this user on this event")
 
-        await self.session.delete(share)
-        await self.session.commit()
+        async with transaction_scope(self.session) as transaction:
+            await self.session.delete(share)
+            if settings.EVENT_ACCESS_TABLE_ENABLED:
+                await self.access_service.revoke(event_id, [target_user_id])
+            await transaction.add_operation(
+                "delete_event_share",
+                "event",
+                event_id,
+                {"shared_with_id": target_user_id},
+                user_id=user_id
+            )
         return True
 
+    async def share_event(self, event_id: str, share_data: Any, user_id: str) -> List[EventShare]:
+        """Share an event with users.
+
+        ``share_data.users`` holds user ids or ``{"user_id", "permission",
+        "expires_at"}`` dicts; an existing share of a user is updated.
+        """
+        event = await self.session.get(Event, event_id)
+        if not event:
+            raise ValueError("Event not found")
+        if not await self._check_permission(event_id, user_id, "share"):
+            raise PermissionError("User does not have permission to share this event")
+
+        requested = {}
+        for entry in share_data.users:
+            if isinstance(entry, str):
+                entry = {"user_id": entry}
+            requested[entry["user_id"]] = (
+                SharePermission(entry.get("permission", SharePermission.VIEW.value)),
+                entry.get("expires_at")
+            )
+        result = await self.session.execute(
+            select(EventShare).where(EventShare.event_id == event_id, EventShare.shared_with_id.in_(list(requested)))
+        )
+        existing = {share.shared_with_id: share for share in result.scalars().all()}
+
+        shares = []
+        async with transaction_scope(self.session) as transaction:
+            for target_user_id, (permission, expires_at) in requested.items():
+                share = existing.get(target_user_id)
+                if share is None:
+                    share = EventShare(event_id=event_id, shared_by_id=user_id, shared_with_id=target_user_id)
+                    self.session.add(share)
+                share.permission = permission
+                share.expires_at = expires_at
+                shares.append(share)
+                await transaction.add_operation(
+                    "share_event",
+                    "event",
+                    event_id,
+                    {"shared_with_id": target_user_id, "permission": permission, "expires_at": expires_at},
+                    user_id=user_id
+                )
+
+            if settings.EVENT_ACCESS_TABLE_ENABLED:
+                await self._grant_share_access(shares, event)
+        return shares
+
+    async def get_calendar(self, user_id: str, start: datetime, end: datetime) -> List[Event]:
+        """Events a user owns or was shared that start in ``[start, end)``."""
+        if settings.EVENT_ACCESS_TABLE_ENABLED:
+            return await self.access_service.calendar(user_id, start, end)
+
+        stmt = (
+            select(Event)
+            .where(
+                or_(
+                    Event.created_by == user_id,
+                    exists().where(
+                        EventShare.shared_with_id == user_id,
+                        EventShare.event_id == Event.id,
+                        live_share()
+                    )
+                ),
+                Event.is_active == True,
+                Event.start_time >= start,
+                Event.start_time < end
+            )
+            .order_by(Event.start_time, Event.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def _grant_share_access(self, shares: List[EventShare], event: Optional[Event] = None) -> None:
+        if not shares:
+            return
+        event = event or await self.session.get(Event, shares[0].event_id)
+        now = datetime.utcnow()
+        # Expired shares are swept by the rebuild task
+        await self.access_service.grant([
+            {
+                "user_id": share.shared_with_id,
+                "event_id": share.event_id,
+                "permission": share.permission.value,
+                "start_time": event.start_time
+            }
+            for share in shares
+            if share.shared_with_id != event.created_by and (share.expires_at is None or share.expires_at > now)
+        ])
+
     async def rollback_event(
         self,
         event_id: str,
@@ -367,14 +561,7 @@ class EventService:
                  raise PermissionError("User does not have permission to rollback this event")
 
             # Get the target version
-            stmt = select(EventVersion).filter(
-                and_(
-                    EventVersion.event_id == event_id,
-                    EventVersion.version == version_id
-                )
-            )
-            result = await self.session.execute(stmt)
-            version_to_apply = result.scalars().first()
+            version_to_apply = await self._find_event_version(event_id, version_id)
 
             if not version_to_apply:
                 raise ValueError(f"Version {version_id} not found for event {event_id}")
@@ -412,10 +599,11 @@ class EventService:
                 "rollback_event",
                 "event",
                 event_id,
-                {"rolled_back_to_version": version_id}
+                {"rolled_back_to_version": version_id},
+                user_id=user_id
             )
 
-            await self.session.commit()
+            await self.session.flush()
             await self.session.refresh(event)
 
             return event
@@ -431,6 +619,15 @@ class EventService:
         # Reuse the get_event permission logic as versions are tied to the event
         await self.get_event(event_id, user_id) # This will raise an exception if event not found or no view permission
 
+        version = await self._find_event_version(event_id, version_id)
+
+        if not version:
+            raise ValueError(f"Version {version_id} not found for event {event_id}")
+
+        return version 
+
+    async def _find_event_version(self, event_id: str, version_id: int) -> Optional[EventVersion]:
+        """Look up an event version in the hot table, then in cold storage."""
         stmt = select(EventVersion).filter(
             and_(
                 EventVersion.event_id == event_id,
@@ -439,11 +636,10 @@ class EventService:
         )
         result = await self.session.execute(stmt)
         version = result.scalars().first()
-
-        if not version:
-            raise ValueError(f"Version {version_id} not found for event {event_id}")
-
-        return version 
+        if version:
+            return version
+        archived = await self.changelog_service.archive_service.load_rows("event", event_id, EventVersion)
+        return next((v for v in archived if v.version == version_id), None)
 
     async def add_participant(self, event_id: str, user_id: str) -> bool:
         """Add a participant to an event."""
@@ -470,10 +666,12 @@ class EventService:
                 "add_participant",
                 "event",
                 event_id,
-                {"user_id": user_id}
+                {"user_id": user_id},
+                user_id=user_id
             )
+            transaction.after_commit(lambda: self._mark_analytics(event_id))
 
-            return True
+        return True
 
     async def remove_participant(self, event_id: str, user_id: str) -> bool:
         """Remove a participant from an event."""
@@ -496,10 +694,12 @@ class EventService:
                 "remove_participant",
                 "event",
                 event_id,
-                {"user_id": user_id}
+                {"user_id": user_id},
+                user_id=user_id
             )
+            transaction.after_commit(lambda: self._mark_analytics(event_id))
 
-            return True
+        return True
 
     async def check_event_conflicts(self, event: Event) -> List[Event]:
         """Check for conflicts with existing events."""
@@ -0,0 +1,184 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, union_all, exists, func, literal, cast, case, or_, tuple_, String, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.event import Event
+from app.models.event_access import EventAccess, OWNER_PERMISSION
+from app.core.models import SharePermission
+from app.models.event_share import EventShare
+from uuid import uuid4
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ranked over the API permission set, which includes ADMIN
+PERMISSION_STRENGTH = {
+    SharePermission.VIEW.value: 1,
+    SharePermission.EDIT.value: 2,
+    SharePermission.MANAGE.value: 3,
+    SharePermission.ADMIN.value: 4,
+    OWNER_PERMISSION: 5,
+}
+
+def live_share():
+    """Criterion for shares that have not expired."""
+    return or_(EventShare.expires_at == None, EventShare.expires_at > func.now())
+
+class EventAccessService:
+    """Maintains the ``event_access`` table and serves calendar reads from it."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def grant(self, rows: List[Dict[str, Any]]) -> None:
+        """Upsert ``{user_id, event_id, permission, start_time}`` rows."""
+        if not rows:
+            return
+        now = datetime.utcnow()
+        stmt = pg_insert(EventAccess).values([
+            {**row, "id": str(uuid4()), "created_at": now, "updated_at": now, "is_active": True}
+            for row in rows
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uix_event_access",
+            set_={
+                "permission": stmt.excluded.permission,
+                "start_time": stmt.excluded.start_time,
+                "updated_at": now
+            }
+        )
+        await self.session.execute(stmt)
+
+    async def revoke(self, event_id: str, user_ids: List[str]) -> None:
+        if user_ids:
+            await self.session.execute(
+                delete(EventAccess).where(EventAccess.event_id == event_id, EventAccess.user_id.in_(user_ids))
+            )
+
+    async def move(self, event_id: str, start_time: datetime) -> None:
+        """Follow an event's new start time."""
+        await self.session.execute(
+            update(EventAccess)
+            .where(EventAccess.event_id == event_id)
+            .values(start_time=start_time, updated_at=datetime.utcnow())
+        )
+
+    async def calendar(self, user_id: str, start: datetime, end: datetime) -> List[Event]:
+        """Events the user owns or was shared starting in ``[start, end)``.
+
+        Share rows outlive their share's expiry until the sweeper runs, so
+        they are checked against a live share on the recipient index.
+        """
+        stmt = (
+            select(Event)
+            .join(EventAccess, EventAccess.event_id == Event.id)
+            .where(
+                EventAccess.user_id == user_id,
+                EventAccess.start_time >= start,
+                EventAccess.start_time < end,
+                Event.is_active == True,
+                or_(
+                    EventAccess.permission == OWNER_PERMISSION,
+                    exists().where(
+                        EventShare.shared_with_id == EventAccess.user_id,
+                        EventShare.event_id == EventAccess.event_id,
+                        live_share()
+                    )
+                )
+            )
+            .order_by(EventAccess.start_time, EventAccess.event_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def rebuild(
+        self,
+        user_ids: Optional[List[str]] = None,
+        pairs: Optional[List[Tuple[str, str]]] = None
+    ) -> Tuple[int, int]:
+        """Recompute access rows from events and shares; returns ``(upserted, deleted)``.
+
+        Limited to ``user_ids`` when given so the repair can run in batches,
+        or to ``(user_id, event_id)`` ``pairs`` after individual shares change.
+        """
+        expected = self._expected_rows(user_ids, pairs).cte("expected")
+        now = func.now()
+
+        upsert = pg_insert(EventAccess).from_select(
+            ["id", "user_id", "event_id", "permission", "start_time", "created_at", "updated_at", "is_active"],
+            select(
+                cast(func.gen_random_uuid(), String),
+                expected.c.user_id,
+                expected.c.event_id,
+                expected.c.permission,
+                expected.c.start_time,
+                now,
+                now,
+                true()
+            )
+        )
+        upsert = upsert.on_conflict_do_update(
+            constraint="uix_event_access",
+            set_={
+                "permission": upsert.excluded.permission,
+                "start_time": upsert.excluded.start_time,
+                "updated_at": now
+            },
+            where=or_(
+                EventAccess.permission != upsert.excluded.permission,
+                EventAccess.start_time != upsert.excluded.start_time
+            )
+        )
+        upserted = (await self.session.execute(upsert)).rowcount
+
+        stale = delete(EventAccess).where(
+            ~exists().where(
+                expected.c.user_id == EventAccess.user_id,
+                expected.c.event_id == EventAccess.event_id
+            )
+        )
+        if user_ids is not None:
+            stale = stale.where(EventAccess.user_id.in_(user_ids))
+        if pairs is not None:
+            stale = stale.where(tuple_(EventAccess.user_id, EventAccess.event_id).in_(pairs))
+        deleted = (await self.session.execute(stale)).rowcount
+        return upserted, deleted
+
+    @staticmethod
+    def _expected_rows(user_ids: Optional[List[str]], pairs: Optional[List[Tuple[str, str]]] = None):
+        owned = select(
+            Event.created_by.label("user_id"),
+            Event.id.label("event_id"),
+            literal(OWNER_PERMISSION).label("permission"),
+            Event.start_time
+        ).where(Event.is_active == True)
+        shared = (
+            select(
+                EventShare.shared_with_id,
+                EventShare.event_id,
+                func.lower(cast(EventShare.permission, String)),
+                Event.start_time
+            )
+            .join(Event, Event.id == EventShare.event_id)
+            .where(
+                Event.is_active == True,
+                Event.created_by != EventShare.shared_with_id,
+                live_share()
+            )
+        )
+        if user_ids is not None:
+            owned = owned.where(Event.created_by.in_(user_ids))
+            shared = shared.where(EventShare.shared_with_id.in_(user_ids))
+        if pairs is not None:
+            owned = owned.where(tuple_(Event.created_by, Event.id).in_(pairs))
+            shared = shared.where(tuple_(EventShare.shared_with_id, EventShare.event_id).in_(pairs))
+
+        # A user may hold several shares of one event; keep the strongest
+        rows = union_all(owned, shared).subquery()
+        strength = case(PERMISSION_STRENGTH, value=rows.c.permission, else_=0)
+        return (
+            select(rows)
+            .distinct(rows.c.user_id, rows.c.event_id)
+            .order_by(rows.c.user_id, rows.c.event_id, strength.desc())
+        )
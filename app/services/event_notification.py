@@ -8,15 +8,19 @@ from app.models.user import User
 import logging
 import json
 from app.core.notification import NotificationService
+from app.services.notification_feed import NotificationFeedService
+from app.services.notification_digest import NotificationCoalescer, notification_coalescer
 
 logger = logging.getLogger(__name__)
 
 class EventNotificationService:
     """Service for handling event-related notifications."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, coalescer: Optional[NotificationCoalescer] = None):
         self.session = session
         self.notification_service = NotificationService()
+        self.feed_service = NotificationFeedService(session)
+        self.coalescer = coalescer or notification_coalescer
     
     async def notify_event_created(self, event: Event) -> None:
         """Send notifications when an event is created."""
@@ -29,20 +33,15 @@ class EventNotificationService:
             data=event.to_dict()
         )
         
-        # If event is public, notify all users
+        # If event is public, publish a single broadcast that every user's
+        # timeline picks up on read instead of writing one row per user
         if not event.is_private:
-            stmt = select(User)
-            result = await self.session.execute(stmt)
-            users = result.scalars().all()
-            for user in users:
-                if user.id != event.created_by:
-                    await self.notification_service.create_notification(
-                        user_id=user.id,
-                        title="New Public Event",
-                        message=f"A new public event '{event.title}' has been created.",
-                        notification_type="public_event_created",
-                        data=event.to_dict()
-                    )
+            await self.feed_service.publish(
+                notification_type="public_event_created",
+                message=f"A new public event '{event.title}' has been created.",
+                data=event.to_dict(),
+                actor_id=event.created_by
+            )
     
     async def notify_event_updated(
         self,
@@ -50,24 +49,23 @@ class EventNotificationService:
         updates: Dict[str, Any],
         updated_by: str
     ) -> None:
-        """Send notifications when an event is updated."""
+        """Send notifications when an event is updated.
+
+        Updates are buffered by the digest stage so that a burst of edits
+        reaches each user as a single merged notification.
+        """
         # Get all users who should be notified
         users_to_notify = await self._get_users_to_notify(event)
+        payload = {
+            "title": event.title,
+            "updates": json.loads(json.dumps(updates, default=str)),
+            "updated_by": updated_by
+        }
         
-        # Create notification for each user
+        # Buffer a notification for each user
         for user_id in users_to_notify:
             if user_id != updated_by:  # Don't notify the user who made the changes
-                await self.notification_service.create_notification(
-                    user_id=user_id,
-                    title="Event Updated",
-                    message=f"The event '{event.title}' has been updated.",
-                    notification_type="event_updated",
-                    data={
-                        "event": event.to_dict(),
-                        "updates": updates,
-                        "updated_by": updated_by
-                    }
-                )
+                await self.coalescer.add(user_id, event.id, "event_updated", payload)
     
     async def notify_event_deleted(self, event: Event, deleted_by: str) -> None:
         """Send notifications when an event is deleted."""
@@ -105,33 +103,17 @@ class EventNotificationService:
         event: Event,
         participant_id: str
     ) -> None:
-        """Send notifications when a participant joins an event."""
-        # Notify event creator
-        if participant_id != event.created_by:
-            await self.notification_service.create_notification(
-                user_id=event.created_by,
-                title="New Participant",
-                message=f"A new participant has joined your event '{event.title}'.",
-                notification_type="participant_joined",
-                data={
-                    "event": event.to_dict(),
-                    "participant_id": participant_id
-                }
-            )
+        """Send notifications when a participant joins an event.
+
+        Joins are buffered by the digest stage, so a busy event produces
+        "N people joined" per recipient instead of one notification per join.
+        """
+        payload = {"title": event.title, "participant_id": participant_id}
+        recipients = [event.created_by] + [p.id for p in event.participants]
         
-        # Notify other participants
-        for participant in event.participants:
-            if participant.id not in [event.created_by, participant_id]:
-                await self.notification_service.create_notification(
-                    user_id=participant.id,
-                    title="New Participant",
-                    message=f"A new participant has joined the event '{event.title}'.",
-                    notification_type="participant_joined",
-                    data={
-                        "event": event.to_dict(),
-                        "participant_id": participant_id
-                    }
-                )
+        for user_id in dict.fromkeys(recipients):
+            if user_id != participant_id:
+                await self.coalescer.add(user_id, event.id, "participant_joined", payload)
     
     async def notify_participant_left(
         self,
@@ -201,6 +183,6 @@ class EventNotificationService:
         result = await self.session.execute(stmt)
         shares = result.scalars().all()
         for share in shares:
-            user_ids.add(share.shared_with)
+            user_ids.add(share.shared_with_id)
         
         return list(user_ids) 
\ No newline at end of file
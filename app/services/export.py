@@ -0,0 +1,207 @@
+from typing import List, Dict, Any, Optional, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from sqlalchemy import Table, select, and_
+from sqlalchemy.ext.asyncio import AsyncEngine
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.core.config import settings
+from app.core.database import engine
+from app.models.audit_log import AuditLog
+from app.models.event import Event, EventParticipant
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP = pa.timestamp("us")
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Columns exported for one table and their Arrow types.
+
+    Low-cardinality string columns use ``DICTIONARY`` so Arrow and Parquet
+    store each distinct value once.
+    """
+    table: Table
+    columns: Dict[str, pa.DataType]
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema([pa.field(name, dtype) for name, dtype in self.columns.items()])
+
+    @property
+    def dictionary_columns(self) -> List[str]:
+        return [name for name, dtype in self.columns.items() if dtype == DICTIONARY]
+
+EXPORT_SPECS: Dict[str, ExportSpec] = {
+    spec.name: spec for spec in (
+        ExportSpec(Event.__table__, {
+            "id": pa.string(),
+            "title": pa.string(),
+            "start_time": TIMESTAMP,
+            "end_time": TIMESTAMP,
+            "location": DICTIONARY,
+            "max_participants": pa.int32(),
+            "status": DICTIONARY,
+            "is_private": pa.bool_(),
+            "recurrence_pattern": DICTIONARY,
+            "current_version": pa.int32(),
+            "created_by": DICTIONARY,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+            "is_active": pa.bool_(),
+        }),
+        ExportSpec(EventParticipant.__table__, {
+            "id": pa.string(),
+            "event_id": pa.string(),
+            "user_id": pa.string(),
+            "role": DICTIONARY,
+            "joined_at": TIMESTAMP,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+            "is_active": pa.bool_(),
+        }),
+        ExportSpec(AuditLog.__table__, {
+            "id": pa.string(),
+            "user_id": DICTIONARY,
+            "action": DICTIONARY,
+            "entity_type": DICTIONARY,
+            "entity_id": pa.string(),
+            "timestamp": TIMESTAMP,
+            "details": pa.string(),  # JSON text
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+        }),
+    )
+}
+
+def _plain(value: Any) -> Any:
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+def record_batch(spec: ExportSpec, rows: Sequence[Any]) -> pa.RecordBatch:
+    """Convert a batch of result rows into one column-oriented Arrow batch."""
+    arrays = []
+    for index, (name, dtype) in enumerate(spec.columns.items()):
+        values = [_plain(row[index]) for row in rows]
+        if dtype == DICTIONARY:
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=dtype))
+    return pa.RecordBatch.from_arrays(arrays, schema=spec.schema)
+
+class ParquetExporter:
+    """Streams tables into Parquet files for the BI warehouse.
+
+    Rows are read through a server-side cursor ``batch_size`` at a time and
+    each batch is written as one Parquet row group, so memory stays flat
+    regardless of table size. Each table keeps a ``manifest.json`` in its
+    export directory listing the files written and the ``updated_at``
+    watermark. Incremental runs only export rows changed since then; a full
+    run replaces the listed files and deletes them once the new manifest is
+    written.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = engine,
+        export_dir: str = settings.EXPORT_DIR,
+        batch_size: int = settings.EXPORT_BATCH_SIZE,
+        lag_seconds: int = settings.EXPORT_LAG_SECONDS
+    ):
+        self.engine = engine
+        self.export_dir = export_dir
+        self.batch_size = batch_size
+        self.lag_seconds = lag_seconds
+
+    def manifest_path(self, table: str) -> str:
+        return os.path.join(self.export_dir, table, "manifest.json")
+
+    def read_manifest(self, table: str) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path(table)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"table": table, "watermark": None, "files": []}
+
+    def write_manifest(self, table: str, manifest: Dict[str, Any]) -> None:
+        path = self.manifest_path(table)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    async def export_table(self, table: str, full: bool = False, now: Optional[datetime] = None) -> Optional[str]:
+        """Export rows changed since the watermark; returns the file written, if any."""
+        spec = EXPORT_SPECS[table]
+        manifest = self.read_manifest(table)
+        since = None if full or not manifest["watermark"] else datetime.fromisoformat(manifest["watermark"])
+        # Stay behind in-flight transactions so late commits are not skipped
+        until = (now or datetime.utcnow()) - timedelta(seconds=self.lag_seconds)
+
+        updated_at = spec.table.c.updated_at
+        criteria = [updated_at <= until]
+        if since:
+            criteria.append(updated_at > since)
+        stmt = (
+            select(*[spec.table.c[name] for name in spec.columns])
+            .where(and_(*criteria))
+            .order_by(updated_at, spec.table.c.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        os.makedirs(os.path.dirname(self.manifest_path(table)), exist_ok=True)
+        filename = f"{table}-{until.strftime('%Y%m%dT%H%M%S')}{'-full' if full else ''}.parquet"
+        path = os.path.join(self.export_dir, table, filename)
+        rows_written = 0
+        writer = None
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.stream(stmt)
+                async for rows in result.partitions(self.batch_size):
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            path,
+                            spec.schema,
+                            compression="zstd",
+                            use_dictionary=spec.dictionary_columns
+                        )
+                    writer.write_batch(record_batch(spec, rows))
+                    rows_written += len(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        superseded = []
+        if full:
+            superseded = [entry["file"] for entry in manifest["files"] if entry["file"] != filename]
+            manifest["files"] = []
+        if rows_written:
+            manifest["files"].append({"file": filename, "rows": rows_written, "full": full})
+        manifest["watermark"] = until.isoformat()
+        self.write_manifest(table, manifest)
+        # Readers follow the manifest, so old files can go once it no longer lists them
+        for old_file in superseded:
+            try:
+                os.remove(os.path.join(self.export_dir, table, old_file))
+            except FileNotFoundError:
+                pass
+        logger.info(f"Exported {rows_written} {table} rows")
+        return path if rows_written else None
+
+    async def export_all(self, tables: Optional[List[str]] = None, full: bool = False) -> Dict[str, Optional[str]]:
+        now = datetime.utcnow()
+        return {
+            table: await self.export_table(table, full=full, now=now)
+            for table in tables or EXPORT_SPECS
+        }
@@ -0,0 +1,130 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text, or_
+import redis
+from app.core.cache import FacetCache, facet_cache
+from app.core.search import FACET_DATE_BUCKET
+from app.models.event import Event, EventStatus
+from app.models.event_share import EventShare
+from app.services.search import EventSearchService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# GROUPING(status, location, bucket) of each grouping set
+FACET_SETS = {3: "status", 5: "location", 6: "date"}
+
+def empty_facets() -> Dict[str, Dict[str, int]]:
+    return {name: {} for name in FACET_SETS.values()}
+
+def add_counts(facets: Dict[str, Dict[str, int]], rows) -> Dict[str, Dict[str, int]]:
+    """Fold ``(facet_set, status, location, bucket, count)`` rows into ``facets``."""
+    for facet_set, status, location, bucket, count in rows:
+        name = FACET_SETS[facet_set]
+        value = {"status": status, "location": location, "date": bucket}[name]
+        if value is None:
+            continue
+        if isinstance(value, EventStatus):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.date().isoformat()
+        facets[name][value] = facets[name].get(value, 0) + count
+    return facets
+
+def facet_list(facets: Dict[str, Dict[str, int]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Facet counts as lists, most frequent first (dates in order)."""
+    return {
+        name: sorted(
+            ({"value": value, "count": count} for value, count in counts.items()),
+            key=(lambda item: item["value"]) if name == "date" else (lambda item: (-item["count"], item["value"]))
+        )
+        for name, counts in facets.items()
+    }
+
+class EventFacetService:
+    """Facet counts (status, location, date bucket) next to search results.
+
+    Each count query is a single ``GROUPING SETS`` aggregate. Without
+    filters, public counts come from the ``event_facet_counts``
+    materialised view, cached in Redis, and only the user's private
+    events are counted live.
+    """
+
+    def __init__(self, session: AsyncSession, cache: Optional[FacetCache] = None):
+        self.session = session
+        self.cache = cache or facet_cache
+
+    async def search_with_facets(self, user_id: str, limit: int = 20, cursor: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Search result page plus facet counts for the same filters."""
+        hits, next_cursor = await EventSearchService(self.session).search(
+            user_id, limit=limit, cursor=cursor, **filters
+        )
+        return {
+            "items": hits,
+            "next_cursor": next_cursor,
+            "facets": facet_list(await self.facet_counts(user_id, **filters))
+        }
+
+    async def facet_counts(
+        self,
+        user_id: str,
+        query: Optional[str] = None,
+        title: Optional[str] = None,
+        **filters
+    ) -> Dict[str, Dict[str, int]]:
+        if query or title or any(value is not None for value in filters.values()):
+            criteria = EventSearchService.filters(user_id, **filters)
+            # Text matches are not precomputed; they are counted live
+            criteria.extend(EventSearchService.text_match(query, title)[0])
+            return add_counts(empty_facets(), await self._grouped_counts(criteria))
+
+        facets = await self._public_counts()
+        private = [
+            Event.is_active == True,
+            Event.is_private == True,
+            or_(
+                Event.created_by == user_id,
+                Event.id.in_(select(EventShare.event_id).where(EventShare.shared_with_id == user_id))
+            )
+        ]
+        return add_counts(facets, await self._grouped_counts(private))
+
+    async def refresh_view(self) -> None:
+        """Refresh the materialised facet counts without blocking readers."""
+        await self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY event_facet_counts"))
+
+    async def _public_counts(self) -> Dict[str, Dict[str, int]]:
+        try:
+            cached = self.cache.get()
+        except redis.RedisError as e:
+            logger.error(f"Error reading facet cache: {str(e)}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        result = await self.session.execute(
+            text("SELECT facet_set, status, location, bucket, count FROM event_facet_counts")
+        )
+        facets = add_counts(empty_facets(), result.all())
+        try:
+            self.cache.set(facets)
+        except redis.RedisError as e:
+            logger.error(f"Error writing facet cache: {str(e)}")
+        return facets
+
+    async def _grouped_counts(self, criteria: List[Any]):
+        bucket = func.date_trunc(FACET_DATE_BUCKET, Event.start_time)
+        stmt = (
+            select(
+                func.grouping(Event.status, Event.location, bucket),
+                Event.status,
+                Event.location,
+                bucket,
+                func.count()
+            )
+            .where(*criteria)
+            .group_by(func.grouping_sets(Event.status, Event.location, bucket))
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
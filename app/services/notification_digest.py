@@ -0,0 +1,201 @@
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+import asyncio
+import logging
+import time
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.core.metrics import (
+    notifications_coalesced_in_total,
+    notifications_coalesced_out_total,
+    notification_coalescing_ratio
+)
+from app.services.notification_feed import NotificationFeedService
+
+logger = logging.getLogger(__name__)
+
+DigestKey = Tuple[str, str, str]  # (user_id, event_id, notification_type)
+Delivery = Tuple[str, str, Dict[str, Any]]  # (user_id, message, data)
+Attempt = Tuple[Delivery, int]  # (digest, failed deliveries so far)
+
+class NotificationCoalescer:
+    """Buffers notifications per (user, event, type) and delivers merged digests.
+
+    A buffer is flushed when its window expires or when it reaches
+    ``max_batch`` items, whichever comes first. All buffers that are due at
+    the same time are handed to ``deliver`` in a single call.
+
+    A failed call puts its digests back for another try one window later;
+    a digest is only dropped after ``max_attempts`` failed deliveries.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[List[Delivery]], Awaitable[None]],
+        window_seconds: float = settings.NOTIFICATION_DIGEST_WINDOW,
+        max_batch: int = settings.NOTIFICATION_DIGEST_MAX_BATCH,
+        max_attempts: int = settings.NOTIFICATION_DIGEST_MAX_ATTEMPTS
+    ):
+        self.deliver = deliver
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self._pending: Dict[DigestKey, List[Dict[str, Any]]] = {}
+        self._deadlines: Dict[DigestKey, float] = {}
+        self._retries: List[Attempt] = []
+        self._retry_deadline: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._runner: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.delivered = 0
+
+    async def add(
+        self,
+        user_id: str,
+        event_id: str,
+        notification_type: str,
+        payload: Dict[str, Any]
+    ) -> None:
+        """Buffer a notification for later delivery as part of a digest."""
+        key = (user_id, event_id, notification_type)
+        async with self._lock:
+            buffer = self._pending.setdefault(key, [])
+            if not buffer:
+                self._deadlines[key] = time.monotonic() + self.window_seconds
+            buffer.append(payload)
+            self.submitted += 1
+            notifications_coalesced_in_total.labels(type=notification_type).inc()
+            batch = [(self._take(key), 0)] if len(buffer) >= self.max_batch else []
+        await self._deliver(batch)
+        if self._pending or self._retries:
+            self._ensure_runner()
+
+    async def flush(self) -> int:
+        """Deliver every buffered digest immediately; returns the number delivered."""
+        async with self._lock:
+            batch = [(self._take(key), 0) for key in list(self._pending)] + self._take_retries()
+        await self._deliver(batch)
+        return len(batch)
+
+    async def flush_due(self) -> int:
+        """Deliver digests whose window has expired; returns the number delivered."""
+        now = time.monotonic()
+        async with self._lock:
+            due = [key for key, deadline in self._deadlines.items() if deadline <= now]
+            batch = [(self._take(key), 0) for key in due]
+            if self._retry_deadline is not None and self._retry_deadline <= now:
+                batch += self._take_retries()
+        await self._deliver(batch)
+        return len(batch)
+
+    async def close(self) -> None:
+        """Stop the background flusher and deliver whatever is still buffered."""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.flush()
+        # Retries are bounded by max_attempts, so this terminates
+        while self._retries:
+            await self.flush()
+
+    @property
+    def ratio(self) -> float:
+        """Submitted notifications per delivered digest."""
+        return self.submitted / self.delivered if self.delivered else 0.0
+
+    def _take(self, key: DigestKey) -> Delivery:
+        payloads = self._pending.pop(key)
+        self._deadlines.pop(key, None)
+        user_id, event_id, notification_type = key
+        message, data = merge_payloads(notification_type, payloads)
+        data.update({"event_id": event_id, "notification_type": notification_type})
+        return user_id, message, data
+
+    def _take_retries(self) -> List[Attempt]:
+        retries, self._retries = self._retries, []
+        self._retry_deadline = None
+        return retries
+
+    async def _deliver(self, batch: List[Attempt]) -> None:
+        if not batch:
+            return
+        deliveries = [delivery for delivery, _ in batch]
+        try:
+            await self.deliver(deliveries)
+        except Exception as e:
+            retry = [(delivery, attempts + 1) for delivery, attempts in batch if attempts + 1 < self.max_attempts]
+            logger.error(
+                f"Error delivering {len(batch)} notification digests, "
+                f"{len(batch) - len(retry)} dropped after {self.max_attempts} attempts: {str(e)}"
+            )
+            if retry:
+                async with self._lock:
+                    self._retries.extend(retry)
+                    if self._retry_deadline is None:
+                        self._retry_deadline = time.monotonic() + self.window_seconds
+            return
+        self.delivered += len(deliveries)
+        for _, _, data in deliveries:
+            notifications_coalesced_out_total.labels(type=data["notification_type"]).inc()
+        notification_coalescing_ratio.set(self.ratio)
+
+    def _ensure_runner(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_wait())
+            await self.flush_due()
+            if not self._pending and not self._retries:
+                return
+
+    def _next_wait(self) -> float:
+        deadlines = list(self._deadlines.values())
+        if self._retry_deadline is not None:
+            deadlines.append(self._retry_deadline)
+        if not deadlines:
+            return self.window_seconds
+        return max(min(deadlines) - time.monotonic(), 0.0)
+
+def merge_payloads(notification_type: str, payloads: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+    """Merge buffered payloads of one type into a single message and data dict."""
+    title = payloads[-1].get("title", "")
+    count = len(payloads)
+
+    if notification_type == "participant_joined":
+        participant_ids = list(dict.fromkeys(p["participant_id"] for p in payloads))
+        if len(participant_ids) == 1:
+            message = f"A new participant has joined the event '{title}'."
+        else:
+            message = f"{len(participant_ids)} people joined the event '{title}'."
+        return message, {"participant_ids": participant_ids, "count": count}
+
+    if notification_type == "event_updated":
+        updates: Dict[str, Any] = {}
+        updated_by: List[str] = []
+        for payload in payloads:
+            updates.update(payload.get("updates", {}))
+            if payload.get("updated_by") not in updated_by:
+                updated_by.append(payload.get("updated_by"))
+        if count == 1:
+            message = f"The event '{title}' has been updated."
+        else:
+            message = f"The event '{title}' has been updated {count} times."
+        return message, {"updates": updates, "updated_by": updated_by, "count": count}
+
+    message = payloads[-1].get("message", f"{count} new notifications for '{title}'.")
+    return message, {"items": payloads, "count": count}
+
+async def deliver_digests(batch: List[Delivery]) -> None:
+    """Persist a batch of digests as private notifications in one transaction."""
+    async with get_db_context() as session:
+        feed_service = NotificationFeedService(session)
+        for user_id, message, data in batch:
+            await feed_service.add_notification(user_id, message, data)
+
+# Create a singleton instance
+notification_coalescer = NotificationCoalescer(deliver=deliver_digests)
@@ -0,0 +1,323 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from collections import Counter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, or_, select, update, func, literal, null, tuple_, union_all, values, column, DateTime, String
+from sqlalchemy.orm import Session
+from app.models.notification import (
+    Notification,
+    NotificationFeedItem,
+    NotificationStatus,
+    NotificationWatermark
+)
+from app.core.cache import UnreadCounter
+from app.core.config import settings
+from app.core.write_buffer import write_coalescer
+import logging
+
+logger = logging.getLogger(__name__)
+
+# session.info key holding unread counter changes that wait for the commit
+PENDING_COUNTER_CHANGES = "unread_counter_changes"
+
+class NotificationFeedService:
+    """Service for the hybrid notification inbox.
+
+    Private notifications are stored one row per user, while broadcasts are
+    written once to ``notification_feed`` and merged into each user's timeline
+    at read time, bounded below by the user's read watermark.
+
+    Unread counter changes are queued on the session and applied to Redis
+    only once it commits; a rollback discards them.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def publish(
+        self,
+        notification_type: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        actor_id: Optional[str] = None
+    ) -> NotificationFeedItem:
+        """Publish a broadcast notification visible to every user."""
+        item = NotificationFeedItem(
+            notification_type=notification_type,
+            message=message,
+            data=data or {},
+            actor_id=actor_id
+        )
+        self.session.add(item)
+        await self.session.flush()
+        return item
+
+    async def add_notification(
+        self,
+        user_id: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Notification:
+        """Insert a private notification and bump the user's unread counter."""
+        notification = Notification(user_id=user_id, message=message, data=data or {})
+        self.session.add(notification)
+        await self.session.flush()
+        self._count_on_commit(user_id, 1)
+        return notification
+
+    async def mark_read(self, notification_id: str, user_id: str) -> bool:
+        """Mark one private notification as read.
+
+        Returns False if the notification does not exist for this user.
+        """
+        result = await self.session.execute(
+            select(Notification.status).where(
+                Notification.id == notification_id,
+                Notification.user_id == user_id
+            )
+        )
+        current_status = result.scalar_one_or_none()
+        if current_status is None:
+            return False
+        if current_status == NotificationStatus.UNREAD:
+            if settings.WRITE_COALESCING_ENABLED:
+                # Read receipts can trail by a few milliseconds; share a commit.
+                # The counter follows the rows the flush actually flipped.
+                write_coalescer.submit("notification_read", {"id": notification_id, "read_at": datetime.utcnow()})
+            else:
+                result = await self.session.execute(
+                    update(Notification)
+                    .where(
+                        Notification.id == notification_id,
+                        Notification.status == NotificationStatus.UNREAD
+                    )
+                    .values(status=NotificationStatus.READ, read_at=datetime.utcnow())
+                )
+                # A concurrent reader may have flipped it first
+                if result.rowcount:
+                    self._count_on_commit(user_id, -1)
+        return True
+
+    async def mark_all_read(self, user_id: str) -> int:
+        """Mark every private notification and broadcast as read.
+
+        Private rows are flipped with a single set-based UPDATE and broadcasts
+        by moving the feed watermark. Returns the number of private rows updated.
+        """
+        now = datetime.utcnow()
+        result = await self.session.execute(
+            update(Notification)
+            .where(
+                Notification.user_id == user_id,
+                Notification.status == NotificationStatus.UNREAD
+            )
+            .values(status=NotificationStatus.READ, read_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.advance_watermark(user_id, now)
+        self._count_on_commit(user_id, None)
+        return result.rowcount
+
+    async def get_unread_count(self, user_id: str, default_watermark: Optional[datetime] = None) -> int:
+        """Get the number of unread private notifications and broadcasts.
+
+        The private count is served from Redis and recomputed on a miss; the
+        broadcast count is a range count on the feed's created_at index.
+        """
+        private_count = await UnreadCounter.get(user_id)
+        if private_count is None:
+            result = await self.session.execute(
+                select(func.count()).select_from(Notification).where(
+                    Notification.user_id == user_id,
+                    Notification.status == NotificationStatus.UNREAD
+                )
+            )
+            private_count = result.scalar_one()
+            await UnreadCounter.set(user_id, private_count)
+
+        watermark = await self.get_watermark(user_id, default_watermark)
+        result = await self.session.execute(
+            select(func.count()).select_from(NotificationFeedItem).where(
+                *self._unread_broadcast_filter(user_id, watermark)
+            )
+        )
+        return private_count + result.scalar_one()
+
+    async def get_watermark(self, user_id: str, default: Optional[datetime] = None) -> datetime:
+        """Get the feed read watermark for a user.
+
+        Users without a stored watermark fall back to ``default`` (typically the
+        account creation time) so that new accounts do not inherit the whole
+        broadcast history as unread.
+        """
+        result = await self.session.execute(
+            select(NotificationWatermark.feed_read_at).where(
+                NotificationWatermark.user_id == user_id
+            )
+        )
+        feed_read_at = result.scalar_one_or_none()
+        if feed_read_at is not None:
+            return feed_read_at
+        return default or datetime.min
+
+    async def advance_watermark(self, user_id: str, read_at: Optional[datetime] = None) -> datetime:
+        """Move the user's feed watermark forward; it never moves backwards."""
+        read_at = read_at or datetime.utcnow()
+        result = await self.session.execute(
+            select(NotificationWatermark).where(NotificationWatermark.user_id == user_id)
+        )
+        watermark = result.scalar_one_or_none()
+        if watermark is None:
+            watermark = NotificationWatermark(user_id=user_id, feed_read_at=read_at)
+            self.session.add(watermark)
+        elif watermark.feed_read_at < read_at:
+            watermark.feed_read_at = read_at
+        await self.session.flush()
+        return watermark.feed_read_at
+
+    async def get_timeline(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        default_watermark: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of the user's merged timeline, newest first.
+
+        Returns the page entries and the cursor for the next page (``None`` when
+        the timeline is exhausted).
+        """
+        watermark = await self.get_watermark(user_id, default_watermark)
+
+        private = select(
+            Notification.id.label("id"),
+            Notification.message.label("message"),
+            Notification.data.label("data"),
+            Notification.status.label("status"),
+            null().cast(String).label("notification_type"),
+            literal("private").label("source"),
+            Notification.created_at.label("created_at")
+        ).where(Notification.user_id == user_id)
+
+        broadcast = select(
+            NotificationFeedItem.id.label("id"),
+            NotificationFeedItem.message.label("message"),
+            NotificationFeedItem.data.label("data"),
+            literal(NotificationStatus.UNREAD, Notification.status.type).label("status"),
+            NotificationFeedItem.notification_type.label("notification_type"),
+            literal("broadcast").label("source"),
+            NotificationFeedItem.created_at.label("created_at")
+        ).where(*self._unread_broadcast_filter(user_id, watermark))
+
+        if cursor:
+            before_created_at, before_id = self.decode_cursor(cursor)
+            private = private.where(
+                tuple_(Notification.created_at, Notification.id) < tuple_(before_created_at, before_id)
+            )
+            broadcast = broadcast.where(
+                tuple_(NotificationFeedItem.created_at, NotificationFeedItem.id) < tuple_(before_created_at, before_id)
+            )
+
+        # Each branch is limited on its own index before the merge
+        private = private.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
+        broadcast = broadcast.order_by(
+            NotificationFeedItem.created_at.desc(),
+            NotificationFeedItem.id.desc()
+        ).limit(limit)
+
+        merged = union_all(private, broadcast).subquery()
+        stmt = (
+            select(merged)
+            .order_by(merged.c.created_at.desc(), merged.c.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.mappings().all()
+
+        entries = [
+            {
+                "id": row["id"],
+                "message": row["message"],
+                "data": row["data"],
+                "status": row["status"].value if row["status"] else None,
+                "notification_type": row["notification_type"],
+                "source": row["source"],
+                "created_at": row["created_at"]
+            }
+            for row in rows
+        ]
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = self.encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return entries, next_cursor
+
+    def _count_on_commit(self, user_id: str, amount: Optional[int]) -> None:
+        """Queue an unread counter change (``None`` resets it) until the session commits."""
+        self.session.info.setdefault(PENDING_COUNTER_CHANGES, []).append((user_id, amount))
+
+    @staticmethod
+    def _unread_broadcast_filter(user_id: str, watermark: datetime) -> list:
+        """Criteria selecting broadcasts the user has not read yet."""
+        return [
+            NotificationFeedItem.is_active == True,
+            NotificationFeedItem.created_at > watermark,
+            or_(
+                NotificationFeedItem.actor_id.is_(None),
+                NotificationFeedItem.actor_id != user_id
+            )
+        ]
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, id: str) -> str:
+        """Encode a keyset position as an opaque cursor."""
+        return f"{created_at.isoformat()}|{id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Decode a cursor produced by ``encode_cursor``."""
+        try:
+            created_at, id = cursor.split("|", 1)
+            return datetime.fromisoformat(created_at), id
+        except ValueError:
+            raise ValueError("Invalid notification cursor")
+
+def coalesced_read_marks(rows: List[Dict[str, Any]]):
+    """One UPDATE ... FROM (VALUES ...) for a group of queued read receipts.
+
+    Each notification keeps its own earliest ``read_at``; the owners of the
+    rows that were still unread come back through RETURNING.
+    """
+    first_read: Dict[str, datetime] = {}
+    for row in rows:
+        first_read[row["id"]] = min(row["read_at"], first_read.get(row["id"], row["read_at"]))
+    marks = values(
+        column("id", String),
+        column("read_at", DateTime),
+        name="marks"
+    ).data(list(first_read.items()))
+    return (
+        update(Notification)
+        .where(
+            Notification.id == marks.c.id,
+            Notification.status == NotificationStatus.UNREAD
+        )
+        .values(status=NotificationStatus.READ, read_at=marks.c.read_at)
+        .returning(Notification.user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+def apply_flushed_read_marks(flipped: List[Any]) -> None:
+    """Decrement each owner's unread counter by the rows a flush marked read."""
+    for user_id, count in Counter(user_id for user_id, in flipped).items():
+        UnreadCounter.apply(user_id, -count)
+
+write_coalescer.register("notification_read", coalesced_read_marks, on_flushed=apply_flushed_read_marks)
+
+@event.listens_for(Session, "after_commit")
+def apply_counter_changes(session: Session) -> None:
+    for user_id, amount in session.info.pop(PENDING_COUNTER_CHANGES, []):
+        UnreadCounter.apply(user_id, amount)
+
+@event.listens_for(Session, "after_rollback")
+def discard_counter_changes(session: Session) -> None:
+    session.info.pop(PENDING_COUNTER_CHANGES, None)
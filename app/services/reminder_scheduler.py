@@ -0,0 +1,111 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import redis
+from app.core.cache import redis_client
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ReminderScheduler:
+    """Due-time index of event reminders kept in a Redis sorted set.
+
+    Each pending reminder is one compact member ``<event_id>:<days_before>``
+    scored by the Unix time it becomes due, so memory grows with the number
+    of future reminders rather than with parked Celery tasks. Event writes
+    keep the set current and a single dispatcher pops due members in batches.
+
+    Popped members are leased in a processing set until the dispatcher acks
+    them; a lease that runs out (e.g. the dispatcher died before enqueueing)
+    puts the member back in the due set on the next pop.
+    """
+    key = "reminders:due"
+    processing_key = "reminders:processing"
+    intervals = [7, 3, 1]  # days before the event starts
+
+    _pop_due = (
+        "local expired = redis.call('zrangebyscore', KEYS[2], '-inf', ARGV[1]) "
+        "for _, member in ipairs(expired) do redis.call('zadd', KEYS[1], ARGV[1], member) end "
+        "if #expired > 0 then redis.call('zrem', KEYS[2], unpack(expired)) end "
+        "local members = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2]) "
+        "for _, member in ipairs(members) do redis.call('zadd', KEYS[2], ARGV[3], member) end "
+        "if #members > 0 then redis.call('zrem', KEYS[1], unpack(members)) end "
+        "return members"
+    )
+
+    def __init__(self, client: redis.Redis = redis_client, lease_seconds: int = settings.REMINDER_LEASE_SECONDS):
+        self.client = client
+        self.lease = timedelta(seconds=lease_seconds)
+
+    def schedule_event(self, event_id: str, start_time: datetime, now: Optional[datetime] = None) -> int:
+        """(Re)schedule every future reminder for an event; returns how many are pending."""
+        now = now or datetime.utcnow()
+        due = {
+            self._member(event_id, days): self._score(start_time - timedelta(days=days))
+            for days in self.intervals
+            if start_time - timedelta(days=days) > now
+        }
+        members = [self._member(event_id, days) for days in self.intervals]
+        pipe = self.client.pipeline()
+        pipe.zrem(self.key, *members)
+        pipe.zrem(self.processing_key, *members)
+        if due:
+            pipe.zadd(self.key, due)
+        pipe.execute()
+        return len(due)
+
+    def unschedule_event(self, event_id: str) -> None:
+        """Drop every pending reminder for an event."""
+        members = [self._member(event_id, days) for days in self.intervals]
+        pipe = self.client.pipeline()
+        pipe.zrem(self.key, *members)
+        pipe.zrem(self.processing_key, *members)
+        pipe.execute()
+
+    def pop_due(self, now: Optional[datetime] = None, limit: int = 500) -> List[Tuple[str, int]]:
+        """Atomically lease and return up to ``limit`` due reminders.
+
+        Returns ``(event_id, days_before)`` pairs. Popping is atomic, so several
+        dispatchers can run without sending a reminder twice; callers ``ack``
+        what they enqueued and ``release`` what they could not.
+        """
+        now = now or datetime.utcnow()
+        members = self.client.eval(
+            self._pop_due, 2, self.key, self.processing_key,
+            self._score(now), limit, self._score(now + self.lease)
+        )
+        reminders = []
+        for member in members:
+            event_id, days = member.rsplit(":", 1)
+            reminders.append((event_id, int(days)))
+        return reminders
+
+    def ack(self, reminders: List[Tuple[str, int]]) -> None:
+        """Forget leased reminders once their delivery jobs are enqueued."""
+        if reminders:
+            self.client.zrem(self.processing_key, *[self._member(*reminder) for reminder in reminders])
+
+    def release(self, reminders: List[Tuple[str, int]], now: Optional[datetime] = None) -> None:
+        """Return leased reminders to the due set for the next dispatch."""
+        if not reminders:
+            return
+        members = [self._member(*reminder) for reminder in reminders]
+        pipe = self.client.pipeline()
+        pipe.zrem(self.processing_key, *members)
+        pipe.zadd(self.key, {member: self._score(now or datetime.utcnow()) for member in members})
+        pipe.execute()
+
+    def pending(self) -> int:
+        """Number of reminders waiting to become due."""
+        return self.client.zcard(self.key)
+
+    @staticmethod
+    def _member(event_id: str, days: int) -> str:
+        return f"{event_id}:{days}"
+
+    @staticmethod
+    def _score(when: datetime) -> float:
+        return when.replace(tzinfo=timezone.utc).timestamp()
+
+# Create a singleton instance
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,137 @@
+from typing import List, Optional, Tuple, Any
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_, literal
+from app.core.search import SEARCH_CONFIG
+from app.models.event import Event, EventStatus
+from app.services.event import EventService
+import logging
+
+logger = logging.getLogger(__name__)
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class EventSearchService:
+    """Ranked, keyset-paginated event search.
+
+    ``query`` is matched against the trigger-maintained ``search_vector``
+    (title, location, description) and ``title`` against the trigram index,
+    so substring and misspelt titles both match. Results are ranked when
+    either is given and ordered by start time otherwise. Visibility is the
+    same criterion ``EventService.list_events`` uses, applied in the same
+    statement.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(
+        self,
+        user_id: str,
+        query: Optional[str] = None,
+        title: Optional[str] = None,
+        location: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: Optional[EventStatus] = None,
+        is_private: Optional[bool] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Event, Optional[float]]], Optional[str]]:
+        """Search visible events.
+
+        Returns ``(event, rank)`` pairs for the page and the cursor for the
+        next page (``None`` when there are no more results).
+        """
+        criteria = self.filters(
+            user_id,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            status=status,
+            is_private=is_private
+        )
+        text_criteria, rank = self.text_match(query, title)
+        criteria.extend(text_criteria)
+
+        if rank is None:
+            sort_key, sort_order = Event.start_time, Event.start_time.asc()
+        else:
+            sort_key, sort_order = rank, rank.desc()
+        if cursor:
+            value, last_id = self.decode_cursor(cursor, ranked=rank is not None)
+            after = sort_key < value if rank is not None else sort_key > value
+            criteria.append(or_(after, and_(sort_key == value, Event.id > last_id)))
+
+        stmt = (
+            select(Event, (rank if rank is not None else literal(None)).label("rank"))
+            .where(*criteria)
+            .order_by(sort_order, Event.id.asc())
+            .limit(limit + 1)
+        )
+        result = await self.session.execute(stmt)
+        rows = [(event, event_rank) for event, event_rank in result.all()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            event, event_rank = rows[-1]
+            next_cursor = self.encode_cursor(event_rank if rank is not None else event.start_time, event.id)
+        return rows, next_cursor
+
+    @staticmethod
+    def text_match(query: Optional[str], title: Optional[str]) -> Tuple[List[Any], Any]:
+        """Full-text and fuzzy title criteria, with their rank expression (``None`` if neither)."""
+        criteria, rank = [], None
+        if query:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            criteria.append(Event.search_vector.op("@@")(ts_query))
+            rank = func.ts_rank_cd(Event.search_vector, ts_query)
+        if title:
+            criteria.append(or_(
+                Event.title.ilike(f"%{escape_like(title)}%", escape="\\"),
+                Event.title.op("%")(title)
+            ))
+            similarity = func.similarity(Event.title, title)
+            rank = similarity if rank is None else rank + similarity
+        return criteria, rank
+
+    @staticmethod
+    def filters(
+        user_id: str,
+        location: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: Optional[EventStatus] = None,
+        is_private: Optional[bool] = None
+    ) -> List[Any]:
+        """Structured filters shared by search and facet queries."""
+        criteria = [Event.is_active == True, EventService.visibility_filter(user_id)]
+        if location:
+            criteria.append(Event.location == location)
+        if start_date:
+            criteria.append(Event.start_time >= start_date)
+        if end_date:
+            criteria.append(Event.start_time <= end_date)
+        if status:
+            criteria.append(Event.status == status)
+        if is_private is not None:
+            criteria.append(Event.is_private == is_private)
+        return criteria
+
+    @staticmethod
+    def encode_cursor(value: Any, id: str) -> str:
+        """Encode a keyset position (rank or start time, id) as an opaque cursor."""
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return f"{value}|{id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str, ranked: bool) -> Tuple[Any, str]:
+        """Decode a cursor produced by ``encode_cursor`` for the same search."""
+        try:
+            value, id = cursor.split("|", 1)
+            return (float(value) if ranked else datetime.fromisoformat(value)), id
+        except ValueError:
+            raise ValueError("Invalid search cursor")
@@ -0,0 +1,79 @@
+from typing import List, Dict, Any
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert
+from app.models.audit_log import AuditLog
+from app.models.event_share import EventShare
+from app.services.event_access import EventAccessService
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ShareExpiryService:
+    """Revokes expired event shares in batches.
+
+    Permission checks do not look at ``expires_at``; instead the sweeper
+    deletes expired shares shortly after they lapse, using the partial
+    ``ix_event_share_expiring`` index so only shares that can expire are
+    scanned. Revocations are journaled as ``delete_event_share``, the same
+    operation ``EventService.delete_event_share`` records.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def revoke_expired(self, now: datetime, limit: int) -> int:
+        """Delete up to ``limit`` shares expired at ``now``; returns how many."""
+        expired = (
+            select(EventShare.id)
+            .where(EventShare.expires_at != None, EventShare.expires_at <= now)
+            .order_by(EventShare.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(EventShare)
+            .where(EventShare.id.in_(expired.scalar_subquery()))
+            .returning(
+                EventShare.event_id,
+                EventShare.shared_by_id,
+                EventShare.shared_with_id,
+                EventShare.permission,
+                EventShare.expires_at
+            )
+        )
+        revoked = [row._mapping for row in result.all()]
+        if not revoked:
+            return 0
+
+        await self._drop_access(revoked)
+        await self.session.execute(insert(AuditLog).values(self._audit_rows(revoked, now)))
+        logger.info(f"Revoked {len(revoked)} expired event shares")
+        return len(revoked)
+
+    async def _drop_access(self, revoked: List[Dict[str, Any]]) -> None:
+        """Recompute materialised access for the users and events that lost a share.
+
+        A remaining share may grant a weaker permission, and owner rows stay.
+        """
+        pairs = {(share["shared_with_id"], share["event_id"]) for share in revoked}
+        await EventAccessService(self.session).rebuild(pairs=sorted(pairs))
+
+    @staticmethod
+    def _audit_rows(revoked: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+        return [
+            {
+                "user_id": share["shared_by_id"],
+                "action": "delete_event_share",
+                "entity_type": "event",
+                "entity_id": share["event_id"],
+                "timestamp": now,
+                "details": {
+                    "shared_with_id": share["shared_with_id"],
+                    "permission": share["permission"].value if share["permission"] else None,
+                    "expires_at": share["expires_at"].isoformat(),
+                    "reason": "expired"
+                }
+            }
+            for share in revoked
+        ]
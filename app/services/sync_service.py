@@ -1,11 +1,13 @@
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, values, column, func, String, DateTime
 from app.models.sync_state import SyncState
 from app.models.audit_log import AuditLog
+from app.core.config import settings
 from app.core.security import generate_sync_token
 from app.core.exceptions import SyncError
+from app.core.write_buffer import write_coalescer
 
 class SyncService:
     def __init__(self, db: AsyncSession):
@@ -46,21 +48,30 @@ class SyncService:
     ) -> Tuple[List[Dict[str, Any]], str]:
         """Get changes since last sync."""
         sync_state = await self.get_sync_state(user_id, client_id, entity_type)
+        # Pages follow the journal sequence, so rows sharing a timestamp are
+        # never skipped. Sequence numbers are drawn at INSERT, so a page only
+        # reaches rows inserted at least SYNC_JOURNAL_LAG_SECONDS ago: any
+        # lower number drawn before them has committed (or rolled back) by then.
+        # No timestamp bound: acknowledgements move last_sync_timestamp to the
+        # wall clock, which says nothing about what was actually delivered.
+        horizon = func.timezone("utc", func.now()) - timedelta(seconds=settings.SYNC_JOURNAL_LAG_SECONDS)
         result = await self.db.execute(
             select(AuditLog)
             .where(
                 AuditLog.user_id == user_id,
                 AuditLog.entity_type == entity_type,
-                AuditLog.timestamp > sync_state.last_sync_timestamp
+                AuditLog.sequence > sync_state.last_sync_sequence,
+                AuditLog.created_at <= horizon
             )
-            .order_by(AuditLog.timestamp.asc())
+            .order_by(AuditLog.sequence.asc())
             .limit(limit)
         )
         changes = result.scalars().all()
 
         # Update sync state
         if changes:
-            sync_state.last_sync_timestamp = changes[-1].timestamp
+            sync_state.last_sync_sequence = changes[-1].sequence
+            sync_state.last_sync_timestamp = max(change.timestamp for change in changes)
             sync_state.last_sync_version += 1
             sync_state.sync_token = generate_sync_token()
             await self.db.commit()
@@ -80,7 +91,12 @@ class SyncService:
         if sync_state.sync_token != sync_token:
             raise SyncError("Invalid sync token")
 
-        sync_state.last_sync_timestamp = datetime.utcnow()
+        now = datetime.utcnow()
+        if settings.WRITE_COALESCING_ENABLED:
+            # Durable on return, but the commit is shared with concurrent acknowledgements
+            await write_coalescer.submit("sync_ack", {"id": sync_state.id, "last_sync_timestamp": now})
+            return
+        sync_state.last_sync_timestamp = now
         await self.db.commit()
 
     async def reset_sync_state(
@@ -92,7 +108,30 @@ class SyncService:
         """Reset sync state for a client."""
         sync_state = await self.get_sync_state(user_id, client_id, entity_type)
         sync_state.last_sync_version = 0
+        # Start from the journal's current end rather than replaying history
+        sync_state.last_sync_sequence = await self.db.scalar(
+            select(func.coalesce(func.max(AuditLog.sequence), 0))
+        )
         sync_state.last_sync_timestamp = datetime.utcnow()
         sync_state.sync_token = generate_sync_token()
         await self.db.commit()
-        return sync_state 
\ No newline at end of file
+        return sync_state 
+
+def coalesced_sync_acks(rows: List[Dict[str, Any]]):
+    """One UPDATE ... FROM (VALUES ...) for a group of queued acknowledgements."""
+    latest: Dict[str, datetime] = {}
+    for row in rows:
+        latest[row["id"]] = max(row["last_sync_timestamp"], latest.get(row["id"], row["last_sync_timestamp"]))
+    acks = values(
+        column("id", String),
+        column("last_sync_timestamp", DateTime),
+        name="acks"
+    ).data(list(latest.items()))
+    return (
+        update(SyncState)
+        .where(SyncState.id == acks.c.id)
+        .values(last_sync_timestamp=acks.c.last_sync_timestamp)
+        .execution_options(synchronize_session=False)
+    )
+
+write_coalescer.register("sync_ack", coalesced_sync_acks)
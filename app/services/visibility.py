@@ -0,0 +1,83 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import select, union_all, tuple_, Select
+from app.models.event import Event, EventStatus
+from app.models.event_share import EventShare
+
+Keyset = Tuple[datetime, str]  # (start_time, id) of the last row seen
+
+def visibility_branches(
+    user_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[EventStatus] = None,
+    after: Optional[Keyset] = None,
+    limit: Optional[int] = None
+) -> List[Select]:
+    """The three disjoint ways an event can be visible, as ``(id, start_time)`` selects.
+
+    Each branch is a plain conjunction that one index can serve: public
+    events by time (``ix_events_date_range``), the user's own private events
+    (``ix_events_creator_time``) and private events shared with them
+    (``ix_event_share_recipient``). With a ``limit`` each branch stops after
+    that many rows in keyset order, so the union never reads more than
+    ``3 * limit`` rows.
+    """
+    criteria = []
+    if start_date:
+        criteria.append(Event.start_time >= start_date)
+    if end_date:
+        criteria.append(Event.end_time <= end_date)
+    if status:
+        criteria.append(Event.status == status)
+    if after:
+        criteria.append(tuple_(Event.start_time, Event.id) > tuple_(*after))
+
+    columns = (Event.id, Event.start_time)
+    branches = [
+        select(*columns).where(Event.is_private == False, *criteria),
+        select(*columns).where(Event.is_private == True, Event.created_by == user_id, *criteria),
+        # Driven from the recipient's shares; distinct guards against duplicate share rows
+        select(*columns)
+        .select_from(EventShare)
+        .join(Event, Event.id == EventShare.event_id)
+        .where(
+            EventShare.shared_with_id == user_id,
+            Event.is_private == True,
+            Event.created_by != user_id,
+            *criteria
+        )
+        .distinct(),
+    ]
+    selects = []
+    for stmt in branches:
+        if limit is not None:
+            stmt = stmt.order_by(Event.start_time, Event.id).limit(limit)
+        selects.append(stmt)
+    return selects
+
+def visible_events(
+    user_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[EventStatus] = None,
+    after: Optional[Keyset] = None,
+    limit: Optional[int] = None
+) -> Select:
+    """Events visible to a user, in ``(start_time, id)`` order.
+
+    Replaces ``public OR own OR id IN (shares)``, which no single index
+    can serve, with a ``UNION ALL`` of index-friendly branches merged by
+    keyset.
+    """
+    branches = visibility_branches(user_id, start_date, end_date, status, after, limit)
+    # Parenthesise limited branches so each keeps its own ORDER BY/LIMIT
+    visible = union_all(*[branch.subquery().select() if limit is not None else branch for branch in branches]).subquery("visible")
+    stmt = (
+        select(Event)
+        .join(visible, Event.id == visible.c.id)
+        .order_by(visible.c.start_time, visible.c.id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
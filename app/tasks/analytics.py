@@ -1,9 +1,15 @@
 from datetime import datetime, timedelta
 from typing import Dict, List
+import asyncio
+from sqlalchemy import select
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.core.models import UserRole
 from app.models.event import Event, EventStatus
 from app.models.user import User
 from app.core.email import send_email
+from app.services.analytics import AnalyticsService, analytics_changes
 
 @celery_app.task(name="generate_event_report")
 def generate_event_report(event_id: str, report_type: str = "summary") -> Dict:
@@ -36,67 +42,68 @@ def generate_event_report(event_id: str, report_type: str = "summary") -> Dict:
 
     return report_data
 
-@celery_app.task(name="generate_weekly_report")
-def generate_weekly_report(organization_id: str) -> None:
-    """Generate a weekly report for all events in an organization."""
-    now = datetime.utcnow()
-    week_ago = now - timedelta(days=7)
-    
-    # Get all events in the past week
-    events = Event.query.filter(
-        Event.organization_id == organization_id,
-        Event.start_time >= week_ago,
-        Event.start_time <= now
-    ).all()
-
-    report_data = {
-        "period": f"{week_ago.date()} to {now.date()}",
-        "total_events": len(events),
-        "events": []
-    }
-
-    for event in events:
-        event_data = {
-            "id": event.id,
-            "title": event.title,
-            "start_time": event.start_time.isoformat(),
-            "end_time": event.end_time.isoformat(),
-            "participants": len(event.participants),
-            "status": event.status.value
-        }
-        report_data["events"].append(event_data)
-
-    # Send report to organization admins
-    admins = User.query.filter(
-        User.organization_id == organization_id,
-        User.role == "admin"
-    ).all()
+async def _generate_weekly_report(start: datetime, end: datetime) -> Dict:
+    async with get_db_context() as session:
+        report_data = await AnalyticsService(session).get_summary(start, end)
+        result = await session.execute(
+            select(User.email).where(User.role == UserRole.ADMIN, User.is_active == True)
+        )
+        admin_emails = result.scalars().all()
 
-    for admin in admins:
-        send_email(
-            email_to=admin.email,
+    for email in admin_emails:
+        await send_email(
+            email_to=email,
             subject="Weekly Event Report",
             template_name="weekly_report.html",
             template_data=report_data
         )
+    return report_data
+
+@celery_app.task(name="generate_weekly_report")
+def generate_weekly_report() -> Dict:
+    """Email the past week's event summary to admins.
+
+    Reads the daily rollups, so the cost depends on the number of days and
+    creators in the period, not on the number of events.
+    """
+    end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    return asyncio.run(_generate_weekly_report(end - timedelta(days=7), end))
+
+async def _apply_analytics_changes(event_ids: List[str]) -> int:
+    async with get_db_context() as session:
+        return await AnalyticsService(session).apply_changes(event_ids)
+
+@celery_app.task(name="consume_analytics_changes")
+def consume_analytics_changes() -> int:
+    """Fold events changed since the last run into the analytics rollups."""
+    processed = 0
+    # Refold what an interrupted run had taken but never committed
+    analytics_changes.recover()
+    while True:
+        event_ids = analytics_changes.pop(settings.ANALYTICS_BATCH_SIZE)
+        if not event_ids:
+            break
+        try:
+            asyncio.run(_apply_analytics_changes(event_ids))
+        except Exception:
+            # Put the batch back so the next run retries it
+            analytics_changes.release(event_ids)
+            raise
+        analytics_changes.ack(event_ids)
+        processed += len(event_ids)
+        if len(event_ids) < settings.ANALYTICS_BATCH_SIZE:
+            break
+    return processed
 
-@celery_app.task(name="track_event_metrics")
-def track_event_metrics() -> None:
-    """Track and update event metrics for analytics."""
-    now = datetime.utcnow()
-    active_events = Event.query.filter(
-        Event.is_active == True,
-        Event.start_time <= now,
-        Event.end_time >= now
-    ).all()
+async def _all_event_ids() -> List[str]:
+    async with get_db_context() as session:
+        result = await session.execute(select(Event.id))
+        return list(result.scalars().all())
 
-    for event in active_events:
-        metrics = {
-            "current_participants": len(event.participants),
-            "check_in_rate": event.calculate_check_in_rate(),
-            "resource_usage": event.get_resource_usage(),
-            "last_updated": now.isoformat()
-        }
-        
-        # Update event metrics in the database
-        event.update_metrics(metrics) 
\ No newline at end of file
+@celery_app.task(name="backfill_analytics_rollups")
+def backfill_analytics_rollups() -> int:
+    """Queue every event for folding, e.g. after the rollup tables are created."""
+    event_ids = asyncio.run(_all_event_ids())
+    for i in range(0, len(event_ids), settings.ANALYTICS_BATCH_SIZE):
+        analytics_changes.mark(*event_ids[i:i + settings.ANALYTICS_BATCH_SIZE])
+    return len(event_ids)
@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+import asyncio
+import logging
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.services.archive import ArchiveService
+
+logger = logging.getLogger(__name__)
+
+async def _archive_cold_history(cutoff: datetime) -> int:
+    archived = 0
+    while True:
+        # One short transaction per batch; the segment files are written
+        # before the hot rows are deleted and the manifest is committed.
+        async with get_db_context() as session:
+            count = await ArchiveService(session).archive_cold_events(cutoff, settings.ARCHIVE_BATCH_SIZE)
+        archived += count
+        if count < settings.ARCHIVE_BATCH_SIZE:
+            break
+    return archived
+
+@celery_app.task(name="archive_cold_history")
+def archive_cold_history() -> int:
+    """Move the history of long-finished, archived events to cold storage."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+    archived = asyncio.run(_archive_cold_history(cutoff))
+    logger.info(f"Archived history of {archived} events")
+    return archived
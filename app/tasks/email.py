@@ -1,30 +1,60 @@
 from typing import List, Dict, Any, Optional
+import asyncio
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.core.celery_app import celery_app
-from app.core.email import send_email
+from app.core.database import get_db_context
+from app.core.email import batch_mailer
 from app.models.event import Event
 from app.models.user import User
 
+async def _load_event(event_id: str) -> Optional[Dict[str, Any]]:
+    """Load an event as template data, or ``None`` if it does not exist."""
+    async with get_db_context() as session:
+        event = await session.scalar(
+            select(Event)
+            .where(Event.id == event_id)
+            .options(selectinload(Event.participants))
+        )
+        return event.to_dict() if event else None
+
+def _send_batch(
+    subject: str,
+    template_name: str,
+    shared_data: Dict[str, Any],
+    recipient_emails: List[str]
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """Run a batch send on an event loop inside the worker process."""
+    event = shared_data["event"]
+    recipients = {email: {"recipient_email": email} for email in recipient_emails}
+    return asyncio.run(
+        batch_mailer.send_batch(
+            subject=subject,
+            template_name=template_name,
+            shared_data=shared_data,
+            recipients=recipients,
+            # Event fragments are reused until the event changes version
+            cache_key=f"{event.get('id')}:{event.get('current_version')}"
+        )
+    )
+
 @celery_app.task(name="send_event_invitation")
 def send_event_invitation(
     event_id: str,
     recipient_emails: List[str],
     template_name: str = "event_invitation.html"
-) -> None:
+) -> Optional[Dict[str, Dict[str, Optional[str]]]]:
     """Send event invitation emails to multiple recipients."""
-    event = Event.get(event_id)
+    event = asyncio.run(_load_event(event_id))
     if not event:
         return
-    
-    for email in recipient_emails:
-        send_email(
-            email_to=email,
-            subject=f"Invitation: {event.title}",
-            template_name=template_name,
-            template_data={
-                "event": event.to_dict(),
-                "recipient_email": email
-            }
-        )
+
+    return _send_batch(
+        subject=f"Invitation: {event['title']}",
+        template_name=template_name,
+        shared_data={"event": event},
+        recipient_emails=recipient_emails
+    )
 
 @celery_app.task(name="send_event_reminder")
 def send_event_reminder(
@@ -32,23 +62,21 @@ def send_event_reminder(
     recipient_emails: List[str],
     days_before: int,
     template_name: str = "event_reminder.html"
-) -> None:
+) -> Optional[Dict[str, Dict[str, Optional[str]]]]:
     """Send event reminder emails to participants."""
-    event = Event.get(event_id)
+    event = asyncio.run(_load_event(event_id))
     if not event:
         return
-    
-    for email in recipient_emails:
-        send_email(
-            email_to=email,
-            subject=f"Reminder: {event.title} in {days_before} days",
-            template_name=template_name,
-            template_data={
-                "event": event.to_dict(),
-                "days_before": days_before,
-                "recipient_email": email
-            }
-        )
+
+    return _send_batch(
+        subject=f"Reminder: {event['title']} in {days_before} days",
+        template_name=template_name,
+        shared_data={
+            "event": event,
+            "days_before": days_before
+        },
+        recipient_emails=recipient_emails
+    )
 
 @celery_app.task(name="send_event_update")
 def send_event_update(
@@ -57,21 +85,19 @@ def send_event_update(
     update_type: str,
     changes: dict,
     template_name: str = "event_update.html"
-) -> None:
+) -> Optional[Dict[str, Dict[str, Optional[str]]]]:
     """Send event update notifications to participants."""
-    event = Event.get(event_id)
+    event = asyncio.run(_load_event(event_id))
     if not event:
         return
-    
-    for email in recipient_emails:
-        send_email(
-            email_to=email,
-            subject=f"Update: {event.title}",
-            template_name=template_name,
-            template_data={
-                "event": event.to_dict(),
-                "update_type": update_type,
-                "changes": changes,
-                "recipient_email": email
-            }
-        ) 
\ No newline at end of file
+
+    return _send_batch(
+        subject=f"Update: {event['title']}",
+        template_name=template_name,
+        shared_data={
+            "event": event,
+            "update_type": update_type,
+            "changes": changes
+        },
+        recipient_emails=recipient_emails
+    )
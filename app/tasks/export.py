@@ -0,0 +1,14 @@
+from typing import Dict, List, Optional
+import asyncio
+import logging
+from app.core.celery_app import celery_app
+from app.services.export import ParquetExporter
+
+logger = logging.getLogger(__name__)
+
+@celery_app.task(name="export_analytics_parquet")
+def export_analytics_parquet(tables: Optional[List[str]] = None, full: bool = False) -> Dict[str, Optional[str]]:
+    """Export events, participations and audit logs changed since the last run to Parquet."""
+    files = asyncio.run(ParquetExporter().export_all(tables, full=full))
+    logger.info(f"Parquet export finished: {files}")
+    return files
@@ -0,0 +1,89 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+from app.core.celery_app import celery_app
+from app.core.database import get_db_context
+from sqlalchemy import select
+from app.core.cache import facet_cache
+from app.core.config import settings
+from app.core.partitioning import ensure_partitions, drop_expired_partitions
+from app.models.user import User
+from app.services.event_access import EventAccessService
+from app.services.facets import EventFacetService
+from app.services.share_expiry import ShareExpiryService
+
+logger = logging.getLogger(__name__)
+
+async def _maintain_partitions() -> Dict[str, List[str]]:
+    async with get_db_context() as session:
+        connection = await session.connection()
+        created = await connection.run_sync(ensure_partitions)
+        dropped = await connection.run_sync(drop_expired_partitions)
+    return {"created": created, "dropped": dropped}
+
+@celery_app.task(name="maintain_partitions")
+def maintain_partitions() -> Dict[str, List[str]]:
+    """Premake future monthly partitions and drop those past retention."""
+    return asyncio.run(_maintain_partitions())
+
+async def _refresh_event_facets() -> bool:
+    if not facet_cache.take_stale():
+        return False
+    async with get_db_context() as session:
+        await EventFacetService(session).refresh_view()
+    facet_cache.invalidate()
+    return True
+
+@celery_app.task(name="refresh_event_facets")
+def refresh_event_facets() -> bool:
+    """Refresh the materialised facet counts if events changed since the last run."""
+    try:
+        return asyncio.run(_refresh_event_facets())
+    except Exception:
+        # Try again next run
+        facet_cache.mark_stale()
+        raise
+
+async def _rebuild_event_access() -> Dict[str, int]:
+    totals = {"users": 0, "upserted": 0, "deleted": 0}
+    last_id: Optional[str] = None
+    while True:
+        # One transaction per batch of users, walking user ids in order
+        async with get_db_context() as session:
+            stmt = select(User.id).order_by(User.id).limit(settings.EVENT_ACCESS_REBUILD_BATCH)
+            if last_id is not None:
+                stmt = stmt.where(User.id > last_id)
+            user_ids = (await session.execute(stmt)).scalars().all()
+            if not user_ids:
+                break
+            upserted, deleted = await EventAccessService(session).rebuild(user_ids)
+        totals["users"] += len(user_ids)
+        totals["upserted"] += upserted
+        totals["deleted"] += deleted
+        last_id = user_ids[-1]
+    return totals
+
+@celery_app.task(name="rebuild_event_access")
+def rebuild_event_access() -> Dict[str, int]:
+    """Repair drift between the event access table and events/shares."""
+    if not settings.EVENT_ACCESS_TABLE_ENABLED:
+        return {"users": 0, "upserted": 0, "deleted": 0}
+    totals = asyncio.run(_rebuild_event_access())
+    logger.info(f"Rebuilt event access: {totals}")
+    return totals
+
+async def _sweep_expired_shares(now: datetime) -> int:
+    revoked = 0
+    while True:
+        async with get_db_context() as session:
+            count = await ShareExpiryService(session).revoke_expired(now, settings.SHARE_EXPIRY_BATCH_SIZE)
+        revoked += count
+        if count < settings.SHARE_EXPIRY_BATCH_SIZE:
+            break
+    return revoked
+
+@celery_app.task(name="sweep_expired_shares")
+def sweep_expired_shares() -> int:
+    """Revoke event shares whose expiry has passed."""
+    return asyncio.run(_sweep_expired_shares(datetime.utcnow()))
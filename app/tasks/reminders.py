@@ -1,50 +1,199 @@
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.celery_app import celery_app
-from app.models.event import Event, EventStatus
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.models.event import Event, EventParticipant, EventStatus
+from app.models.reminder import ReminderLedger
+from app.models.user import User
+from app.services.reminder_scheduler import reminder_scheduler
 from app.tasks.email import send_event_reminder
 
+logger = logging.getLogger(__name__)
+
 @celery_app.task(name="schedule_event_reminders")
 def schedule_event_reminders(event_id: str) -> None:
-    """Schedule reminder emails for an event at different intervals."""
+    """Schedule reminder emails for an event at different intervals.
+
+    Reminders are recorded in the due-time index and sent by
+    ``dispatch_due_reminders`` instead of being parked as ETA tasks.
+    """
     event = Event.get(event_id)
     if not event:
         return
 
-    # Get all participant emails
-    participant_emails = [p.email for p in event.participants]
-    
-    # Schedule reminders at different intervals
-    reminder_intervals = [7, 3, 1]  # 7 days, 3 days, and 1 day before
-    
-    for days in reminder_intervals:
-        reminder_date = event.start_time - timedelta(days=days)
-        if reminder_date > datetime.utcnow():
-            send_event_reminder.apply_async(
-                args=[event_id, participant_emails, days],
-                eta=reminder_date
-            )
+    reminder_scheduler.schedule_event(event.id, event.start_time)
 
-@celery_app.task(name="check_upcoming_events")
-def check_upcoming_events() -> None:
-    """Check for events starting in the next 24 hours and send immediate reminders."""
+STARTING_SOON = "starting_soon"
+
+def _reminder_kind(days_before: int) -> str:
+    return STARTING_SOON if days_before == 0 else f"days_before_{days_before}"
+
+async def _claim_reminder_recipients(session: AsyncSession, kind: str, *criteria) -> Dict[str, List[str]]:
+    """Claim unsent reminders of one kind and return recipient emails per event.
+
+    Participants that already have a ledger row for ``kind`` are excluded with
+    an anti-join, and the remaining ones are claimed by inserting ledger rows.
+    Concurrent dispatchers lose the insert race on the unique key, so every
+    participant is reminded at most once per event and kind. A claim whose
+    delivery fails is deleted again by ``deliver_event_reminder``.
+    """
     now = datetime.utcnow()
-    tomorrow = now + timedelta(days=1)
-    
-    # Find events starting in the next 24 hours
-    upcoming_events = Event.query.filter(
-        Event.start_time >= now,
-        Event.start_time <= tomorrow,
-        Event.is_active == True
-    ).all()
-    
-    for event in upcoming_events:
-        participant_emails = [p.email for p in event.participants]
-        send_event_reminder.delay(
-            event_id=event.id,
-            recipient_emails=participant_emails,
-            days_before=0  # Immediate reminder
+    already_sent = (
+        select(ReminderLedger.id)
+        .where(
+            ReminderLedger.event_id == EventParticipant.event_id,
+            ReminderLedger.user_id == EventParticipant.user_id,
+            ReminderLedger.reminder_kind == kind
+        )
+        .exists()
+    )
+    result = await session.execute(
+        select(EventParticipant.event_id, EventParticipant.user_id, User.email)
+        .join(User, User.id == EventParticipant.user_id)
+        .join(Event, Event.id == EventParticipant.event_id)
+        .where(
+            Event.is_active == True,
+            Event.status != EventStatus.CANCELLED,
+            Event.start_time > now,
+            ~already_sent,
+            *criteria
         )
+    )
+    pending = result.all()
+    if not pending:
+        return {}
+
+    # A multi-row VALUES carries four parameters per row; asyncpg allows 32767
+    claimed_keys = set()
+    chunk = settings.REMINDER_CLAIM_CHUNK
+    for i in range(0, len(pending), chunk):
+        claimed = await session.execute(
+            pg_insert(ReminderLedger)
+            .values([
+                {"event_id": event_id, "user_id": user_id, "reminder_kind": kind, "sent_at": now}
+                for event_id, user_id, _ in pending[i:i + chunk]
+            ])
+            .on_conflict_do_nothing(constraint="uix_reminder_ledger")
+            .returning(ReminderLedger.event_id, ReminderLedger.user_id)
+        )
+        claimed_keys.update(claimed.all())
+
+    recipients: Dict[str, List[str]] = {}
+    for event_id, user_id, email in pending:
+        if (event_id, user_id) in claimed_keys:
+            recipients.setdefault(event_id, []).append(email)
+    return recipients
+
+async def _send_reminders(days_before: int, *criteria) -> int:
+    """Claim recipients and enqueue their delivery jobs in one transaction.
+
+    The ledger rows commit only after the jobs are enqueued, so a broker
+    failure rolls the claim back and the reminder can be dispatched again.
+    Later delivery failures are handed back by ``deliver_event_reminder``.
+    """
+    async with get_db_context() as session:
+        recipients = await _claim_reminder_recipients(session, _reminder_kind(days_before), *criteria)
+        return _enqueue_reminders(recipients, days_before)
+
+def _enqueue_reminders(recipients: Dict[str, List[str]], days_before: int) -> int:
+    """Enqueue delivery jobs of bounded size; returns the number of jobs."""
+    jobs = 0
+    chunk = settings.REMINDER_RECIPIENT_CHUNK
+    for event_id, emails in recipients.items():
+        for i in range(0, len(emails), chunk):
+            deliver_event_reminder.delay(
+                event_id=event_id,
+                recipient_emails=emails[i:i + chunk],
+                days_before=days_before
+            )
+            jobs += 1
+    return jobs
+
+async def _forget_reminders(event_id: str, kind: str, emails: List[str]) -> None:
+    """Delete the ledger claims of recipients whose reminder was not delivered."""
+    async with get_db_context() as session:
+        await session.execute(
+            delete(ReminderLedger).where(
+                ReminderLedger.event_id == event_id,
+                ReminderLedger.reminder_kind == kind,
+                ReminderLedger.user_id.in_(select(User.id).where(User.email.in_(emails)))
+            )
+        )
+
+def _retry_reminders(event_id: str, days_before: int, emails: List[str]) -> None:
+    asyncio.run(_forget_reminders(event_id, _reminder_kind(days_before), emails))
+    if days_before:
+        # Due again now; the next dispatch only reaches the unclaimed recipients.
+        # Starting-soon reminders are picked up by the next check_upcoming_events.
+        reminder_scheduler.release([(event_id, days_before)])
+
+@celery_app.task(name="deliver_event_reminder")
+def deliver_event_reminder(
+    event_id: str,
+    recipient_emails: List[str],
+    days_before: int
+) -> Optional[Dict[str, Dict[str, Optional[str]]]]:
+    """Send one chunk of claimed reminders and hand failed recipients back.
+
+    Recipients the mailer reports as failed, or the whole chunk if sending
+    raises, lose their ledger claim so a later dispatch retries them.
+    """
+    try:
+        results = send_event_reminder(event_id, recipient_emails, days_before)
+    except Exception:
+        _retry_reminders(event_id, days_before, recipient_emails)
+        raise
+    failed = [email for email, result in (results or {}).items() if result["status"] == "failed"]
+    if failed:
+        logger.warning(f"Reminder for event {event_id} failed for {len(failed)} recipients; will retry")
+        _retry_reminders(event_id, days_before, failed)
+    return results
+
+@celery_app.task(name="dispatch_due_reminders")
+def dispatch_due_reminders() -> int:
+    """Pop due reminders in batches and enqueue chunked delivery jobs.
+
+    Each group of reminders is acked once its jobs are enqueued; on an error
+    the groups not yet acked are released back to the due set.
+    """
+    jobs = 0
+    while True:
+        due = reminder_scheduler.pop_due(limit=settings.REMINDER_DISPATCH_BATCH)
+        if not due:
+            break
+        events_by_days: Dict[int, List[str]] = {}
+        for event_id, days_before in due:
+            events_by_days.setdefault(days_before, []).append(event_id)
+        pending = list(due)
+        for days_before, event_ids in events_by_days.items():
+            group = [(event_id, days_before) for event_id in event_ids]
+            try:
+                jobs += asyncio.run(_send_reminders(days_before, Event.id.in_(event_ids)))
+            except Exception:
+                # This group and the ones not reached yet go back to the due set
+                reminder_scheduler.release(pending)
+                raise
+            reminder_scheduler.ack(group)
+            pending = [reminder for reminder in pending if reminder[1] != days_before]
+        if len(due) < settings.REMINDER_DISPATCH_BATCH:
+            break
+    return jobs
+
+@celery_app.task(name="check_upcoming_events")
+def check_upcoming_events() -> int:
+    """Send a one-off reminder to participants of events starting in the next 24 hours.
+
+    The ledger makes the task idempotent: each run only reaches participants
+    who have not been reminded yet, e.g. those who joined since the last run.
+    """
+    tomorrow = datetime.utcnow() + timedelta(days=1)
+    return asyncio.run(_send_reminders(0, Event.start_time <= tomorrow))  # Immediate reminder
 
 @celery_app.task(name="check_recurring_events")
 def check_recurring_events() -> None:
@@ -69,22 +218,60 @@ def check_recurring_events() -> None:
     finally:
         db.close()
 
+async def _archive_events_batch(
+    cutoff: datetime,
+    cursor: Optional[Tuple[datetime, str]],
+    limit: int
+) -> List[Tuple[datetime, str]]:
+    """Deactivate one batch of completed events in its own short transaction.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so parallel workers
+    split the backlog instead of blocking on each other. Returns the
+    ``(end_time, id)`` keys of the archived rows.
+    """
+    candidates = (
+        select(Event.id)
+        .where(
+            Event.end_time < cutoff,
+            Event.status == EventStatus.COMPLETED,
+            Event.is_active == True
+        )
+        .order_by(Event.end_time, Event.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if cursor:
+        candidates = candidates.where(tuple_(Event.end_time, Event.id) > tuple_(*cursor))
+
+    async with get_db_context() as session:
+        result = await session.execute(
+            update(Event)
+            .where(Event.id.in_(candidates.scalar_subquery()))
+            .values(is_active=False, updated_at=datetime.utcnow())
+            .returning(Event.end_time, Event.id)
+            .execution_options(synchronize_session=False)
+        )
+        return [tuple(row) for row in result.all()]
+
+async def _archive_old_events(cutoff: datetime, batch_size: int) -> int:
+    archived = 0
+    cursor: Optional[Tuple[datetime, str]] = None
+    while True:
+        keys = await _archive_events_batch(cutoff, cursor, batch_size)
+        if not keys:
+            break
+        archived += len(keys)
+        cursor = max(keys)
+        logger.info(f"Archived {archived} old events so far (cursor {cursor[0].isoformat()}, {cursor[1]})")
+    return archived
+
 @celery_app.task(name="cleanup_old_events")
-def cleanup_old_events() -> None:
-    """Clean up old completed events."""
-    from app.db.session import SessionLocal
-    db = SessionLocal()
-    try:
-        # Archive events completed more than 30 days ago
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        old_events = db.query(Event).filter(
-            Event.end_time < thirty_days_ago,
-            Event.status == EventStatus.COMPLETED
-        ).all()
+def cleanup_old_events() -> int:
+    """Archive completed events that ended more than the retention period ago.
 
-        for event in old_events:
-            event.is_active = False
-        
-        db.commit()
-    finally:
-        db.close() 
\ No newline at end of file
+    Works in batches of ``EVENT_CLEANUP_BATCH_SIZE`` with one transaction per
+    batch, moving a ``(end_time, id)`` cursor forward so the scan never
+    revisits rows. Safe to run concurrently on several workers.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+    return asyncio.run(_archive_old_events(cutoff, settings.EVENT_CLEANUP_BATCH_SIZE))
@@ -16,6 +16,10 @@ from app.core.security.core_security import get_password_hash
 from datetime import datetime, timedelta
 import re
 import uuid
+from itertools import chain
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from app.models.event import Event
 from app.models.user import User, UserRole
 from app.core.security_middleware import setup_middleware
 
@@ -42,6 +46,57 @@ TestingSessionLocal = sessionmaker(
     autoflush=False
 )
 
+def compile_pg(stmt, literal_binds: bool = False) -> str:
+    """Render a statement as PostgreSQL SQL for assertions on its shape."""
+    compile_kwargs = {"literal_binds": True} if literal_binds else {}
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs=compile_kwargs))
+
+def db_result(rows=()) -> MagicMock:
+    """Stand-in for a Result serving ``rows`` through all() and scalars().all()."""
+    result = MagicMock(rowcount=len(rows))
+    result.all.return_value = list(rows)
+    result.scalars.return_value.all.return_value = list(rows)
+    return result
+
+def mock_session(*results) -> MagicMock:
+    """AsyncSession stand-in for unit tests that only inspect statements.
+
+    ``execute`` answers with one ``db_result`` per entry of ``results`` in
+    turn and with empty results after that. Nested transactions hand out
+    ``session.savepoint``.
+    """
+    session = MagicMock()
+    session.info = {}
+    session.execute = AsyncMock(side_effect=chain((db_result(rows) for rows in results), iter(db_result, None)))
+    session.scalar = AsyncMock(return_value=None)
+    session.flush = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.savepoint = MagicMock(commit=AsyncMock(), rollback=AsyncMock())
+    session.begin_nested = AsyncMock(return_value=session.savepoint)
+    return session
+
+def new_user(prefix: str = "guest") -> User:
+    """An unsaved user with unique credentials."""
+    unique_id = uuid.uuid4().hex[:8]
+    return User(
+        id=str(uuid.uuid4()),
+        email=f"{prefix}_{unique_id}@example.com",
+        username=f"{prefix}_{unique_id}",
+        hashed_password=get_password_hash("testpassword")
+    )
+
+def upcoming_event(owner: User, starts_in: timedelta = timedelta(days=1), **fields) -> Event:
+    """An unsaved one-hour event of ``owner``."""
+    start = datetime.utcnow() + starts_in
+    return Event(
+        title=fields.pop("title", "Planning"),
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        created_by=owner.id,
+        **fields
+    )
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
     """Create an instance of the default event loop for each test case."""
@@ -49,6 +104,16 @@ def event_loop() -> Generator:
     yield loop
     loop.close()
 
+@pytest.fixture(autouse=True)
+def restore_event_loop(event_loop) -> Generator:
+    """Reinstall the session loop after sync tests that run Celery tasks.
+
+    Tasks drive async code with ``asyncio.run()``, which clears the current
+    event loop when it returns.
+    """
+    yield
+    asyncio.set_event_loop(event_loop)
+
 @pytest.fixture(scope="session")
 async def test_db():
     # Create test database tables
@@ -75,6 +140,15 @@ async def session(test_db) -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+@pytest.fixture
+async def other_session(test_db) -> AsyncGenerator[AsyncSession, None]:
+    """A session on its own connection, for tests of row locking between transactions."""
+    other_engine = create_async_engine(TEST_DATABASE_URL)
+    async with AsyncSession(other_engine, expire_on_commit=False) as other:
+        yield other
+        await other.rollback()
+    await other_engine.dispose()
+
 @pytest.fixture
 async def db(session) -> AsyncGenerator[AsyncSession, None]:
     """Alias for session fixture."""
@@ -0,0 +1,117 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from app.services.analytics import AnalyticsChangeQueue, rollup_deltas
+from app.tasks.analytics import consume_analytics_changes
+
+fakeredis = pytest.importorskip("fakeredis")
+
+def make_fact(**overrides):
+    fact = {
+        "event_id": "event-1",
+        "created_by": "user-1",
+        "start_time": datetime(2024, 1, 1, 10, 30),
+        "duration_seconds": 3600,
+        "participant_count": 4,
+        "max_participants": 10,
+        "is_cancelled": False,
+    }
+    fact.update(overrides)
+    return fact
+
+def test_new_event_adds_to_hour_and_day_buckets():
+    deltas = rollup_deltas([(None, make_fact())])
+
+    assert set(deltas) == {
+        ("hourly", datetime(2024, 1, 1, 10), "user-1"),
+        ("daily", datetime(2024, 1, 1), "user-1"),
+    }
+    assert deltas[("daily", datetime(2024, 1, 1), "user-1")] == {
+        "event_count": 1,
+        "cancelled_count": 0,
+        "participant_count": 4,
+        "duration_seconds": 3600,
+        "capacity": 10,
+        "capped_participants": 4,
+    }
+
+def test_participant_change_only_touches_changed_measures():
+    deltas = rollup_deltas([(make_fact(), make_fact(participant_count=6))])
+
+    assert deltas[("hourly", datetime(2024, 1, 1, 10), "user-1")] == {
+        "event_count": 0,
+        "cancelled_count": 0,
+        "participant_count": 2,
+        "duration_seconds": 0,
+        "capacity": 0,
+        "capped_participants": 2,
+    }
+
+def test_moved_event_leaves_old_bucket():
+    deltas = rollup_deltas([(make_fact(), make_fact(start_time=datetime(2024, 1, 1, 12)))])
+
+    assert deltas[("hourly", datetime(2024, 1, 1, 10), "user-1")]["event_count"] == -1
+    assert deltas[("hourly", datetime(2024, 1, 1, 12), "user-1")]["event_count"] == 1
+    # Same day, so the daily bucket is unchanged and skipped
+    assert ("daily", datetime(2024, 1, 1), "user-1") not in deltas
+
+def test_deleted_event_is_subtracted():
+    deltas = rollup_deltas([(make_fact(max_participants=None), None)])
+
+    assert deltas[("daily", datetime(2024, 1, 1), "user-1")]["participant_count"] == -4
+    assert deltas[("daily", datetime(2024, 1, 1), "user-1")]["capacity"] == 0
+
+def test_change_queue_deduplicates():
+    queue = AnalyticsChangeQueue(client=fakeredis.FakeRedis(decode_responses=True))
+    queue.mark("event-1", "event-2")
+    queue.mark("event-1")
+
+    assert queue.pending() == 2
+    assert sorted(queue.pop(10)) == ["event-1", "event-2"]
+    assert queue.pop(10) == []
+
+@patch("app.tasks.analytics._apply_analytics_changes")
+def test_failed_batch_is_requeued(mock_apply):
+    queue = AnalyticsChangeQueue(client=fakeredis.FakeRedis(decode_responses=True))
+    queue.mark("event-1")
+
+    async def fail(event_ids):
+        raise RuntimeError("database unavailable")
+    mock_apply.side_effect = fail
+
+    with patch("app.tasks.analytics.analytics_changes", queue):
+        with pytest.raises(RuntimeError):
+            consume_analytics_changes()
+
+    assert queue.pending() == 1
+    assert queue.client.scard(queue.processing_key) == 0
+
+def test_popped_changes_stay_until_acked():
+    """A consumer that dies after popping leaves the ids to the next run."""
+    queue = AnalyticsChangeQueue(client=fakeredis.FakeRedis(decode_responses=True))
+    queue.mark("event-1", "event-2")
+
+    popped = queue.pop(10)
+    queue.mark("event-1")  # changed again while being folded
+
+    assert queue.recover() == 2
+    assert sorted(queue.pop(10)) == ["event-1", "event-2"]
+    queue.ack(["event-1", "event-2"])
+    assert queue.pending() == 0
+    assert sorted(popped) == ["event-1", "event-2"]
+
+@patch("app.tasks.analytics._apply_analytics_changes")
+def test_consumed_batch_is_acked(mock_apply):
+    queue = AnalyticsChangeQueue(client=fakeredis.FakeRedis(decode_responses=True))
+    queue.mark("event-1")
+    queue.client.sadd(queue.processing_key, "event-2")  # left by an interrupted run
+
+    async def apply(event_ids):
+        return len(event_ids)
+    mock_apply.side_effect = apply
+
+    with patch("app.tasks.analytics.analytics_changes", queue):
+        assert consume_analytics_changes() == 2
+
+    assert queue.pending() == 0
+    assert queue.client.scard(queue.processing_key) == 0
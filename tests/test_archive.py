@@ -0,0 +1,105 @@
+import pytest
+import gzip
+import os
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.archive import ArchiveSegment
+from app.models.version import Version
+from app.services.archive import ArchiveService, serialize_row, deserialize_row, write_segment, read_segment
+from app.services.changelog import ChangelogService
+from tests.conftest import upcoming_event
+
+def make_version(number: int) -> Version:
+    return Version(
+        id=f"version-{number}",
+        created_by="user-1",
+        entity_type="event",
+        entity_id="event-1",
+        version_number=number,
+        changes={"title": f"v{number}"},
+        previous_state={"title": f"v{number - 1}"},
+        current_state={"title": f"v{number}"},
+        created_at=datetime(2024, 1, number),
+        updated_at=datetime(2024, 1, number),
+        is_active=True
+    )
+
+def test_row_round_trip():
+    """Archived rows come back as equivalent detached instances."""
+    version = make_version(1)
+    restored = deserialize_row(Version, serialize_row(version))
+
+    assert restored.to_dict() == version.to_dict()
+
+def test_segment_round_trip(tmp_path):
+    path = str(tmp_path / "event" / "ev" / "segment.jsonl.gz")
+    rows = [("versions", serialize_row(make_version(1))), ("versions", serialize_row(make_version(2)))]
+
+    checksum = write_segment(path, rows)
+
+    assert read_segment(path, checksum) == tuple(rows)
+    with gzip.open(path, "rt") as f:
+        assert len(f.readlines()) == 2
+
+def test_corrupt_segment_is_rejected(tmp_path):
+    path = str(tmp_path / "segment.jsonl.gz")
+    write_segment(path, [("versions", serialize_row(make_version(1)))])
+
+    with pytest.raises(ValueError):
+        read_segment(path, "0" * 64)
+
+@pytest.mark.asyncio
+@patch("app.services.changelog.ArchiveService.load_rows", new_callable=AsyncMock)
+async def test_changelog_includes_archived_versions(mock_load_rows, session: AsyncSession):
+    """Archived versions are merged into the changelog in version order."""
+    mock_load_rows.return_value = [make_version(1), make_version(2)]
+    service = ChangelogService(session)
+
+    changelog = await service.get_entity_changelog("event", "event-1")
+
+    assert [entry["version_number"] for entry in changelog] == [1, 2]
+    mock_load_rows.assert_awaited_once_with("event", "event-1", Version)
+
+async def archived_event(session, owner, archive_dir):
+    """A finished event with two versions, archived but not yet committed."""
+    event = upcoming_event(owner, is_active=False)
+    session.add(event)
+    await session.flush()
+    for number in (1, 2):
+        session.add(Version(
+            created_by=owner.id, entity_type="event", entity_id=event.id, version_number=number,
+            changes={"title": f"v{number}"}, current_state={"title": f"v{number}"}
+        ))
+    await session.flush()
+    segment = await ArchiveService(session, archive_dir=archive_dir).archive_event(event.id)
+    return event, segment
+
+async def test_archived_versions_are_read_back(session: AsyncSession, test_admin, tmp_path):
+    """Versions deleted from the hot table are still served from their segment."""
+    event, segment = await archived_event(session, test_admin, str(tmp_path))
+    await session.commit()
+
+    hot = await session.execute(select(Version.id).where(Version.entity_id == event.id))
+    assert hot.scalars().all() == []
+    assert segment.row_counts["versions"] == 2
+    service = ChangelogService(session)
+    service.archive_service.archive_dir = str(tmp_path)
+
+    version = await service._get_version("event", event.id, 2)
+
+    assert version.current_state == {"title": "v2"}
+    assert os.path.exists(tmp_path / segment.path)
+
+async def test_rolled_back_archive_removes_segment(session: AsyncSession, test_admin, tmp_path):
+    """A segment whose manifest row never commits does not stay on disk."""
+    event, segment = await archived_event(session, test_admin, str(tmp_path))
+    path = tmp_path / segment.path
+    assert os.path.exists(path)
+
+    await session.rollback()
+
+    assert not os.path.exists(path)
+    manifest = await session.execute(select(ArchiveSegment.id).where(ArchiveSegment.entity_id == event.id))
+    assert manifest.scalars().all() == []
@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app.models.event import Event, RecurrencePattern
+from app.services.availability import (
+    AvailabilityService,
+    candidate_slots,
+    expand_series,
+    first_common_slot,
+    free_gaps,
+    merge_intervals,
+    off_hours,
+    sweep_free,
+    to_intervals,
+    to_pairs
+)
+
+DAY = datetime(2024, 3, 4)
+
+def at(hour: float) -> datetime:
+    return DAY + timedelta(hours=hour)
+
+def test_merge_intervals_joins_overlapping_and_touching_blocks():
+    intervals = to_intervals([(at(13), at(14)), (at(9), at(10)), (at(9.5), at(11)), (at(11), at(12)), (at(9.25), at(9.75))])
+
+    assert to_pairs(merge_intervals(*intervals)) == [(at(9), at(12)), (at(13), at(14))]
+
+def test_free_gaps_are_clipped_to_window():
+    busy = merge_intervals(*to_intervals([(at(7), at(9)), (at(12), at(13)), (at(16), at(20))]))
+
+    assert to_pairs(free_gaps(busy, at(8), at(17))) == [(at(9), at(12)), (at(13), at(16))]
+    assert to_pairs(free_gaps(to_intervals([]), at(8), at(17))) == [(at(8), at(17))]
+
+def test_first_common_slot_needs_every_calendar_free():
+    calendars = [
+        to_intervals([(at(9), at(10)), (at(11), at(12))]),
+        to_intervals([(at(10), at(10.5))]),
+        to_intervals([]),
+    ]
+
+    assert first_common_slot(calendars, timedelta(minutes=30), at(9), at(17)) == (at(10.5), at(11))
+    assert first_common_slot(calendars, timedelta(hours=1), at(9), at(17)) == (at(12), at(13))
+    assert first_common_slot(calendars, timedelta(hours=6), at(9), at(17)) is None
+
+@patch("app.services.availability.settings.AVAILABILITY_MAX_USERS", 2)
+async def test_load_intervals_rejects_oversized_groups():
+    with pytest.raises(ValueError):
+        await AvailabilityService(None).load_intervals(["a", "b", "c"], at(0), at(24))
+
+def test_sweep_free_treats_back_to_back_meetings_as_busy():
+    calendars = [
+        to_intervals([(at(9), at(10)), (at(10), at(11))]),
+        to_intervals([(at(10.5), at(12))]),
+    ]
+
+    assert to_pairs(sweep_free(calendars, at(8), at(13))) == [(at(8), at(9)), (at(12), at(13))]
+
+def test_candidate_slots_follow_step_grid_and_limit():
+    free = to_intervals([(at(9.25), at(10.5)), (at(14), at(17))])
+
+    slots = candidate_slots(free, timedelta(hours=1), timedelta(minutes=30), limit=3)
+
+    assert slots == [(at(9.5), at(10.5)), (at(14), at(15)), (at(14.5), at(15.5))]
+
+def test_off_hours_blocks_nights_and_weekends():
+    # 2024-03-08 is a Friday
+    friday = datetime(2024, 3, 8)
+    blocked = to_pairs(off_hours(friday, friday + timedelta(days=3), (9, 17), range(5)))
+
+    assert blocked == [(friday, friday + timedelta(hours=9)), (friday + timedelta(hours=17), friday + timedelta(days=3))]
+
+def test_expand_series_only_yields_occurrences_in_window():
+    series = Event(
+        start_time=datetime(2024, 1, 1, 9),
+        end_time=datetime(2024, 1, 1, 10),
+        recurrence_pattern=RecurrencePattern.DAILY,
+        recurrence_interval=1,
+        recurrence_end_date=datetime(2024, 12, 31),
+        recurrence_exceptions=["2024-03-05"]
+    )
+
+    occurrences = expand_series(series, at(0), at(72))
+
+    assert occurrences == [(at(9), at(10)), (at(57), at(58))]
@@ -1,12 +1,17 @@
 import pytest
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+from sqlalchemy import select
 from app.tasks.email import send_event_invitation, send_event_reminder, send_event_update
-from app.tasks.reminders import schedule_event_reminders, check_upcoming_events
-from app.tasks.analytics import generate_event_report, generate_weekly_report, track_event_metrics
-from app.models.event import Event, EventStatus
+from app.tasks.reminders import schedule_event_reminders, check_upcoming_events, cleanup_old_events, _archive_events_batch
+from app.tasks.analytics import generate_event_report, generate_weekly_report
+from app.models.event import Event, EventStatus, RecurrencePattern
 from app.models.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.celery_app import celery_app
+from app.core.email_templates import template_renderer
+from tests.conftest import compile_pg, mock_session, new_user, upcoming_event
 
 @pytest.fixture
 def mock_event():
@@ -40,47 +45,78 @@ def mock_user():
     user.organization_id = "test-org-id"
     return user
 
-@pytest.mark.asyncio
-@patch("app.tasks.email.send_email")
-@patch("app.models.event.Event.get")
-def test_send_event_invitation(session: AsyncSession, mock_get_event, mock_send_email, mock_event):
-    mock_get_event.return_value = mock_event
+@pytest.fixture
+def stored_event():
+    """A fully populated event as the email tasks load it."""
+    event = upcoming_event(new_user("owner"), id="event-1", status=EventStatus.SCHEDULED,
+                           recurrence_pattern=RecurrencePattern.NONE, current_version=2)
+    event.created_at = event.updated_at = datetime(2024, 1, 1)
+    return event
+
+def event_db_context(event):
+    """get_db_context stand-in whose session loads ``event``."""
+    session = mock_session()
+    session.scalar.return_value = event
+
+    @asynccontextmanager
+    async def db_context():
+        yield session
+    return db_context, session
+
+@patch("app.tasks.email.batch_mailer.send_batch", new_callable=AsyncMock)
+def test_send_event_invitation(mock_send_batch, stored_event):
+    db_context, session = event_db_context(stored_event)
     recipient_emails = ["user1@example.com", "user2@example.com"]
-    
-    send_event_invitation(mock_event.id, recipient_emails)
-    
-    assert mock_send_email.call_count == 2
-    mock_send_email.assert_any_call(
-        email_to="user1@example.com",
-        subject=f"Invitation: {mock_event.title}",
+
+    with patch("app.tasks.email.get_db_context", db_context):
+        send_event_invitation(stored_event.id, recipient_emails)
+
+    sql = compile_pg(session.scalar.call_args.args[0])
+    assert "WHERE events.id = " in sql
+    mock_send_batch.assert_awaited_once_with(
+        subject=f"Invitation: {stored_event.title}",
         template_name="event_invitation.html",
-        template_data={
-            "event": mock_event.to_dict(),
-            "recipient_email": "user1@example.com"
-        }
+        shared_data={"event": stored_event.to_dict()},
+        recipients={
+            "user1@example.com": {"recipient_email": "user1@example.com"},
+            "user2@example.com": {"recipient_email": "user2@example.com"}
+        },
+        cache_key="event-1:2"
     )
 
-@pytest.mark.asyncio
-@patch("app.tasks.email.send_email")
-@patch("app.models.event.Event.get")
-def test_send_event_reminder(session: AsyncSession, mock_get_event, mock_send_email, mock_event):
-    mock_get_event.return_value = mock_event
+@patch("app.tasks.email.batch_mailer.send_batch", new_callable=AsyncMock)
+def test_send_event_reminder(mock_send_batch, stored_event):
+    db_context, _ = event_db_context(stored_event)
     recipient_emails = ["user1@example.com"]
     days_before = 1
-    
-    send_event_reminder(mock_event.id, recipient_emails, days_before)
-    
-    mock_send_email.assert_called_once_with(
-        email_to="user1@example.com",
-        subject=f"Reminder: {mock_event.title} in {days_before} days",
+
+    with patch("app.tasks.email.get_db_context", db_context):
+        send_event_reminder(stored_event.id, recipient_emails, days_before)
+
+    mock_send_batch.assert_awaited_once_with(
+        subject=f"Reminder: {stored_event.title} in {days_before} days",
         template_name="event_reminder.html",
-        template_data={
-            "event": mock_event.to_dict(),
-            "days_before": days_before,
-            "recipient_email": "user1@example.com"
-        }
+        shared_data={
+            "event": stored_event.to_dict(),
+            "days_before": days_before
+        },
+        recipients={"user1@example.com": {"recipient_email": "user1@example.com"}},
+        cache_key="event-1:2"
     )
 
+@patch("app.tasks.email.batch_mailer.send_batch", new_callable=AsyncMock)
+def test_send_event_update_for_missing_event_sends_nothing(mock_send_batch):
+    db_context, _ = event_db_context(None)
+
+    with patch("app.tasks.email.get_db_context", db_context):
+        assert send_event_update("gone", ["user1@example.com"], "updated", {"title": "New"}) is None
+
+    mock_send_batch.assert_not_awaited()
+
+def test_task_templates_exist():
+    for template_name in ("event_invitation.html", "event_reminder.html", "event_update.html"):
+        assert template_renderer.get_template(template_name)
+
 @pytest.mark.asyncio
 @patch("app.models.event.Event.get")
 def test_generate_event_report(session: AsyncSession, mock_get_event, mock_event):
@@ -102,37 +138,73 @@ def test_generate_event_report(session: AsyncSession, mock_get_event, mock_event
     assert "feedback" in detailed_report
     assert "resources_used" in detailed_report
 
-@pytest.mark.asyncio
-@patch("app.tasks.analytics.send_email")
-@patch("app.models.user.User.query")
-@patch("app.models.event.Event.query")
-def test_generate_weekly_report(session: AsyncSession, mock_event_query, mock_user_query, mock_send_email, mock_event, mock_user):
-    mock_event_query.filter.return_value.all.return_value = [mock_event]
-    mock_user_query.filter.return_value.all.return_value = [mock_user]
-    
-    generate_weekly_report("test-org-id")
-    
-    mock_send_email.assert_called_once_with(
+@patch("app.tasks.analytics.send_email", new_callable=AsyncMock)
+@patch("app.tasks.analytics.AnalyticsService.get_summary", new_callable=AsyncMock)
+@patch("app.tasks.analytics.get_db_context")
+def test_generate_weekly_report(mock_db_context, mock_get_summary, mock_send_email, mock_user):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [mock_user.email]
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    mock_db_context.return_value.__aenter__.return_value = session
+    mock_get_summary.return_value = {"period": "last week", "totals": {"event_count": 1}}
+
+    report = generate_weekly_report()
+
+    end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    mock_get_summary.assert_awaited_once_with(end - timedelta(days=7), end)
+    mock_send_email.assert_awaited_once_with(
         email_to=mock_user.email,
         subject="Weekly Event Report",
         template_name="weekly_report.html",
-        template_data={
-            "period": f"{datetime.utcnow().date() - timedelta(days=7)} to {datetime.utcnow().date()}",
-            "total_events": 1,
-            "events": [mock_event.to_dict()]
-        }
+        template_data=report
     )
 
-@pytest.mark.asyncio
-@patch("app.models.event.Event.query")
-def test_track_event_metrics(session: AsyncSession, mock_event_query, mock_event):
-    mock_event_query.filter.return_value.all.return_value = [mock_event]
-    
-    track_event_metrics()
-    
-    mock_event.update_metrics.assert_called_once_with({
-        "current_participants": 0,
-        "check_in_rate": 0.75,
-        "resource_usage": {"cpu": 50, "memory": 60},
-        "last_updated": datetime.utcnow().isoformat()
-    }) 
\ No newline at end of file
+@patch("app.tasks.reminders.settings.EVENT_CLEANUP_BATCH_SIZE", 2)
+@patch("app.tasks.reminders._archive_events_batch", new_callable=AsyncMock)
+def test_cleanup_old_events_advances_cursor(mock_archive_batch):
+    first = [(datetime(2024, 1, 1), "a"), (datetime(2024, 1, 2), "b")]
+    second = [(datetime(2024, 1, 3), "c")]
+    mock_archive_batch.side_effect = [first, second, []]
+
+    assert cleanup_old_events() == 3
+
+    cursors = [call.args[1] for call in mock_archive_batch.await_args_list]
+    assert cursors == [None, first[-1], second[-1]]
+    assert all(call.args[2] == 2 for call in mock_archive_batch.await_args_list)
+
+async def test_archive_batches_skip_locked_rows_and_advance_cursor(session: AsyncSession, other_session, test_admin):
+    """Each batch starts after the previous cursor; a row locked elsewhere is left for a later run."""
+    first, locked, last = [
+        upcoming_event(test_admin, starts_in=-timedelta(days=9000 - offset), status=EventStatus.COMPLETED)
+        for offset in range(3)
+    ]
+    session.add_all([first, locked, last])
+    await session.commit()
+    cutoff = datetime.utcnow() - timedelta(days=8000)
+
+    @asynccontextmanager
+    async def test_db_context():
+        yield session
+        await session.commit()
+
+    await other_session.execute(select(Event).where(Event.id == locked.id).with_for_update())
+    with patch("app.tasks.reminders.get_db_context", test_db_context):
+        batch = await _archive_events_batch(cutoff, None, 1)
+        assert [key[1] for key in batch] == [first.id]
+        batch = await _archive_events_batch(cutoff, max(batch), 1)
+        assert [key[1] for key in batch] == [last.id]
+        assert await _archive_events_batch(cutoff, max(batch), 1) == []
+
+        await other_session.rollback()
+        assert [key[1] for key in await _archive_events_batch(cutoff, None, 1)] == [locked.id]
+
+    result = await session.execute(select(Event.is_active).where(Event.id.in_([first.id, locked.id, last.id])))
+    assert result.scalars().all() == [False, False, False]
+
+def test_beat_schedule_uses_registered_task_names():
+    celery_app.loader.import_default_modules()
+
+    unknown = [entry["task"] for entry in celery_app.conf.beat_schedule.values() if entry["task"] not in celery_app.tasks]
+
+    assert unknown == []
@@ -0,0 +1,136 @@
+import pytest
+import socket
+from jinja2 import DictLoader
+from app.core.email import BatchMailer
+from app.core.email_templates import EmailTemplateRenderer
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+class RecordingHandler:
+    """SMTP sink that records sessions and messages."""
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def smtp_sink():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+@pytest.fixture
+def renderer():
+    return EmailTemplateRenderer(DictLoader({
+        "invite.html": "{{ fragments.event_details }}<p>for {{ recipient_email }}</p>",
+        "seats.html": "<p>{{ seats // per_guest }} seats each</p>",
+        "fragments/event_details.html": "<h2>{{ event.title }}</h2>"
+    }))
+
+def make_mailer(controller, renderer, **kwargs) -> BatchMailer:
+    return BatchMailer(
+        hostname=controller.hostname,
+        port=controller.port,
+        username=None,
+        password=None,
+        sender="events@example.com",
+        start_tls=False,
+        renderer=renderer,
+        **kwargs
+    )
+
+@pytest.mark.asyncio
+async def test_batch_reuses_one_session_per_chunk(smtp_sink, renderer):
+    """Each chunk is delivered over a single SMTP session."""
+    controller, handler = smtp_sink
+    mailer = make_mailer(controller, renderer, chunk_size=5, concurrency=2)
+    recipients = {f"user{i}@example.com": {"recipient_email": f"user{i}@example.com"} for i in range(10)}
+
+    results = await mailer.send_batch("Invitation", "invite.html", {"event": {"title": "Party"}}, recipients)
+
+    assert all(result["status"] == "sent" for result in results.values())
+    assert len(results) == 10
+    assert len(handler.messages) == 10
+    assert len(handler.sessions) == 2
+
+@pytest.mark.asyncio
+async def test_batch_renders_per_recipient_variables(smtp_sink, renderer):
+    """Shared data and personal variables are both rendered into each message."""
+    controller, handler = smtp_sink
+    mailer = make_mailer(controller, renderer)
+
+    await mailer.send_batch(
+        "Invitation",
+        "invite.html",
+        {"event": {"title": "Party"}},
+        {"a@example.com": {"recipient_email": "a@example.com"}}
+    )
+
+    body = handler.messages[0].content.decode()
+    assert "<h2>Party</h2><p>for a@example.com</p>" in body
+    assert handler.messages[0].rcpt_tos == ["a@example.com"]
+
+@pytest.mark.asyncio
+async def test_batch_reports_connection_failure_per_recipient(renderer):
+    """Recipients of a chunk that cannot connect are reported as failed."""
+    mailer = BatchMailer(
+        hostname="127.0.0.1",
+        port=free_port(),
+        username=None,
+        password=None,
+        start_tls=False,
+        renderer=renderer
+    )
+
+    results = await mailer.send_batch(
+        "Invitation",
+        "invite.html",
+        {"event": {"title": "Party"}},
+        {"a@example.com": {"recipient_email": "a@example.com"}}
+    )
+
+    assert results["a@example.com"]["status"] == "failed"
+    assert results["a@example.com"]["error"]
+
+@pytest.mark.asyncio
+async def test_fragments_rendered_once_per_cache_key(smtp_sink, renderer):
+    """Shared fragments are rendered once and reused across recipients and batches."""
+    controller, handler = smtp_sink
+    mailer = make_mailer(controller, renderer, chunk_size=2)
+    recipients = {f"user{i}@example.com": {"recipient_email": f"user{i}@example.com"} for i in range(4)}
+
+    await mailer.send_batch("Invitation", "invite.html", {"event": {"title": "Party"}}, recipients, cache_key="e1:1")
+    await mailer.send_batch("Invitation", "invite.html", {"event": {"title": "Party"}}, recipients, cache_key="e1:1")
+
+    assert renderer.fragment_cache.misses == 1
+    assert renderer.fragment_cache.hits == 1
+    assert len(handler.messages) == 8
+
+@pytest.mark.asyncio
+async def test_render_failure_only_fails_that_recipient(smtp_sink, renderer):
+    """A recipient whose context cannot be rendered is reported; the rest of the chunk is sent."""
+    controller, handler = smtp_sink
+    mailer = make_mailer(controller, renderer)
+    recipients = {
+        "a@example.com": {"per_guest": 2},
+        "b@example.com": {"per_guest": 0},
+        "c@example.com": {"per_guest": 5},
+    }
+
+    results = await mailer.send_batch("Seats", "seats.html", {"seats": 10}, recipients)
+
+    assert results["b@example.com"]["status"] == "failed"
+    assert results["b@example.com"]["error"]
+    assert [results[email]["status"] for email in ("a@example.com", "c@example.com")] == ["sent", "sent"]
+    assert len(handler.messages) == 2
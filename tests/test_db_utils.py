@@ -0,0 +1,155 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.core.db_utils import DatabaseUtils
+from app.core.exceptions import ValidationException
+from app.core.load_profiles import load_options
+from app.models.event import Event, EventStatus
+from app.models.notification import Notification, NotificationStatus
+from app.models.sync_state import SyncState
+from app.models.user import User
+from tests.conftest import compile_pg, mock_session
+
+def sync_rows(count: int) -> list:
+    return [
+        {"client_id": f"client-{i}", "user_id": "user-1", "entity_type": "event", "last_sync_version": i}
+        for i in range(count)
+    ]
+
+@pytest.fixture
+async def utils_session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: SyncState.__table__.create(sync_conn))
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+async def test_bulk_create_returns_hydrated_rows_in_chunks(utils_session):
+    created = await DatabaseUtils.bulk_create(utils_session, SyncState, sync_rows(5), chunk_size=2)
+
+    assert sorted(state.last_sync_version for state in created) == [0, 1, 2, 3, 4]
+    assert all(state.id and state.created_at for state in created)
+
+async def test_bulk_create_without_objects_returns_count(utils_session):
+    written = await DatabaseUtils.bulk_create(utils_session, SyncState, sync_rows(7), return_objects=False, chunk_size=3)
+
+    assert written == 7
+    assert await utils_session.scalar(select(func.count()).select_from(SyncState)) == 7
+
+def test_upsert_statement_updates_requested_columns():
+    stmt = DatabaseUtils._insert_statement(SyncState, ["id"], ["last_sync_version"])
+    sql = compile_pg(stmt)
+    assert "ON CONFLICT (id) DO UPDATE SET last_sync_version = excluded.last_sync_version" in sql
+    assert "DO NOTHING" in compile_pg(DatabaseUtils._insert_statement(SyncState, ["id"], None))
+
+async def test_copy_applies_python_defaults():
+    driver = MagicMock(copy_records_to_table=AsyncMock())
+    connection = MagicMock(dialect=postgresql.dialect())
+    connection.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=driver))
+    session = MagicMock(connection=AsyncMock(return_value=connection), commit=AsyncMock())
+
+    assert await DatabaseUtils.bulk_create(session, SyncState, sync_rows(3), return_objects=False, use_copy=True) == 3
+
+    kwargs = driver.copy_records_to_table.call_args.kwargs
+    assert kwargs["columns"][:4] == ["client_id", "user_id", "entity_type", "last_sync_version"]
+    assert {"id", "created_at", "is_active"} <= set(kwargs["columns"])
+    record = dict(zip(kwargs["columns"], kwargs["records"][0]))
+    assert record["id"] and isinstance(record["created_at"], datetime) and record["is_active"] is True
+
+async def test_copy_round_trips_enum_and_json(session, test_user):
+    """Enum and JSON values streamed with COPY read back as written."""
+    rows = [
+        {"user_id": test_user.id, "message": "Moved", "data": {"event_id": "e1", "fields": ["start_time"]},
+         "status": NotificationStatus.READ},
+        {"user_id": test_user.id, "message": "Invited", "data": None},
+    ]
+
+    assert await DatabaseUtils.bulk_create(session, Notification, rows, return_objects=False, use_copy=True) == 2
+
+    result = await session.execute(
+        select(Notification.message, Notification.status, Notification.data)
+        .where(Notification.user_id == test_user.id)
+        .order_by(Notification.message)
+    )
+    assert result.all() == [
+        ("Invited", NotificationStatus.UNREAD, None),
+        ("Moved", NotificationStatus.READ, {"event_id": "e1", "fields": ["start_time"]}),
+    ]
+
+async def test_copy_rejects_upserts():
+    with pytest.raises(ValidationException):
+        await DatabaseUtils.bulk_create(MagicMock(), SyncState, [], return_objects=False, conflict_columns=["id"], use_copy=True)
+
+def test_update_statement_joins_typed_values():
+    stmt = DatabaseUtils._update_statement(Event, "id", ("status", "title"), [
+        {"id": "e1", "status": EventStatus.CANCELLED, "title": "Off"},
+        {"id": "e2", "status": EventStatus.SCHEDULED, "title": "On"},
+    ])
+    sql = compile_pg(stmt)
+    assert sql.startswith("UPDATE events SET")
+    assert "status=CAST(updates.status AS VARCHAR(11))" in sql
+    assert "FROM (VALUES" in sql
+    assert "events.id = CAST(updates.id AS VARCHAR)" in sql
+
+def test_update_statement_keeps_last_item_per_id():
+    stmt = DatabaseUtils._update_statement(Event, "id", ("title",), [
+        {"id": "e1", "title": "First"},
+        {"id": "e2", "title": "Other"},
+        {"id": "e1", "title": "Last"},
+    ])
+    sql = compile_pg(stmt, literal_binds=True)
+    assert "('e1', 'Last'), ('e2', 'Other')" in sql
+    assert "First" not in sql
+
+async def test_bulk_update_groups_items_by_changed_fields():
+    session = mock_session(["e1", "e3"], ["e2"])
+    items = [
+        {"id": "e1", "title": "A"},
+        {"id": "e2", "location": "Room B"},
+        {"id": "e3", "title": "C"},
+        {"id": "e4"},
+    ]
+
+    updated = await DatabaseUtils.bulk_update(session, Event, items, return_objects=False)
+
+    assert updated == ["e1", "e3", "e2"]
+    assert session.execute.await_count == 2
+    assert items[0] == {"id": "e1", "title": "A"}
+    first = compile_pg(session.execute.call_args_list[0].args[0])
+    assert "RETURNING events.id" in first
+    assert "location" not in first.split("FROM")[0]
+
+def compiled_options(model, options) -> str:
+    return compile_pg(select(model).options(*options))
+
+def test_summary_profile_loads_only_listed_columns():
+    sql = compiled_options(Event, load_options(Event, "summary"))
+    assert "events.title" in sql
+    assert "events.description" not in sql
+    assert "recurrence_days" not in sql
+    assert "JOIN" not in sql
+
+def test_wide_columns_load_only_when_requested():
+    sql = compiled_options(Event, load_options(Event, "detail", columns=["recurrence_days"]))
+    assert "events.recurrence_days" in sql
+    assert "events.recurrence_exceptions" not in sql
+    assert 'LEFT OUTER JOIN "user"' in sql
+
+def test_user_detail_does_not_fan_out():
+    sql = compiled_options(User, load_options(User, "detail"))
+    assert "sync_states" in sql
+    assert "notifications" not in sql
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValidationException):
+        load_options(Event, "everything")
+
+def test_load_relationships_keeps_loading_every_relationship():
+    options = DatabaseUtils._query_options(Event, True, None, None)
+    assert len(options) == len(Event.__mapper__.relationships)
+    detail = compiled_options(Event, load_options(Event, "detail"))
+    assert compiled_options(Event, DatabaseUtils._query_options(Event, True, "detail", None)) == detail
@@ -0,0 +1,75 @@
+import pytest
+from jinja2 import DictLoader
+from app.core.email_templates import EmailTemplateRenderer, FragmentCache, template_renderer
+
+@pytest.fixture
+def renderer(tmp_path):
+    return EmailTemplateRenderer(
+        DictLoader({
+            "invite.html": "{{ fragments.event_details }} / {{ name }}",
+            "fragments/event_details.html": "<b>{{ event.title }}</b>"
+        }),
+        bytecode_cache_dir=str(tmp_path / "bytecode"),
+        fragment_cache_size=2
+    )
+
+def test_precompile_compiles_every_template(renderer):
+    """All templates are compiled up front."""
+    assert renderer.precompile() == 2
+
+def test_fragment_is_rendered_once_per_cache_key(renderer):
+    """Recipients sharing a cache key reuse the rendered fragment."""
+    template = renderer.get_template("invite.html")
+    fragments = renderer.fragments({"event": {"title": "Party"}}, cache_key="e1:1")
+
+    first = renderer.render(template, fragments, {"event": {"title": "Party"}}, {"name": "A"})
+    second = renderer.render(template, renderer.fragments({"event": {"title": "Party"}}, "e1:1"), {}, {"name": "B"})
+
+    assert first == "<b>Party</b> / A"
+    assert second == "<b>Party</b> / B"
+    assert renderer.fragment_cache.misses == 1
+    assert renderer.fragment_cache.hits == 1
+
+def test_recipient_data_overrides_shared_data(renderer):
+    """A key present in both contexts takes the recipient's value."""
+    template = renderer.get_template("invite.html")
+    fragments = renderer.fragments({"event": {"title": "Party"}}, cache_key="e1:1")
+
+    html = renderer.render(template, fragments, {"name": "Everyone"}, {"name": "A"})
+
+    assert html == "<b>Party</b> / A"
+
+def test_new_version_renders_fresh_fragment(renderer):
+    """A new event version gets its own cache entry."""
+    renderer.render_fragment("event_details", {"event": {"title": "Old"}}, "e1:1")
+    html = renderer.render_fragment("event_details", {"event": {"title": "New"}}, "e1:2")
+    assert html == "<b>New</b>"
+
+def test_fragment_cache_evicts_least_recently_used():
+    """The cache never grows beyond its size."""
+    cache = FragmentCache(max_size=2)
+    cache.set(("a", "1"), "A")
+    cache.set(("b", "1"), "B")
+    cache.get(("a", "1"))
+    cache.set(("c", "1"), "C")
+
+    assert len(cache) == 2
+    assert cache.get(("b", "1")) is None
+    assert cache.get(("a", "1")) == "A"
+
+@pytest.mark.parametrize("template_name", ["event_invitation.html", "event_reminder.html", "event_update.html"])
+def test_event_templates_render_serialised_events(template_name):
+    """Event dates arrive as ISO strings from to_dict and are formatted by the template."""
+    event = {"title": "Party", "start_time": "2024-05-01T18:30:00", "end_time": "2024-05-01T20:00:00",
+             "location": "Hall", "description": "Bring snacks"}
+    shared = {"event": event, "days_before": 3, "update_type": "rescheduled", "changes": {"start_time": "18:30"}}
+
+    html = template_renderer.render(
+        template_renderer.get_template(template_name),
+        template_renderer.fragments(shared),
+        shared,
+        {"recipient_email": "a@example.com"}
+    )
+
+    assert "May 01, 2024" in html
+    assert "06:30 PM - 08:00 PM" in html
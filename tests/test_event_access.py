@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from app.models.event import Event
+from app.models.event_access import EventAccess
+from app.models.event_share import EventShare, SharePermission
+from app.services.event import EventService
+from app.services.event_access import EventAccessService
+from tests.conftest import compile_pg, mock_session, new_user, upcoming_event
+
+async def shared_event(session, owner):
+    event, guest = upcoming_event(owner), new_user()
+    session.add_all([guest, event])
+    await session.flush()
+    return event, guest
+
+async def test_calendar_reads_one_user_range():
+    session = mock_session()
+
+    await EventAccessService(session).calendar("user-1", datetime(2024, 5, 1), datetime(2024, 6, 1))
+
+    sql = compile_pg(session.execute.call_args.args[0])
+    assert "event_access.user_id = " in sql
+    assert "event_access.start_time >= " in sql
+    assert "events.is_active = true" in sql
+    assert "event_share.expires_at IS NULL OR event_share.expires_at > now()" in sql
+    assert "ORDER BY event_access.start_time" in sql
+
+async def test_rebuild_keeps_strongest_share_and_deletes_drift(session, test_admin):
+    """Rebuild upserts the strongest live permission per user and event and deletes rows nothing backs."""
+    event, guest = await shared_event(session, test_admin)
+    stray, _ = await shared_event(session, test_admin)
+    session.add_all([
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id, permission=SharePermission.VIEW),
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id, permission=SharePermission.MANAGE),
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id, permission=SharePermission.EDIT),
+        EventAccess(user_id=guest.id, event_id=event.id, permission="view", start_time=event.start_time),
+        EventAccess(user_id=guest.id, event_id=stray.id, permission="edit", start_time=stray.start_time)
+    ])
+    await session.commit()
+
+    await EventAccessService(session).rebuild([guest.id])
+    await session.commit()
+
+    access = await session.execute(select(EventAccess.event_id, EventAccess.permission).where(EventAccess.user_id == guest.id))
+    assert dict(access.all()) == {event.id: "manage"}
+
+@patch("app.services.event.settings.EVENT_ACCESS_TABLE_ENABLED", True)
+async def test_share_access_skips_owner_and_expired_shares():
+    service = EventService(mock_session())
+    service.access_service = MagicMock(grant=AsyncMock())
+    event = Event(id="event-1", created_by="owner", start_time=datetime(2024, 5, 1, 9))
+    shares = [
+        EventShare(event_id="event-1", shared_by_id="owner", shared_with_id="user-1", permission=SharePermission.EDIT),
+        EventShare(event_id="event-1", shared_by_id="owner", shared_with_id="owner", permission=SharePermission.VIEW),
+        EventShare(event_id="event-1", shared_by_id="owner", shared_with_id="user-2", permission=SharePermission.VIEW,
+                   expires_at=datetime(2000, 1, 1)),
+    ]
+
+    await service._grant_share_access(shares, event)
+
+    service.access_service.grant.assert_awaited_once_with([
+        {"user_id": "user-1", "event_id": "event-1", "permission": "edit", "start_time": event.start_time}
+    ])
+
+async def test_grant_revoke_and_rebuild_round_trip(session, test_admin):
+    """Rebuild restores revoked rows backed by a live share and drops expired ones."""
+    event, guest = await shared_event(session, test_admin)
+    start = event.start_time
+    share = EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id, permission=SharePermission.EDIT)
+    session.add(share)
+    access = EventAccessService(session)
+    await access.grant([
+        {"user_id": test_admin.id, "event_id": event.id, "permission": "owner", "start_time": start},
+        {"user_id": guest.id, "event_id": event.id, "permission": "edit", "start_time": start}
+    ])
+    await session.commit()
+    window = (start - timedelta(hours=1), start + timedelta(hours=1))
+
+    await access.revoke(event.id, [guest.id])
+    assert await access.calendar(guest.id, *window) == []
+
+    assert await access.rebuild([guest.id, test_admin.id]) == (1, 0)
+    assert [e.id for e in await access.calendar(guest.id, *window)] == [event.id]
+
+    share.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    await session.flush()
+    assert await access.calendar(guest.id, *window) == []
+    assert await access.rebuild([guest.id]) == (0, 1)
+    remaining = await session.execute(select(EventAccess.user_id).where(EventAccess.event_id == event.id))
+    assert remaining.scalars().all() == [test_admin.id]
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from app.services.event import EventService
 from app.models.event import Event, EventStatus, RecurrencePattern
 from app.models.event_share import EventShare, SharePermission
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.reminder import ReminderLedger
 import uuid
 from app.core.security.core_security import get_password_hash
 from app.models.user import User
@@ -146,6 +148,28 @@ async def test_update_event(session: AsyncSession, test_user):
     assert updated_event.title == updates["title"]
     assert updated_event.description == updates["description"]
 
+@pytest.mark.asyncio
+async def test_rescheduling_clears_sent_reminders(session: AsyncSession, test_user):
+    """Moving an event re-arms the reminders already sent for the old time."""
+    service = EventService(session)
+    start = datetime.now() + timedelta(days=3)
+    event, _ = await service.create_event(
+        title="Test Event",
+        start_time=start,
+        end_time=start + timedelta(hours=2),
+        created_by=test_user.id
+    )
+    session.add(ReminderLedger(event_id=event.id, user_id=test_user.id, reminder_kind="days_before_1"))
+    await session.commit()
+
+    await service.update_event(event.id, {"title": "Renamed"}, test_user.id)
+    kept = await session.scalar(select(func.count()).where(ReminderLedger.event_id == event.id))
+    moved = start + timedelta(days=2)
+    await service.update_event(event.id, {"start_time": moved, "end_time": moved + timedelta(hours=2)}, test_user.id)
+    left = await session.scalar(select(func.count()).where(ReminderLedger.event_id == event.id))
+
+    assert (kept, left) == (1, 0)
+
 @pytest.mark.asyncio
 async def test_delete_event(session: AsyncSession, test_user):
     """Test deleting an event."""
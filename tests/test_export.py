@@ -0,0 +1,90 @@
+import pytest
+import os
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from app.models.event import Event, EventStatus
+from app.services.export import EXPORT_SPECS, ParquetExporter, record_batch
+
+@compiles(TSVECTOR, "sqlite")
+def compile_tsvector_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+def make_event(number: int, updated_at: datetime, location: str = "Room A") -> dict:
+    return {
+        "id": f"event-{number}",
+        "title": f"Event {number}",
+        "start_time": datetime(2024, 1, 1, 9),
+        "end_time": datetime(2024, 1, 1, 10),
+        "location": location,
+        "status": EventStatus.SCHEDULED,
+        "is_private": False,
+        "current_version": 1,
+        "created_by": "user-1",
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "is_active": True
+    }
+
+@pytest.fixture
+async def export_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Event.__table__.create(sync_conn))
+    yield engine
+    await engine.dispose()
+
+def test_record_batch_dictionary_encodes_low_cardinality_columns():
+    spec = EXPORT_SPECS["audit_logs"]
+    rows = [
+        ("log-1", "user-1", "create", "event", "event-1", datetime(2024, 1, 1), {"a": 1}, datetime(2024, 1, 1), datetime(2024, 1, 1)),
+        ("log-2", "user-1", "update", "event", "event-1", datetime(2024, 1, 2), None, datetime(2024, 1, 2), datetime(2024, 1, 2)),
+    ]
+
+    batch = record_batch(spec, rows)
+
+    assert batch.num_rows == 2
+    assert batch.schema.field("action").type == batch.schema.field("user_id").type
+    assert batch.column(batch.schema.get_field_index("user_id")).dictionary.to_pylist() == ["user-1"]
+    assert batch.column(batch.schema.get_field_index("details")).to_pylist() == ['{"a": 1}', None]
+
+async def test_incremental_export_follows_watermark(export_engine, tmp_path):
+    now = datetime(2024, 6, 1, 12)
+    async with export_engine.begin() as conn:
+        await conn.execute(Event.__table__.insert(), [
+            make_event(1, now - timedelta(days=2)),
+            make_event(2, now - timedelta(days=1), location="Room B"),
+            make_event(3, now, location="Room B"),  # inside the lag window
+        ])
+    exporter = ParquetExporter(engine=export_engine, export_dir=str(tmp_path), batch_size=1, lag_seconds=60)
+
+    path = await exporter.export_table("events", now=now)
+
+    table = pq.read_table(path)
+    assert table.column("id").to_pylist() == ["event-1", "event-2"]
+    assert table.column("status").to_pylist() == ["scheduled", "scheduled"]
+    assert pq.ParquetFile(path).metadata.num_row_groups == 2
+
+    # Nothing new until the lagging row falls out of the window
+    assert await exporter.export_table("events", now=now) is None
+    path = await exporter.export_table("events", now=now + timedelta(minutes=5))
+    assert pq.read_table(path).column("id").to_pylist() == ["event-3"]
+
+    manifest = exporter.read_manifest("events")
+    assert [entry["rows"] for entry in manifest["files"]] == [2, 1]
+    assert manifest["watermark"] == (now + timedelta(minutes=4)).isoformat()
+
+async def test_full_export_removes_superseded_files(export_engine, tmp_path):
+    now = datetime(2024, 6, 1, 12)
+    async with export_engine.begin() as conn:
+        await conn.execute(Event.__table__.insert(), [make_event(1, now - timedelta(days=2))])
+    exporter = ParquetExporter(engine=export_engine, export_dir=str(tmp_path), lag_seconds=60)
+    old_path = await exporter.export_table("events", now=now)
+
+    new_path = await exporter.export_table("events", full=True, now=now + timedelta(minutes=5))
+
+    assert not os.path.exists(old_path)
+    assert pq.read_table(new_path).column("id").to_pylist() == ["event-1"]
+    assert [entry["file"] for entry in exporter.read_manifest("events")["files"]] == [os.path.basename(new_path)]
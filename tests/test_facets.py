@@ -0,0 +1,67 @@
+import fakeredis
+import redis
+from datetime import datetime
+from unittest.mock import patch
+from app.core.cache import FacetCache
+from app.models.event import EventStatus
+from app.services.event import EventService
+from app.services.facets import EventFacetService, add_counts, empty_facets, facet_list
+from tests.conftest import compile_pg, mock_session
+
+def test_add_counts_splits_grouping_sets():
+    rows = [
+        (3, EventStatus.SCHEDULED, None, None, 4),
+        (5, None, "Room A", None, 3),
+        (5, None, None, None, 1),  # events without a location
+        (6, None, None, datetime(2024, 5, 6), 4),
+    ]
+
+    facets = add_counts(empty_facets(), rows)
+
+    assert facets == {"status": {"scheduled": 4}, "location": {"Room A": 3}, "date": {"2024-05-06": 4}}
+
+def test_facet_list_orders_by_count_then_date():
+    facets = {"status": {"draft": 1, "scheduled": 5}, "location": {}, "date": {"2024-05-13": 2, "2024-05-06": 9}}
+
+    listed = facet_list(facets)
+
+    assert [item["value"] for item in listed["status"]] == ["scheduled", "draft"]
+    assert [item["value"] for item in listed["date"]] == ["2024-05-06", "2024-05-13"]
+
+async def test_unfiltered_counts_use_cached_view_plus_private_events():
+    cache = FacetCache(fakeredis.FakeRedis(decode_responses=True))
+    cache.set({"status": {"scheduled": 10}, "location": {}, "date": {}})
+    session = mock_session([(3, "scheduled", None, None, 2)])
+
+    facets = await EventFacetService(session, cache).facet_counts("user-1")
+
+    assert facets["status"] == {"scheduled": 12}
+    sql = compile_pg(session.execute.call_args.args[0])
+    assert "GROUP BY GROUPING SETS(events.status, events.location, date_trunc(" in sql
+    assert "events.is_private = true" in sql
+
+async def test_filtered_counts_are_computed_live():
+    cache = FacetCache(fakeredis.FakeRedis(decode_responses=True))
+    session = mock_session([(5, None, "Room A", None, 1)])
+
+    facets = await EventFacetService(session, cache).facet_counts("user-1", status=EventStatus.SCHEDULED)
+
+    assert facets["location"] == {"Room A": 1}
+    assert session.execute.await_count == 1
+    assert cache.get() is None
+
+def test_stale_flag_is_taken_once():
+    cache = FacetCache(fakeredis.FakeRedis(decode_responses=True))
+    cache.mark_stale()
+
+    assert cache.take_stale() is True
+    assert cache.take_stale() is False
+
+@patch("app.services.event.facet_cache")
+@patch("app.services.event.analytics_changes")
+def test_facets_go_stale_when_analytics_queue_fails(mock_changes, mock_facet_cache):
+    mock_changes.mark.side_effect = redis.ConnectionError("queue unavailable")
+
+    EventService(mock_session())._mark_analytics("event-1")
+
+    mock_facet_cache.mark_stale.assert_called_once_with()
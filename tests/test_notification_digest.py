@@ -0,0 +1,109 @@
+import pytest
+import asyncio
+from app.services.notification_digest import NotificationCoalescer, merge_payloads
+
+class RecordingDelivery:
+    """Collects delivered digest batches."""
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, batch):
+        self.batches.append(batch)
+
+    @property
+    def deliveries(self):
+        return [delivery for batch in self.batches for delivery in batch]
+
+@pytest.mark.asyncio
+async def test_joins_are_merged_per_user_event_and_type():
+    """Many joins to one event reach each recipient as a single digest."""
+    deliver = RecordingDelivery()
+    coalescer = NotificationCoalescer(deliver, window_seconds=60, max_batch=100)
+    for i in range(12):
+        await coalescer.add("owner", "event-1", "participant_joined", {"title": "Party", "participant_id": f"u{i}"})
+    await coalescer.add("owner", "event-2", "participant_joined", {"title": "Other", "participant_id": "u1"})
+
+    assert await coalescer.flush() == 2
+    await coalescer.close()
+
+    messages = sorted(message for _, message, _ in deliver.deliveries)
+    assert messages == [
+        "12 people joined the event 'Party'.",
+        "A new participant has joined the event 'Other'."
+    ]
+    assert coalescer.ratio == 6.5
+
+@pytest.mark.asyncio
+async def test_size_threshold_flushes_immediately():
+    """A buffer that reaches max_batch is delivered without waiting for the window."""
+    deliver = RecordingDelivery()
+    coalescer = NotificationCoalescer(deliver, window_seconds=60, max_batch=3)
+    for i in range(3):
+        await coalescer.add("owner", "event-1", "participant_joined", {"title": "Party", "participant_id": f"u{i}"})
+
+    assert len(deliver.deliveries) == 1
+    assert deliver.deliveries[0][2]["count"] == 3
+    await coalescer.close()
+
+@pytest.mark.asyncio
+async def test_window_expiry_flushes_in_background():
+    """Buffered notifications are delivered once their window expires."""
+    deliver = RecordingDelivery()
+    coalescer = NotificationCoalescer(deliver, window_seconds=0.05, max_batch=100)
+    await coalescer.add("user", "event-1", "event_updated", {"title": "Party", "updates": {"location": "A"}, "updated_by": "x"})
+    await coalescer.add("user", "event-1", "event_updated", {"title": "Party", "updates": {"location": "B"}, "updated_by": "y"})
+
+    await asyncio.sleep(0.2)
+
+    assert len(deliver.deliveries) == 1
+    user_id, message, data = deliver.deliveries[0]
+    assert user_id == "user"
+    assert message == "The event 'Party' has been updated 2 times."
+    assert data["updates"] == {"location": "B"}
+    assert data["updated_by"] == ["x", "y"]
+    await coalescer.close()
+
+class FlakyDelivery(RecordingDelivery):
+    """Fails the first ``failures`` calls, then records like RecordingDelivery."""
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    async def __call__(self, batch):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("database unavailable")
+        await super().__call__(batch)
+
+@pytest.mark.asyncio
+async def test_failed_digest_is_retried_in_background():
+    """A failed delivery is tried again one window later instead of being dropped."""
+    deliver = FlakyDelivery(failures=1)
+    coalescer = NotificationCoalescer(deliver, window_seconds=0.05, max_batch=1)
+    await coalescer.add("owner", "event-1", "event_updated", {"title": "Party", "updates": {}})
+    assert deliver.deliveries == []
+
+    await asyncio.sleep(0.2)
+
+    assert len(deliver.deliveries) == 1
+    assert coalescer.delivered == 1
+    await coalescer.close()
+
+@pytest.mark.asyncio
+async def test_digest_is_dropped_after_max_attempts():
+    deliver = FlakyDelivery(failures=10)
+    coalescer = NotificationCoalescer(deliver, window_seconds=60, max_batch=100, max_attempts=3)
+    await coalescer.add("owner", "event-1", "event_updated", {"title": "Party", "updates": {}})
+
+    await coalescer.close()
+
+    assert deliver.calls == 3
+    assert coalescer.delivered == 0
+
+def test_merge_unknown_type_keeps_items():
+    """Types without a dedicated merge rule keep every payload."""
+    message, data = merge_payloads("custom", [{"title": "T", "message": "hi"}, {"title": "T", "message": "there"}])
+    assert message == "there"
+    assert data["count"] == 2
+    assert len(data["items"]) == 2
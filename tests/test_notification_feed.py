@@ -0,0 +1,158 @@
+import pytest
+import uuid
+from unittest.mock import patch, AsyncMock, MagicMock
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.notification import Notification, NotificationStatus
+from app.models.user import User
+from app.core.models import UserRole
+from app.core.security.core_security import get_password_hash
+from app.services.notification_feed import NotificationFeedService
+
+@pytest.fixture
+async def feed_user(session: AsyncSession):
+    """Create a user whose timeline is inspected."""
+    unique_id = str(uuid.uuid4())[:8]
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"feed_{unique_id}@example.com",
+        username=f"feed_{unique_id}",
+        hashed_password=get_password_hash("testpassword"),
+        role=UserRole.USER,
+        created_at=datetime.utcnow() - timedelta(days=1)
+    )
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+@pytest.mark.asyncio
+async def test_timeline_merges_private_and_broadcast(session: AsyncSession, feed_user):
+    """Private rows and broadcasts newer than the watermark come back in one ordered page."""
+    service = NotificationFeedService(session)
+    now = datetime.utcnow()
+    private = Notification(
+        user_id=feed_user.id,
+        message="private",
+        created_at=now - timedelta(minutes=2)
+    )
+    session.add(private)
+    broadcast = await service.publish("public_event_created", "broadcast")
+    await session.commit()
+
+    items, next_cursor = await service.get_timeline(feed_user.id, default_watermark=now)
+
+    # Only look at this test's rows; other tests may publish broadcasts too
+    ours = [item for item in items if item["id"] in (broadcast.id, private.id)]
+    assert [(item["source"], item["id"]) for item in ours] == [("broadcast", broadcast.id), ("private", private.id)]
+    assert ours[0]["status"] == NotificationStatus.UNREAD.value
+    assert next_cursor is None
+
+@pytest.mark.asyncio
+async def test_watermark_hides_read_broadcasts(session: AsyncSession, feed_user):
+    """Advancing the watermark marks every older broadcast as read."""
+    service = NotificationFeedService(session)
+    await service.publish("public_event_created", "old broadcast")
+    await session.commit()
+
+    await service.advance_watermark(feed_user.id)
+    await session.commit()
+
+    items, _ = await service.get_timeline(feed_user.id, default_watermark=feed_user.created_at)
+    assert all(item["source"] != "broadcast" for item in items)
+
+@pytest.mark.asyncio
+async def test_actor_does_not_see_own_broadcast(session: AsyncSession, feed_user):
+    """The user who caused a broadcast is excluded from it."""
+    service = NotificationFeedService(session)
+    await service.publish("public_event_created", "mine", actor_id=feed_user.id)
+    await session.commit()
+
+    items, _ = await service.get_timeline(feed_user.id, default_watermark=feed_user.created_at)
+    assert all(item["message"] != "mine" for item in items)
+
+@pytest.mark.asyncio
+async def test_timeline_keyset_pagination(session: AsyncSession, feed_user):
+    """Pages follow each other without gaps or duplicates."""
+    service = NotificationFeedService(session)
+    now = datetime.utcnow()
+    for i in range(5):
+        session.add(Notification(
+            user_id=feed_user.id,
+            message=f"private {i}",
+            created_at=now - timedelta(minutes=i + 10)
+        ))
+    await session.commit()
+
+    first_page, cursor = await service.get_timeline(feed_user.id, limit=3, default_watermark=now)
+    second_page, _ = await service.get_timeline(feed_user.id, limit=3, cursor=cursor, default_watermark=now)
+
+    ids = [item["id"] for item in first_page + second_page]
+    assert len(first_page) == 3
+    assert len(ids) == len(set(ids)) == 5
+
+@pytest.mark.asyncio
+@patch("app.services.notification_feed.UnreadCounter.apply", new_callable=MagicMock)
+async def test_mark_all_read_is_set_based(mock_apply, session: AsyncSession, feed_user):
+    """Read-all flips every unread row, moves the watermark and resets the counter on commit."""
+    service = NotificationFeedService(session)
+    for i in range(3):
+        session.add(Notification(user_id=feed_user.id, message=f"private {i}"))
+    await service.publish("public_event_created", "broadcast")
+    await session.commit()
+
+    count = await service.mark_all_read(feed_user.id)
+    mock_apply.assert_not_called()
+    await session.commit()
+
+    assert count == 3
+    mock_apply.assert_called_once_with(feed_user.id, None)
+    result = await session.execute(
+        select(Notification.status).where(Notification.user_id == feed_user.id)
+    )
+    assert set(result.scalars().all()) == {NotificationStatus.READ}
+    items, _ = await service.get_timeline(feed_user.id, default_watermark=feed_user.created_at)
+    assert all(item["source"] == "private" for item in items)
+
+@pytest.mark.asyncio
+@patch("app.services.notification_feed.UnreadCounter.set", new_callable=AsyncMock)
+@patch("app.services.notification_feed.UnreadCounter.get", new_callable=AsyncMock)
+async def test_unread_count_recomputes_on_cache_miss(mock_get, mock_set, session: AsyncSession, feed_user):
+    """A counter miss is filled from the database and broadcasts are added on top."""
+    mock_get.return_value = None
+    service = NotificationFeedService(session)
+    started_at = datetime.utcnow()
+    for i in range(2):
+        session.add(Notification(user_id=feed_user.id, message=f"private {i}"))
+    await service.publish("public_event_created", "broadcast")
+    await session.commit()
+
+    count = await service.get_unread_count(feed_user.id, default_watermark=started_at)
+
+    assert count == 3
+    mock_set.assert_awaited_once_with(feed_user.id, 2)
+
+@pytest.mark.asyncio
+@patch("app.services.notification_feed.UnreadCounter.get", new_callable=AsyncMock)
+async def test_unread_count_uses_cached_counter(mock_get, session: AsyncSession, feed_user):
+    """A cached private count is used without counting rows."""
+    mock_get.return_value = 7
+    service = NotificationFeedService(session)
+
+    count = await service.get_unread_count(feed_user.id, default_watermark=datetime.utcnow())
+
+    assert count == 7
+
+@pytest.mark.asyncio
+@patch("app.services.notification_feed.UnreadCounter.apply", new_callable=MagicMock)
+async def test_rolled_back_notification_leaves_counter_alone(mock_apply, session: AsyncSession, feed_user):
+    """Counter changes wait for the commit and are dropped on rollback."""
+    service = NotificationFeedService(session)
+    await service.add_notification(feed_user.id, "never committed")
+    await session.rollback()
+    mock_apply.assert_not_called()
+
+    await service.add_notification(feed_user.id, "committed")
+    await session.commit()
+    mock_apply.assert_called_once_with(feed_user.id, 1)
@@ -0,0 +1,79 @@
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from app.core.partitioning import (
+    add_months,
+    create_partition_ddl,
+    drop_expired_partitions,
+    ensure_partitions,
+    month_start
+)
+
+def test_month_arithmetic_crosses_years():
+    assert month_start(datetime(2024, 12, 31, 23, 59)) == datetime(2024, 12, 1)
+    assert add_months(datetime(2024, 12, 1), 1) == datetime(2025, 1, 1)
+    assert add_months(datetime(2024, 1, 1), -1) == datetime(2023, 12, 1)
+
+def test_create_partition_ddl():
+    ddl = create_partition_ddl("notifications", datetime(2024, 12, 1))
+
+    assert "notifications_p202412 PARTITION OF notifications" in ddl
+    assert "FROM ('2024-12-01') TO ('2025-01-01')" in ddl
+
+@patch("app.core.partitioning.list_partitions")
+def test_ensure_partitions_creates_only_missing(mock_list_partitions):
+    mock_list_partitions.return_value = {datetime(2024, 5, 1): "versions_p202405"}
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = False
+
+    created = ensure_partitions(connection, now=datetime(2024, 5, 20), months_ahead=2, tables=["versions"])
+
+    assert created == ["versions_p202406", "versions_p202407"]
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert [statement for statement in statements if statement.startswith("CREATE TABLE")] == [
+        create_partition_ddl("versions", datetime(2024, 6, 1)),
+        create_partition_ddl("versions", datetime(2024, 7, 1)),
+    ]
+
+@patch("app.core.partitioning.list_partitions")
+def test_ensure_partitions_moves_rows_out_of_default(mock_list_partitions):
+    mock_list_partitions.return_value = {}
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = True
+
+    created = ensure_partitions(connection, now=datetime(2024, 5, 20), months_ahead=0, tables=["audit_logs"])
+
+    assert created == ["audit_logs_p202405"]
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list][1:]
+    assert statements == [
+        "ALTER TABLE audit_logs DETACH PARTITION audit_logs_default",
+        create_partition_ddl("audit_logs", datetime(2024, 5, 1)),
+        'INSERT INTO audit_logs SELECT * FROM audit_logs_default WHERE "timestamp" >= :start AND "timestamp" < :end',
+        'DELETE FROM audit_logs_default WHERE "timestamp" >= :start AND "timestamp" < :end',
+        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT",
+    ]
+
+@patch("app.core.partitioning.settings.AUDIT_LOG_RETENTION_MONTHS", 2)
+@patch("app.core.partitioning.list_partitions")
+def test_drop_expired_partitions_respects_retention(mock_list_partitions):
+    mock_list_partitions.return_value = {
+        datetime(2024, 2, 1): "audit_logs_p202402",
+        datetime(2024, 3, 1): "audit_logs_p202403",
+        datetime(2024, 4, 1): "audit_logs_p202404",
+    }
+    connection = MagicMock()
+
+    dropped = drop_expired_partitions(connection, now=datetime(2024, 5, 10), tables=["audit_logs"])
+
+    assert dropped == ["audit_logs_p202402"]
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements == [
+        "ALTER TABLE audit_logs DETACH PARTITION audit_logs_p202402",
+        "DROP TABLE audit_logs_p202402",
+    ]
+
+@patch("app.core.partitioning.settings.VERSION_RETENTION_MONTHS", 0)
+def test_zero_retention_keeps_partitions():
+    connection = MagicMock()
+
+    assert drop_expired_partitions(connection, tables=["versions"]) == []
+    connection.execute.assert_not_called()
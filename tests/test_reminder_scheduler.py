@@ -0,0 +1,227 @@
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.event import Event, EventParticipant
+from app.services.reminder_scheduler import ReminderScheduler
+from app.tasks.reminders import (
+    _claim_reminder_recipients,
+    deliver_event_reminder,
+    dispatch_due_reminders,
+    check_upcoming_events
+)
+from tests.conftest import compile_pg, mock_session, new_user, upcoming_event
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest.fixture
+def scheduler():
+    return ReminderScheduler(client=fakeredis.FakeRedis(decode_responses=True), lease_seconds=600)
+
+@asynccontextmanager
+async def fake_db_context():
+    yield MagicMock()
+
+def test_schedule_skips_past_reminders(scheduler):
+    """Only reminders that are still in the future are recorded."""
+    now = datetime(2024, 1, 1)
+    scheduled = scheduler.schedule_event("event-1", now + timedelta(days=2), now=now)
+
+    assert scheduled == 1
+    assert scheduler.pending() == 1
+
+def test_reschedule_replaces_previous_due_times(scheduler):
+    """Moving an event replaces its reminders instead of adding new ones."""
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=10), now=now)
+    scheduler.schedule_event("event-1", now + timedelta(days=20), now=now)
+
+    assert scheduler.pending() == 3
+    assert scheduler.pop_due(now=now + timedelta(days=10)) == []
+
+def test_pop_due_is_ordered_and_removes(scheduler):
+    """Due reminders come back once, earliest first, and respect the limit."""
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=10), now=now)
+    scheduler.schedule_event("event-2", now + timedelta(days=10, hours=1), now=now)
+
+    later = now + timedelta(days=3, hours=2)
+    assert scheduler.pop_due(now=later, limit=1) == [("event-1", 7)]
+    assert scheduler.pop_due(now=later) == [("event-2", 7)]
+    assert scheduler.pop_due(now=later) == []
+
+def test_acked_reminders_are_not_redelivered(scheduler):
+    """A reminder acked after enqueueing is gone for good."""
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=2), now=now)
+
+    due = scheduler.pop_due(now=now + timedelta(days=1))
+    scheduler.ack(due)
+
+    assert scheduler.pop_due(now=now + timedelta(days=3)) == []
+
+def test_expired_lease_is_redelivered(scheduler):
+    """A popped reminder that is never acked comes back once its lease runs out."""
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=2), now=now)
+    popped_at = now + timedelta(days=1)
+
+    assert scheduler.pop_due(now=popped_at) == [("event-1", 1)]
+    assert scheduler.pop_due(now=popped_at + timedelta(minutes=5)) == []
+    assert scheduler.pop_due(now=popped_at + timedelta(minutes=11)) == [("event-1", 1)]
+
+def test_released_reminders_are_due_again(scheduler):
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=2), now=now)
+    popped_at = now + timedelta(days=1)
+
+    scheduler.release(scheduler.pop_due(now=popped_at), now=popped_at)
+
+    assert scheduler.pop_due(now=popped_at) == [("event-1", 1)]
+
+def test_unschedule_event(scheduler):
+    now = datetime(2024, 1, 1)
+    scheduler.schedule_event("event-1", now + timedelta(days=10), now=now)
+    scheduler.unschedule_event("event-1")
+
+    assert scheduler.pending() == 0
+
+@patch("app.tasks.reminders.settings.REMINDER_RECIPIENT_CHUNK", 2)
+@patch("app.tasks.reminders.get_db_context", fake_db_context)
+@patch("app.tasks.reminders.deliver_event_reminder.delay")
+@patch("app.tasks.reminders._claim_reminder_recipients")
+@patch("app.tasks.reminders.reminder_scheduler")
+def test_dispatch_due_reminders_chunks_recipients(mock_scheduler, mock_claim, mock_delay):
+    """Each due reminder is split into delivery jobs of bounded size and then acked."""
+    mock_scheduler.pop_due.return_value = [("event-1", 3)]
+
+    async def claim(session, kind, *criteria):
+        assert kind == "days_before_3"
+        return {"event-1": ["a@example.com", "b@example.com", "c@example.com"]}
+    mock_claim.side_effect = claim
+
+    assert dispatch_due_reminders() == 2
+    mock_delay.assert_any_call(
+        event_id="event-1",
+        recipient_emails=["a@example.com", "b@example.com"],
+        days_before=3
+    )
+    mock_delay.assert_any_call(
+        event_id="event-1",
+        recipient_emails=["c@example.com"],
+        days_before=3
+    )
+    mock_scheduler.ack.assert_called_once_with([("event-1", 3)])
+    mock_scheduler.release.assert_not_called()
+
+@patch("app.tasks.reminders.get_db_context", fake_db_context)
+@patch("app.tasks.reminders.deliver_event_reminder.delay")
+@patch("app.tasks.reminders._claim_reminder_recipients")
+@patch("app.tasks.reminders.reminder_scheduler")
+def test_dispatch_releases_unacked_reminders_on_failure(mock_scheduler, mock_claim, mock_delay):
+    """A broker failure puts the failing group and the unreached ones back."""
+    mock_scheduler.pop_due.return_value = [("event-1", 7), ("event-2", 3), ("event-3", 3)]
+
+    async def claim(session, kind, *criteria):
+        return {"event": ["a@example.com"]}
+    mock_claim.side_effect = claim
+    mock_delay.side_effect = [None, ConnectionError("broker down")]
+
+    with pytest.raises(ConnectionError):
+        dispatch_due_reminders()
+
+    mock_scheduler.ack.assert_called_once_with([("event-1", 7)])
+    mock_scheduler.release.assert_called_once_with([("event-2", 3), ("event-3", 3)])
+
+@patch("app.tasks.reminders.get_db_context", fake_db_context)
+@patch("app.tasks.reminders.deliver_event_reminder.delay")
+@patch("app.tasks.reminders._claim_reminder_recipients")
+def test_check_upcoming_events_sends_only_claimed(mock_claim, mock_delay):
+    """Participants already in the ledger are not reminded again."""
+    claims = iter([{"event-1": ["a@example.com"]}, {}])
+
+    async def claim(session, kind, *criteria):
+        assert kind == "starting_soon"
+        return next(claims)
+    mock_claim.side_effect = claim
+
+    assert check_upcoming_events() == 1
+    assert check_upcoming_events() == 0
+    mock_delay.assert_called_once_with(
+        event_id="event-1",
+        recipient_emails=["a@example.com"],
+        days_before=0
+    )
+
+@patch("app.tasks.reminders.reminder_scheduler")
+@patch("app.tasks.reminders.send_event_reminder")
+def test_failed_deliveries_lose_their_claim(mock_send, mock_scheduler):
+    """Only recipients the mailer could not reach are handed back for a retry."""
+    session = mock_session()
+
+    @asynccontextmanager
+    async def db_context():
+        yield session
+    mock_send.return_value = {
+        "a@example.com": {"status": "sent", "error": None},
+        "b@example.com": {"status": "failed", "error": "mailbox full"},
+    }
+
+    with patch("app.tasks.reminders.get_db_context", db_context):
+        deliver_event_reminder("event-1", ["a@example.com", "b@example.com"], 3)
+
+    sql = compile_pg(session.execute.call_args.args[0], literal_binds=True)
+    assert sql.startswith("DELETE FROM reminder_ledger")
+    assert "'days_before_3'" in sql
+    assert "'b@example.com'" in sql and "'a@example.com'" not in sql
+    mock_scheduler.release.assert_called_once_with([("event-1", 3)])
+
+@patch("app.tasks.reminders.reminder_scheduler")
+@patch("app.tasks.reminders.send_event_reminder")
+def test_crashed_delivery_hands_back_every_recipient(mock_send, mock_scheduler):
+    session = mock_session()
+
+    @asynccontextmanager
+    async def db_context():
+        yield session
+    mock_send.side_effect = RuntimeError("template missing")
+
+    with patch("app.tasks.reminders.get_db_context", db_context):
+        with pytest.raises(RuntimeError):
+            deliver_event_reminder("event-1", ["a@example.com"], 0)
+
+    assert "'a@example.com'" in compile_pg(session.execute.call_args.args[0], literal_binds=True)
+    # Starting-soon reminders are retried by check_upcoming_events, not the due set
+    mock_scheduler.release.assert_not_called()
+
+@patch("app.tasks.reminders.reminder_scheduler")
+@patch("app.tasks.reminders.get_db_context")
+@patch("app.tasks.reminders.send_event_reminder")
+def test_delivered_reminders_keep_their_claim(mock_send, mock_db_context, mock_scheduler):
+    mock_send.return_value = {"a@example.com": {"status": "sent", "error": None}}
+
+    deliver_event_reminder("event-1", ["a@example.com"], 3)
+
+    mock_db_context.assert_not_called()
+    mock_scheduler.release.assert_not_called()
+
+@pytest.mark.asyncio
+@patch("app.tasks.reminders.settings.REMINDER_CLAIM_CHUNK", 1)
+async def test_claim_twice_returns_nothing_the_second_time(session: AsyncSession, test_admin):
+    """The ledger insert claims each participant once, across chunked statements."""
+    guest = new_user()
+    event = upcoming_event(test_admin, starts_in=timedelta(hours=2))
+    session.add_all([guest, event])
+    await session.flush()
+    session.add_all([
+        EventParticipant(event_id=event.id, user_id=test_admin.id),
+        EventParticipant(event_id=event.id, user_id=guest.id)
+    ])
+    await session.commit()
+
+    first = await _claim_reminder_recipients(session, "starting_soon", Event.id == event.id)
+    second = await _claim_reminder_recipients(session, "starting_soon", Event.id == event.id)
+
+    assert sorted(first[event.id]) == sorted([test_admin.email, guest.email])
+    assert second == {}
@@ -0,0 +1,45 @@
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from app.services.search import EventSearchService, escape_like
+from tests.conftest import compile_pg, mock_session
+
+async def test_text_search_is_ranked_and_visibility_filtered():
+    session = mock_session()
+
+    await EventSearchService(session).search("user-1", query="board meeting", title="bord")
+
+    sql = compile_pg(session.execute.call_args.args[0])
+    assert "events.search_vector @@ websearch_to_tsquery" in sql
+    assert "events.title %" in sql
+    assert "ts_rank_cd(events.search_vector" in sql
+    assert "event_share.shared_with_id" in sql
+    assert "ORDER BY ts_rank_cd" in sql
+
+async def test_unranked_search_pages_by_start_time():
+    session = mock_session()
+    cursor = EventSearchService.encode_cursor(datetime(2024, 5, 1, 9), "event-9")
+
+    await EventSearchService(session).search("user-1", location="Room A", cursor=cursor, limit=10)
+
+    sql = compile_pg(session.execute.call_args.args[0])
+    assert "events.location = " in sql
+    assert "events.start_time > " in sql
+    assert "ORDER BY events.start_time ASC, events.id ASC" in sql
+    assert "LIMIT" in sql
+
+async def test_next_cursor_points_at_last_row_of_page():
+    events = [MagicMock(id=f"event-{i}", start_time=datetime(2024, 5, i + 1)) for i in range(3)]
+    session = mock_session([(event, 0.5 - i / 10) for i, event in enumerate(events)])
+
+    rows, next_cursor = await EventSearchService(session).search("user-1", query="retro", limit=2)
+
+    assert [event.id for event, _ in rows] == ["event-0", "event-1"]
+    assert EventSearchService.decode_cursor(next_cursor, ranked=True) == (0.4, "event-1")
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        EventSearchService.decode_cursor("garbage", ranked=False)
+
+def test_escape_like_escapes_wildcards():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.models.audit_log import AuditLog
+from app.models.event_access import EventAccess
+from app.models.event_share import EventShare, SharePermission
+from app.services.share_expiry import ShareExpiryService
+from tests.conftest import compile_pg, mock_session, new_user, upcoming_event
+
+async def shared_event(session, owner):
+    event, guest = upcoming_event(owner), new_user()
+    session.add_all([guest, event])
+    await session.flush()
+    return event, guest
+
+def test_expiring_index_is_partial():
+    index = next(i for i in EventShare.__table__.indexes if i.name == "ix_event_share_expiring")
+    assert [c.name for c in index.columns] == ["expires_at"]
+    assert str(index.dialect_options["postgresql"]["where"]) == "expires_at IS NOT NULL"
+
+async def test_revoke_expired_without_matches_stops_after_delete():
+    session = mock_session()
+
+    assert await ShareExpiryService(session).revoke_expired(datetime(2024, 5, 1), 100) == 0
+
+    sql = compile_pg(session.execute.call_args.args[0])
+    assert "DELETE FROM event_share" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING" in sql
+    assert session.execute.await_count == 1
+
+async def test_revoke_expired_recomputes_access_and_journals(session, test_admin):
+    """An expired share is deleted, access falls back to the remaining share and the revocation is journaled."""
+    event, guest = await shared_event(session, test_admin)
+    now = datetime.utcnow()
+    session.add_all([
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id,
+                   permission=SharePermission.EDIT, expires_at=now - timedelta(minutes=1)),
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id,
+                   permission=SharePermission.VIEW),
+        EventAccess(user_id=guest.id, event_id=event.id, permission="edit", start_time=event.start_time),
+        EventAccess(user_id=test_admin.id, event_id=event.id, permission="owner", start_time=event.start_time)
+    ])
+    await session.commit()
+
+    assert await ShareExpiryService(session).revoke_expired(now, 100) == 1
+    await session.commit()
+
+    access = await session.execute(
+        select(EventAccess.user_id, EventAccess.permission).where(EventAccess.event_id == event.id)
+    )
+    assert dict(access.all()) == {guest.id: "view", test_admin.id: "owner"}
+    journal = await session.execute(
+        select(AuditLog.action, AuditLog.details).where(AuditLog.entity_id == event.id)
+    )
+    [(action, details)] = journal.all()
+    assert action == "delete_event_share"
+    assert details["shared_with_id"] == guest.id
+    assert details["reason"] == "expired"
+
+async def test_revoke_expired_skips_locked_shares(session, other_session, test_admin):
+    """A share locked by another transaction is left for a later batch."""
+    event, guest = await shared_event(session, test_admin)
+    expired_at = datetime.utcnow() - timedelta(minutes=1)
+    locked, free = [
+        EventShare(event_id=event.id, shared_by_id=test_admin.id, shared_with_id=guest.id,
+                   permission=SharePermission.VIEW, expires_at=expired_at)
+        for _ in range(2)
+    ]
+    session.add_all([locked, free])
+    await session.commit()
+
+    await other_session.execute(select(EventShare).where(EventShare.id == locked.id).with_for_update())
+    revoked = await asyncio.wait_for(ShareExpiryService(session).revoke_expired(datetime.utcnow(), 100), timeout=5)
+    await session.commit()
+    await other_session.rollback()
+
+    assert revoked == 1
+    remaining = await session.execute(select(EventShare.id).where(EventShare.event_id == event.id))
+    assert remaining.scalars().all() == [locked.id]
+
+def test_audit_rows_record_expiry():
+    now = datetime(2024, 5, 1)
+    rows = ShareExpiryService._audit_rows([
+        {"event_id": "event-1", "shared_by_id": "owner", "shared_with_id": "user-1",
+         "permission": SharePermission.MANAGE, "expires_at": datetime(2024, 4, 30)}
+    ], now)
+
+    assert rows == [{
+        "user_id": "owner",
+        "action": "delete_event_share",
+        "entity_type": "event",
+        "entity_id": "event-1",
+        "timestamp": now,
+        "details": {
+            "shared_with_id": "user-1",
+            "permission": "manage",
+            "expires_at": "2024-04-30T00:00:00",
+            "reason": "expired"
+        }
+    }]
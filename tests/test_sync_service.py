@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import insert
+from app.models.audit_log import AuditLog
+from app.models.sync_state import SyncState
+from app.services.sync_service import SyncService
+from tests.conftest import compile_pg, mock_session
+
+def sync_service(changes):
+    service = SyncService(mock_session(changes))
+    state = SyncState(last_sync_version=0, last_sync_sequence=7, last_sync_timestamp=datetime(2024, 5, 1, 12))
+    service.get_sync_state = AsyncMock(return_value=state)
+    return service, state
+
+@pytest.mark.asyncio
+async def test_changes_page_by_journal_sequence():
+    now = datetime(2024, 5, 1, 12, 30)
+    changes = [
+        AuditLog(sequence=8, timestamp=now, user_id="u1", action="update_event", entity_type="event",
+                 entity_id="e1", created_at=now, updated_at=now),
+        AuditLog(sequence=9, timestamp=datetime(2024, 5, 1, 12, 29), user_id="u1", action="share_event",
+                 entity_type="event", entity_id="e1", created_at=now, updated_at=now),
+    ]
+    service, state = sync_service(changes)
+
+    feed, _ = await service.get_changes("u1", "client", "event", 0)
+
+    sql = compile_pg(service.db.execute.call_args.args[0])
+    assert "audit_logs.sequence > " in sql
+    assert "ORDER BY audit_logs.sequence ASC" in sql
+    assert "audit_logs.created_at <= timezone(" in sql
+    assert "audit_logs.timestamp" not in sql.split("WHERE")[1]
+    assert [change["sequence"] for change in feed] == [8, 9]
+    assert state.last_sync_sequence == 9
+    assert state.last_sync_timestamp == now
+
+@pytest.mark.asyncio
+async def test_empty_page_keeps_cursor():
+    service, state = sync_service([])
+
+    feed, _ = await service.get_changes("u1", "client", "event", 0)
+
+    assert feed == []
+    assert state.last_sync_sequence == 7
+    service.db.commit.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_reset_starts_at_the_journal_end():
+    service, state = sync_service([])
+    service.db.scalar = AsyncMock(return_value=1234)
+
+    await service.reset_sync_state("u1", "client", "event")
+
+    assert state.last_sync_sequence == 1234
+    assert "max(audit_logs.sequence)" in str(service.db.scalar.call_args.args[0])
+
+@pytest.mark.asyncio
+async def test_rows_inside_the_lag_wait_for_a_later_page(session, test_admin):
+    now = datetime.utcnow()
+    for entity_id, inserted_at in (("old", now - timedelta(minutes=1)), ("fresh", None)):
+        row = {"user_id": test_admin.id, "action": "update_event", "entity_type": "lagtest",
+               "entity_id": entity_id, "timestamp": now - timedelta(minutes=1)}
+        if inserted_at:
+            row["created_at"] = inserted_at
+        await session.execute(insert(AuditLog).values(row))
+    await session.commit()
+    service = SyncService(session)
+    service.get_sync_state = AsyncMock(return_value=SyncState(
+        last_sync_version=0, last_sync_sequence=0, last_sync_timestamp=now - timedelta(minutes=2)
+    ))
+
+    feed, _ = await service.get_changes(test_admin.id, "client", "lagtest", 0)
+
+    assert [change["entity_id"] for change in feed] == ["old"]
+
+@pytest.mark.asyncio
+@patch("app.services.sync_service.settings.WRITE_COALESCING_ENABLED", False)
+async def test_backlog_survives_an_ack_between_pages(session, test_admin):
+    """Rows older than the acknowledgement time still arrive on the next page."""
+    an_hour_ago = datetime.utcnow() - timedelta(hours=1)
+    await session.execute(insert(AuditLog), [
+        {"user_id": test_admin.id, "action": "update_event", "entity_type": "backlogtest",
+         "entity_id": f"e{number}", "timestamp": an_hour_ago, "created_at": an_hour_ago}
+        for number in range(3)
+    ])
+    await session.commit()
+    service = SyncService(session)
+
+    first, token = await service.get_changes(test_admin.id, "client", "backlogtest", 0, limit=2)
+    await service.acknowledge_sync(test_admin.id, "client", "backlogtest", token)
+    second, _ = await service.get_changes(test_admin.id, "client", "backlogtest", 0, limit=2)
+
+    assert [change["entity_id"] for change in first + second] == ["e0", "e1", "e2"]
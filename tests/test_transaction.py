@@ -0,0 +1,130 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from app.core.models import SharePermission
+from app.core.transaction import transaction_scope
+from tests.conftest import compile_pg, mock_session
+
+@pytest.mark.asyncio
+async def test_nested_scope_uses_savepoint_and_outer_commits_once():
+    session = mock_session()
+
+    async with transaction_scope(session) as outer:
+        async with transaction_scope(session) as inner:
+            await inner.add_operation("create_event", "event", "e1", {}, user_id="u1")
+        session.commit.assert_not_awaited()
+        await outer.add_operation("update_event", "event", "e1", {}, user_id="u1")
+
+    session.savepoint.commit.assert_awaited_once()
+    session.commit.assert_awaited_once()
+    assert [op["type"] for op in outer.operations] == ["create_event", "update_event"]
+    assert session.info == {}
+
+@pytest.mark.asyncio
+async def test_failed_nested_scope_rolls_back_only_its_savepoint():
+    session = mock_session()
+    undo = AsyncMock()
+
+    async with transaction_scope(session) as outer:
+        with pytest.raises(ValueError):
+            async with transaction_scope(session) as inner:
+                await inner.add_operation("create_event", "event", "e1", {}, rollback_func=undo, user_id="u1")
+                raise ValueError("conflict")
+        await outer.add_operation("create_event", "event", "e2", {}, user_id="u1")
+
+    undo.assert_awaited_once()
+    session.savepoint.rollback.assert_awaited_once()
+    session.rollback.assert_not_awaited()
+    session.commit.assert_awaited_once()
+    assert [op["entity_id"] for op in outer.operations] == ["e2"]
+
+@pytest.mark.asyncio
+async def test_operations_are_journaled_in_one_insert():
+    session = mock_session()
+
+    async with transaction_scope(session) as transaction:
+        for i in range(3):
+            await transaction.add_operation("create_event", "event", f"e{i}", {"n": i}, user_id="u1")
+        await transaction.add_operation("batch_create_events", "event", "batch", {"count": 3})
+
+    session.execute.assert_awaited_once()
+    stmt = session.execute.call_args.args[0]
+    sql = compile_pg(stmt)
+    assert sql.startswith("INSERT INTO audit_logs")
+    assert len(stmt._multi_values[0]) == 3
+
+@pytest.mark.asyncio
+async def test_outer_failure_rolls_back_everything():
+    session = mock_session()
+
+    with pytest.raises(RuntimeError):
+        async with transaction_scope(session):
+            raise RuntimeError("boom")
+
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_awaited()
+    assert session.info == {}
+
+@pytest.mark.asyncio
+async def test_journal_draws_sequences_in_the_same_statement():
+    session = mock_session([41, 42])
+
+    async with transaction_scope(session) as transaction:
+        await transaction.add_operation("share_event", "event", "e1", {"permission": SharePermission.EDIT}, user_id="u1")
+        await transaction.add_operation("share_event", "event", "e1", {"expires_at": datetime(2024, 5, 1)}, user_id="u1")
+
+    stmt = session.execute.call_args.args[0]
+    sql = compile_pg(stmt)
+    assert "nextval('audit_logs_sequence_seq')" in sql
+    assert sql.endswith("RETURNING audit_logs.sequence")
+    assert transaction.sequences == [41, 42]
+    params = stmt.compile().params
+    details = [params["details_m0"], params["details_m1"]]
+    assert details == [{"permission": "edit"}, {"expires_at": "2024-05-01 00:00:00"}]
+
+@pytest.mark.asyncio
+async def test_journal_failure_propagates_and_rolls_back():
+    session = mock_session()
+    session.execute.side_effect = RuntimeError("no partition")
+    after = MagicMock()
+
+    with pytest.raises(RuntimeError):
+        async with transaction_scope(session) as transaction:
+            await transaction.add_operation("create_event", "event", "e1", {}, user_id="u1")
+            transaction.after_commit(after)
+
+    session.commit.assert_not_awaited()
+    session.rollback.assert_awaited_once()
+    after.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_after_commit_callbacks_wait_for_the_outermost_commit():
+    session = mock_session()
+    calls = []
+    session.commit.side_effect = lambda: calls.append("commit")
+
+    async with transaction_scope(session):
+        async with transaction_scope(session) as inner:
+            inner.after_commit(lambda: calls.append("kept"))
+        with pytest.raises(ValueError):
+            async with transaction_scope(session) as failed:
+                failed.after_commit(lambda: calls.append("discarded"))
+                raise ValueError("conflict")
+        assert calls == []
+
+    assert calls == ["commit", "kept"]
+
+@pytest.mark.asyncio
+async def test_rolled_back_middle_scope_discards_its_children():
+    session = mock_session()
+
+    async with transaction_scope(session) as outer:
+        with pytest.raises(ValueError):
+            async with transaction_scope(session) as middle:
+                async with transaction_scope(session) as inner:
+                    await inner.add_operation("create_event", "event", "e1", {}, user_id="u1")
+                assert session.info["transaction"] is middle
+                raise ValueError("conflict")
+        assert session.info["transaction"] is outer
+
+    assert outer.operations == []
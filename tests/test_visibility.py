@@ -0,0 +1,42 @@
+import json
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.visibility import visible_events
+from tests.conftest import compile_pg
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+async def explain(session: AsyncSession, stmt) -> list:
+    sql = compile_pg(stmt, literal_binds=True)
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+def test_visibility_is_a_union_of_plain_branches():
+    stmt = visible_events("user-1", start_date=datetime(2024, 1, 1), after=(datetime(2024, 2, 1), "event-1"), limit=20)
+
+    sql = compile_pg(stmt)
+
+    assert sql.count("UNION ALL") == 2
+    assert " OR " not in sql
+    assert " IN (" not in sql
+    assert sql.count("LIMIT") == 4  # one per branch plus the merged page
+    assert "FROM event_share JOIN events ON events.id = event_share.event_id" in sql
+    assert "EXISTS" not in sql
+
+async def test_visibility_plan_uses_index_paths(session: AsyncSession):
+    nodes = await explain(session, visible_events("user-1", limit=20))
+
+    assert any(node["Node Type"] == "Append" for node in nodes)
+    assert not [
+        node for node in nodes
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in ("events", "event_share")
+    ]
+    assert "ix_event_share_recipient" in {node.get("Index Name") for node in nodes}
@@ -0,0 +1,115 @@
+import pytest
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import select
+from app.core.write_buffer import WriteCoalescer
+from app.services.notification_feed import apply_flushed_read_marks, coalesced_read_marks
+from app.services.sync_service import coalesced_sync_acks
+from tests.conftest import compile_pg, db_result
+
+class RecordingSessions:
+    """Session factory that records each flushed statement as one commit."""
+    def __init__(self, fail: bool = False, returning=()):
+        self.statements = []
+        self.fail = fail
+        self.returning = returning
+
+    @asynccontextmanager
+    async def __call__(self):
+        session = MagicMock()
+        session.execute = AsyncMock(
+            side_effect=RuntimeError("db down") if self.fail else None,
+            return_value=db_result(self.returning)
+        )
+        yield session
+        self.statements.append(session.execute.call_args.args[0])
+
+def build(rows):
+    return select(*[row["value"] for row in rows])
+
+@pytest.mark.asyncio
+async def test_rows_within_the_delay_share_one_commit():
+    sessions = RecordingSessions()
+    coalescer = WriteCoalescer(sessions, delay_ms=10, max_batch=100)
+    coalescer.register("counter", build)
+
+    futures = [coalescer.submit("counter", {"value": i}) for i in range(20)]
+    results = await asyncio.gather(*futures)
+
+    assert results == [20] * 20
+    assert len(sessions.statements) == 1
+    assert coalescer.ratio == 20
+    await coalescer.close()
+
+@pytest.mark.asyncio
+async def test_size_threshold_flushes_without_waiting():
+    sessions = RecordingSessions()
+    coalescer = WriteCoalescer(sessions, delay_ms=60000, max_batch=3)
+    coalescer.register("counter", build)
+
+    futures = [coalescer.submit("counter", {"value": i}) for i in range(3)]
+    assert await asyncio.wait_for(asyncio.gather(*futures), 1) == [3, 3, 3]
+    await coalescer.close()
+
+@pytest.mark.asyncio
+async def test_close_commits_queued_rows():
+    sessions = RecordingSessions()
+    coalescer = WriteCoalescer(sessions, delay_ms=60000, max_batch=100)
+    coalescer.register("counter", build)
+    future = coalescer.submit("counter", {"value": 1})
+
+    await coalescer.close()
+
+    assert future.result() == 1
+    assert len(sessions.statements) == 1
+
+@pytest.mark.asyncio
+async def test_failed_flush_reaches_awaiting_callers():
+    coalescer = WriteCoalescer(RecordingSessions(fail=True), delay_ms=1, max_batch=100)
+    coalescer.register("counter", build)
+
+    with pytest.raises(RuntimeError):
+        await coalescer.submit("counter", {"value": 1})
+    assert coalescer.flushed == 0
+
+@pytest.mark.asyncio
+async def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        WriteCoalescer(RecordingSessions()).submit("missing", {})
+
+def test_read_marks_keep_each_rows_read_at():
+    sql = compile_pg(coalesced_read_marks([
+        {"id": "n1", "read_at": datetime(2024, 5, 1, 9)},
+        {"id": "n2", "read_at": datetime(2024, 5, 1, 10)},
+        {"id": "n1", "read_at": datetime(2024, 5, 1, 11)},
+    ]), literal_binds=True)
+    assert sql.startswith("UPDATE notifications SET")
+    assert "read_at=marks.read_at" in sql
+    assert "FROM (VALUES ('n1', '2024-05-01 09:00:00'), ('n2', '2024-05-01 10:00:00'))" in sql
+    assert sql.endswith("RETURNING notifications.user_id")
+
+@pytest.mark.asyncio
+@patch("app.services.notification_feed.UnreadCounter.apply")
+async def test_flush_hook_decrements_counters_by_flipped_rows(mock_apply):
+    sessions = RecordingSessions(returning=[("u1",), ("u2",), ("u1",)])
+    coalescer = WriteCoalescer(sessions, delay_ms=60000, max_batch=100)
+    coalescer.register("notification_read", coalesced_read_marks, on_flushed=apply_flushed_read_marks)
+    for i in range(4):
+        coalescer.submit("notification_read", {"id": f"n{i}", "read_at": datetime(2024, 5, 1, 9)})
+
+    await coalescer.close()
+
+    assert sorted(call.args for call in mock_apply.call_args_list) == [("u1", -2), ("u2", -1)]
+
+def test_sync_acks_keep_latest_per_state():
+    stmt = coalesced_sync_acks([
+        {"id": "s1", "last_sync_timestamp": datetime(2024, 5, 1, 9)},
+        {"id": "s1", "last_sync_timestamp": datetime(2024, 5, 1, 11)},
+        {"id": "s2", "last_sync_timestamp": datetime(2024, 5, 1, 10)},
+    ])
+    sql = compile_pg(stmt, literal_binds=True)
+    assert "FROM (VALUES" in sql
+    assert sql.count("'s1'") == 1
+    assert "2024-05-01 11:00:00" in sql